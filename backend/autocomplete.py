@@ -0,0 +1,170 @@
+"""
+Typeahead autocomplete over titles, artists, genres and venues
+
+The index is a sorted array of string keys searched with bisect, so a lookup is
+O(log n) plus a short scan over the matching range and never touches the
+embedding model. Keys are built from every word start of a value so "dream"
+completes "The Drum's Dream".
+
+Korean input is matched at the jamo level: both the catalog and the query are
+decomposed into compatibility jamo, so a half-typed syllable ("판ㅅ", "판솔")
+still prefixes "판소리". Pure-consonant input ("ㅍㅅㄹ") is matched against
+separate choseong (initial consonant) keys.
+"""
+import re
+import math
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from models import Showcase
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = [
+    "ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ",
+    "ㅗㅣ", "ㅛ", "ㅜ", "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"
+]
+_JONGSEONG = [
+    "", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ",
+    "ㄹㅂ", "ㄹㅅ", "ㄹㅌ", "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ",
+    "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"
+]
+# Compound jamo typed on their own by an IME
+_COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ",
+    "ㅢ": "ㅡㅣ", "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ",
+    "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ"
+}
+# Choseong keys live in their own range of the sorted array
+_CHOSEONG_PREFIX = "\x01"
+
+_WORD_START_RE = re.compile(r"(?:^|(?<=[\s\-:/(,]))\S")
+_STRIP_RE = re.compile(r"[\"'‘’“”]")
+
+FIELD_WEIGHTS = {"title": 3.0, "artist": 2.5, "venue": 1.5, "genre": 1.0}
+
+
+def normalize(text: str) -> str:
+    return " ".join(_STRIP_RE.sub("", text).lower().split())
+
+
+def to_jamo(text: str) -> str:
+    """Decompose Hangul syllables (and compound jamo) into basic compatibility jamo"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            offset = code - _SYLLABLE_BASE
+            out.append(_CHOSEONG[offset // 588])
+            out.append(_JUNGSEONG[(offset % 588) // 28])
+            out.append(_JONGSEONG[offset % 28])
+        else:
+            out.append(_COMPOUND_JAMO.get(ch, ch))
+    return "".join(out)
+
+
+def to_choseong(text: str) -> str:
+    """Initial consonant of each Hangul syllable; other characters are kept"""
+    return "".join(
+        _CHOSEONG[(ord(ch) - _SYLLABLE_BASE) // 588]
+        if _SYLLABLE_BASE <= ord(ch) <= _SYLLABLE_LAST else ch
+        for ch in text
+    )
+
+
+def is_choseong_query(text: str) -> bool:
+    letters = text.replace(" ", "")
+    return bool(letters) and all(ch in _CHOSEONG for ch in letters)
+
+
+class Suggestion:
+    __slots__ = ("text", "field", "showcase_ids", "weight")
+
+    def __init__(self, text: str, field: str):
+        self.text = text
+        self.field = field
+        self.showcase_ids: List[int] = []
+        self.weight = FIELD_WEIGHTS.get(field, 1.0)
+
+
+class AutocompleteIndex:
+    """Sorted-key prefix index with ranked completions"""
+
+    def __init__(self, suggestions: List[Suggestion], generation: int = 0):
+        self.suggestions = suggestions
+        self.generation = generation
+
+        # (key, suggestion index, word position) sorted by key
+        entries = []
+        for idx, suggestion in enumerate(suggestions):
+            text = normalize(suggestion.text)
+            for position, match in enumerate(_WORD_START_RE.finditer(text)):
+                tail = text[match.start():]
+                entries.append((to_jamo(tail), idx, position))
+                choseong = to_choseong(tail)
+                if choseong != tail:
+                    entries.append((_CHOSEONG_PREFIX + choseong, idx, position))
+        entries.sort()
+        self.keys = [e[0] for e in entries]
+        self.refs = [(e[1], e[2]) for e in entries]
+
+    @classmethod
+    def from_showcases(cls, showcases: List[Showcase], generation: int = 0) -> "AutocompleteIndex":
+        by_value: Dict[tuple, Suggestion] = {}
+
+        def add(field: str, value: Optional[str], showcase_id: int):
+            value = " ".join((value or "").split())
+            if not value:
+                return
+            key = (field, value.lower())
+            if key not in by_value:
+                by_value[key] = Suggestion(value, field)
+            by_value[key].showcase_ids.append(showcase_id)
+
+        for showcase in showcases:
+            add("title", showcase.title, showcase.id)
+            add("artist", showcase.artist, showcase.id)
+            add("venue", showcase.venue, showcase.id)
+            for genre in (showcase.genre or "").split(","):
+                add("genre", genre, showcase.id)
+
+        return cls(list(by_value.values()), generation)
+
+    def complete(self, query: str, limit: int = 8, max_scan: int = 256) -> List[dict]:
+        """Ranked completions for a (possibly partial) query"""
+        text = normalize(query)
+        if not text:
+            return []
+        if is_choseong_query(text):
+            prefix, choseong = _CHOSEONG_PREFIX + text, True
+        else:
+            prefix, choseong = to_jamo(text), False
+
+        best: Dict[int, float] = {}
+        start = bisect_left(self.keys, prefix)
+        for i in range(start, min(start + max_scan, len(self.keys))):
+            if not self.keys[i].startswith(prefix):
+                break
+            idx, position = self.refs[i]
+            suggestion = self.suggestions[idx]
+            score = (
+                suggestion.weight
+                + (1.0 if position == 0 else 0.0)
+                + 0.3 * math.log1p(len(suggestion.showcase_ids))
+                - 0.01 * len(suggestion.text)
+                - (0.5 if choseong else 0.0)
+            )
+            if score > best.get(idx, float("-inf")):
+                best[idx] = score
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            {
+                "text": self.suggestions[idx].text,
+                "field": self.suggestions[idx].field,
+                "showcase_ids": self.suggestions[idx].showcase_ids,
+                "score": round(score, 3)
+            }
+            for idx, score in ranked
+        ]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Latency and memory benchmark for the embedding backends
+
+Each backend runs in its own subprocess so peak RSS and load time are measured
+in isolation:
+
+    python bench_embeddings.py                          # ollama, torch, onnx, onnx-int8
+    python bench_embeddings.py --backends onnx-int8 --runs 100
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+DEFAULT_BACKENDS = ["ollama", "torch", "onnx", "onnx-int8"]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_documents(csv_path: str = "PAMS.csv", limit: int = 32):
+    docs = []
+    if os.path.exists(csv_path):
+        with open(csv_path, encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                docs.append(" | ".join(v for v in row.values() if v))
+    return (docs * (limit // max(len(docs), 1) + 1))[:limit] if docs else ["showcase"] * limit
+
+
+def run_single(backend_name: str, runs: int, batch_size: int) -> dict:
+    """Benchmark one backend inside the current process"""
+    start = time.perf_counter()
+    from embedding_backends import get_embedding_backend
+    backend = get_embedding_backend(backend_name)
+    backend.encode_one("warm up")
+    load_s = time.perf_counter() - start
+
+    queries = ["rock music concert", "판소리 공연", "contemporary dance", "Gamblerz"]
+    latencies = []
+    for i in range(runs):
+        t0 = time.perf_counter()
+        backend.encode_one(queries[i % len(queries)])
+        latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+
+    docs = load_documents()
+    t0 = time.perf_counter()
+    backend.encode(docs, batch_size=batch_size)
+    batch_s = time.perf_counter() - t0
+
+    return {
+        "backend": backend.name,
+        "load_s": round(load_s, 2),
+        "query_p50_ms": round(latencies[len(latencies) // 2], 2),
+        "query_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "docs_per_s": round(len(docs) / batch_s, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "torch_imported": "torch" in sys.modules
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends")
+    parser.add_argument("--backends", nargs="+", default=DEFAULT_BACKENDS)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(args.backends[0], args.runs, args.batch_size)))
+        return
+
+    print(f"{'backend':<20}{'load s':>8}{'p50 ms':>9}{'p95 ms':>9}{'docs/s':>9}{'RSS MB':>9}  torch")
+    for name in args.backends:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--single", "--backends", name,
+             "--runs", str(args.runs), "--batch-size", str(args.batch_size)],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            print(f"{name:<20}failed: {proc.stderr.strip().splitlines()[-1:]}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{r['backend']:<20}{r['load_s']:>8}{r['query_p50_ms']:>9}{r['query_p95_ms']:>9}"
+              f"{r['docs_per_s']:>9}{r['peak_rss_mb']:>9}  {r['torch_imported']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Catalog ingest at scale: time and peak memory per catalog size
+
+Writes synthetic catalogs of --rows rows (PAMS.csv rows repeated with
+numbered titles) and measures, for each size,
+- catalog: Database.load_from_csv (streamed into SQLite, one transaction)
+- reimport: the same CSV again, a delta import that writes nothing
+- index:   NumpyVectorStore.load_pams_data with precomputed random vectors
+           (ingest cost only, no embedding model)
+as seconds, rows/s and peak traced Python + NumPy memory (tracemalloc). Both
+should grow linearly in time; catalog memory stays flat with the chunk size
+(INGEST_CHUNK_ROWS), the index holds the vectors and documents it serves.
+
+    python bench_ingest.py
+    python bench_ingest.py --rows 10000 50000 100000 --dim 256
+"""
+
+import os
+import csv
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+from database import Database
+from embedding_backends import EmbeddingBackend
+from numpy_store import NumpyVectorStore
+
+
+class NullBackend(EmbeddingBackend):
+    """Never called: every load gets precomputed vectors"""
+
+    name = "null"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def encode(self, texts, batch_size=8):
+        raise RuntimeError("bench_ingest passes precomputed embeddings")
+
+
+def write_catalog(source: str, path: str, rows: int):
+    with open(source, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        template = list(reader)
+    title = header.index("Title")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i in range(rows):
+            row = list(template[i % len(template)])
+            row[title] = f"{row[title]} #{i}"
+            writer.writerow(row)
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure streamed catalog / index ingest at scale")
+    parser.add_argument("--csv", default="PAMS.csv", help="Rows to repeat")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--dim", type=int, default=1024)
+    args = parser.parse_args()
+
+    print(f"\n{'rows':>8} {'CSV MB':>7} | {'catalog s':>9} {'rows/s':>8} {'peak MB':>8} | "
+          f"{'reimport s':>10} | {'index s':>8} {'rows/s':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            csv_path = os.path.join(tmp, f"catalog_{rows}.csv")
+            write_catalog(args.csv, csv_path, rows)
+            db = Database(os.path.join(tmp, f"catalog_{rows}.db"))
+            catalog_s, catalog_mb = measure(lambda: db.load_from_csv(csv_path))
+            reimport_s, _ = measure(lambda: db.load_from_csv(csv_path))
+
+            vectors = np.lib.format.open_memmap(os.path.join(tmp, "vectors.npy"), mode="w+",
+                                                dtype=np.float32, shape=(rows, args.dim))
+            vectors[:] = np.random.default_rng(0).standard_normal((rows, args.dim), dtype=np.float32)
+            store = NumpyVectorStore(os.path.join(tmp, f"index_{rows}"), NullBackend(args.dim),
+                                     reduced_dim=0)
+            index_s, index_mb = measure(lambda: store.load_pams_data(csv_path, embeddings=vectors))
+            del store, vectors
+
+            print(f"{rows:>8} {os.path.getsize(csv_path) / 1e6:>7.1f} | "
+                  f"{catalog_s:>9.2f} {rows / catalog_s:>8.0f} {catalog_mb:>8.1f} | "
+                  f"{reimport_s:>10.2f} | {index_s:>8.2f} {rows / index_s:>8.0f} {index_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
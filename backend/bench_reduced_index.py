@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Recall/memory trade-off of the two-stage (reduced int8 + exact rescoring) index
+
+For every reduction method and dimension, the NumPy index is rebuilt with
+VECTOR_REDUCED_DIM-style settings and compared against plain exact search:
+recall@k of the two-stage results, resident index memory and query latency.
+
+Random Gaussian vectors have no low-rank structure, unlike real embeddings, so
+the synthetic catalog is drawn from a low-rank latent space plus noise. Pass
+--vectors to use a real vectors.npy written by the numpy index instead (queries
+are then perturbed catalog rows).
+
+    python bench_reduced_index.py                          # 20000 synthetic rows
+    python bench_reduced_index.py --vectors vector_index/vectors.npy --dims 64,128
+"""
+
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+from config import EMBEDDING_DIM
+from embedding_backends import get_embedding_backend, normalize_rows
+from numpy_store import NumpyVectorStore
+
+
+def synthetic_vectors(n: int, dim: int, rank: int, rng) -> np.ndarray:
+    basis = rng.standard_normal((rank, dim)).astype(np.float32)
+    # Decaying spectrum, as in sentence embeddings
+    weights = (1.0 / np.sqrt(np.arange(1, rank + 1))).astype(np.float32)
+    latent = rng.standard_normal((n, rank)).astype(np.float32) * weights
+    noise = 0.05 * rng.standard_normal((n, dim)).astype(np.float32)
+    return normalize_rows(latent @ basis + noise)
+
+
+def fill(store, vectors):
+    ids = [f"pams_{i+1}" for i in range(len(vectors))]
+    start = time.perf_counter()
+    store.add_records(ids, [""] * len(ids), [{} for _ in ids], vectors)
+    return time.perf_counter() - start
+
+
+def run_queries(store, queries, top_k):
+    latencies, results = [], []
+    for query in queries:
+        t0 = time.perf_counter()
+        results.append(store.query_vector(query, top_k)["ids"])
+        latencies.append((time.perf_counter() - t0) * 1e6)
+    return latencies, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the reduced two-stage vector index")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--vectors", help="vectors.npy from a numpy index (overrides --rows)")
+    parser.add_argument("--dims", default="32,64,128,256")
+    parser.add_argument("--methods", default="pca,random")
+    parser.add_argument("--shortlist-factor", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.vectors:
+        vectors = normalize_rows(np.load(args.vectors).astype(np.float32))
+        picks = rng.choice(len(vectors), args.runs)
+        queries = normalize_rows(vectors[picks] + 0.05 * rng.standard_normal(vectors[picks].shape).astype(np.float32))
+    else:
+        both = synthetic_vectors(args.rows + args.runs, EMBEDDING_DIM, 128, rng)
+        vectors, queries = both[:args.rows], both[args.rows:]
+    embedding_backend = get_embedding_backend("ollama")  # never called: vectors are precomputed
+
+    exact = NumpyVectorStore(None, embedding_backend=embedding_backend, reduced_dim=0)
+    fill(exact, vectors)
+    exact_lat, exact_ids = run_queries(exact, queries, args.top_k)
+    full_bytes = exact.memory_usage()["resident_bytes"]
+
+    rows = [{
+        "method": "exact", "dim": vectors.shape[1], "build_s": "-",
+        f"recall@{args.top_k}": 1.0,
+        "resident_mib": round(full_bytes / 2**20, 2), "memory_x": 1.0,
+        "p50_us": round(float(np.percentile(exact_lat, 50)), 1)
+    }]
+
+    tmp = tempfile.mkdtemp(prefix="bench_reduced_")
+    try:
+        for method in args.methods.split(","):
+            for dim in (int(d) for d in args.dims.split(",")):
+                store = NumpyVectorStore(f"{tmp}/{method}_{dim}", embedding_backend=embedding_backend,
+                                         reduced_dim=dim, reduction=method,
+                                         shortlist_factor=args.shortlist_factor)
+                build = fill(store, vectors)
+                latencies, ids = run_queries(store, queries, args.top_k)
+                recall = np.mean([len(set(a) & set(b)) / max(len(b), 1) for a, b in zip(ids, exact_ids)])
+                resident = store.memory_usage()["resident_bytes"]
+                rows.append({
+                    "method": method, "dim": dim, "build_s": round(build, 2),
+                    f"recall@{args.top_k}": round(float(recall), 4),
+                    "resident_mib": round(resident / 2**20, 2),
+                    "memory_x": round(full_bytes / resident, 1),
+                    "p50_us": round(float(np.percentile(latencies, 50)), 1)
+                })
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"\n{len(vectors)} rows, shortlist = {args.shortlist_factor} x top-{args.top_k}")
+    columns = list(rows[0].keys())
+    print(" | ".join(columns))
+    for row in rows:
+        print(" | ".join(str(row[c]) for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+API cold-start measurement: import time and time to first byte
+
+1. `python -X importtime -c "import main"`: total import time of the API module
+   and its slowest imports (cumulative)
+2. Starts `uvicorn main:app` and reports, from process spawn, when
+   - GET /                the server answers at all
+   - GET /api/showcases   the catalog endpoints answer (SQLite stage)
+   - GET /ready           every subsystem, including the vector index, is ready
+
+    python bench_startup.py
+    python bench_startup.py --port 8123 --top 15 --timeout 600
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+import urllib.error
+import urllib.request
+
+
+def import_times(top: int):
+    """(total us for main, [(cumulative us, module), ...] of main's direct imports, slowest first)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True
+    )
+    total, direct = 0, []
+    for line in completed.stderr.splitlines():
+        parts = line[len("import time:"):].split("|") if line.startswith("import time:") else []
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        # Drop the space after the "|"; the rest is indented by import depth
+        cumulative_us, module = int(parts[1]), parts[2][1:].rstrip()
+        if module.strip() == "main":
+            total = cumulative_us
+        # Two spaces: imported by main itself
+        elif module.startswith("  ") and not module.startswith("   "):
+            direct.append((cumulative_us, module.strip()))
+    return total, sorted(direct, reverse=True)[:top]
+
+
+def get(url: str, timeout: float = 2.0):
+    """Status code of GET url, or None if nothing answered"""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read(1)
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return None
+
+
+def time_to_first_byte(port: int, timeout: float) -> dict:
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    marks = {"root_s": None, "catalog_s": None, "ready_s": None}
+    try:
+        while time.perf_counter() - start < timeout and marks["ready_s"] is None:
+            elapsed = round(time.perf_counter() - start, 3)
+            if marks["root_s"] is None and get(f"{base}/") == 200:
+                marks["root_s"] = elapsed
+            if marks["root_s"] is not None and marks["catalog_s"] is None \
+                    and get(f"{base}/api/showcases") == 200:
+                marks["catalog_s"] = round(time.perf_counter() - start, 3)
+            if marks["root_s"] is not None and get(f"{base}/ready") == 200:
+                marks["ready_s"] = round(time.perf_counter() - start, 3)
+            time.sleep(0.02)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return marks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API import time and time to first byte")
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds to wait for /ready")
+    args = parser.parse_args()
+
+    total, slowest = import_times(args.top)
+    print(f"\nimport main: {total / 1000:.1f} ms")
+    print("slowest direct imports (cumulative ms):")
+    for us, module in slowest:
+        print(f"  {us / 1000:8.1f}  {module}")
+
+    marks = time_to_first_byte(args.port, args.timeout)
+    print("\nfrom process spawn:")
+    print(f"  first byte (GET /):          {marks['root_s']} s")
+    print(f"  catalog (GET /api/showcases): {marks['catalog_s']} s")
+    print(f"  ready (GET /ready == 200):    {marks['ready_s']} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Query latency benchmark: Chroma (HNSW) vs the exact in-memory NumPy index
+
+Both stores are filled with the same random unit vectors and queried with
+precomputed query vectors, so only the index is timed (no embedding model, no
+query cache). Chroma's recall@k is reported against the exact NumPy results.
+
+    python bench_vector_store.py                       # 18, 1000 and 20000 rows
+    python bench_vector_store.py --sizes 5000 --runs 500 --top-k 20
+"""
+
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+from config import EMBEDDING_DIM
+from embedding_backends import get_embedding_backend, normalize_rows
+
+
+def percentile(latencies, q):
+    return float(np.percentile(latencies, q))
+
+
+def fill(store, vectors):
+    ids = [f"pams_{i+1}" for i in range(len(vectors))]
+    documents = [f"showcase {i+1}" for i in range(len(vectors))]
+    metadatas = [{"Genre": ["Music", "Dance", "Theater"][i % 3]} for i in range(len(vectors))]
+    start = time.perf_counter()
+    # Chroma caps a single add() at its max batch size, so feed it in slices
+    for i in range(0, len(ids), 5000):
+        store.add_records(ids[i:i+5000], documents[i:i+5000], metadatas[i:i+5000], vectors[i:i+5000])
+    return time.perf_counter() - start
+
+
+def time_queries(store, queries, top_k, **kwargs):
+    latencies, results = [], []
+    for query in queries:
+        t0 = time.perf_counter()
+        result = store.query_vector(query, top_k, **kwargs)
+        latencies.append((time.perf_counter() - t0) * 1e6)
+        results.append(result["ids"])
+    return latencies, results
+
+
+def bench_size(n: int, runs: int, top_k: int, dim: int, seed: int = 0) -> dict:
+    from chroma_store import ChromaVectorStore
+    from numpy_store import NumpyVectorStore
+
+    rng = np.random.default_rng(seed)
+    vectors = normalize_rows(rng.standard_normal((n, dim)).astype(np.float32))
+    queries = normalize_rows(rng.standard_normal((runs, dim)).astype(np.float32))
+    embedding_backend = get_embedding_backend("ollama")  # never called: vectors are precomputed
+
+    tmp = tempfile.mkdtemp(prefix="bench_vs_")
+    try:
+        chroma = ChromaVectorStore(f"{tmp}/chroma", embedding_backend=embedding_backend)
+        exact = NumpyVectorStore(None, embedding_backend=embedding_backend)
+        chroma_build = fill(chroma, vectors)
+        numpy_build = fill(exact, vectors)
+
+        chroma_lat, chroma_ids = time_queries(chroma, queries, top_k)
+        numpy_lat, numpy_ids = time_queries(exact, queries, top_k)
+        where = {"Genre": "Dance"}
+        chroma_filtered_lat, _ = time_queries(chroma, queries, top_k, where=where)
+        filtered_lat, _ = time_queries(exact, queries, top_k, where=where)
+
+        recall = np.mean([
+            len(set(a) & set(b)) / max(len(b), 1) for a, b in zip(chroma_ids, numpy_ids)
+        ])
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return {
+        "rows": n,
+        "chroma_build_s": round(chroma_build, 3),
+        "numpy_build_s": round(numpy_build, 3),
+        "chroma_p50_us": round(percentile(chroma_lat, 50), 1),
+        "chroma_p95_us": round(percentile(chroma_lat, 95), 1),
+        "numpy_p50_us": round(percentile(numpy_lat, 50), 1),
+        "numpy_p95_us": round(percentile(numpy_lat, 95), 1),
+        "chroma_filtered_p50_us": round(percentile(chroma_filtered_lat, 50), 1),
+        "numpy_filtered_p50_us": round(percentile(filtered_lat, 50), 1),
+        f"chroma_recall@{top_k}": round(float(recall), 4)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Chroma vs in-memory NumPy vector search")
+    parser.add_argument("--sizes", default="18,1000,20000",
+                        help="Comma-separated catalog sizes")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM)
+    args = parser.parse_args()
+
+    rows = [bench_size(int(n), args.runs, args.top_k, args.dim) for n in args.sizes.split(",")]
+
+    columns = list(rows[0].keys())
+    print("\n" + " | ".join(columns))
+    for row in rows:
+        print(" | ".join(str(row[c]) for c in columns))
+
+
+if __name__ == "__main__":
+    main()
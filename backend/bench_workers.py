@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Multi-worker serving: search throughput and memory per worker count
+
+For each --workers N, starts `uvicorn main:app --workers N`, waits until the
+workers answer /ready, then fires POST /api/chroma/search from --clients
+threads for --seconds and reports
+- requests/s and p50 / p95 latency
+- memory of the server processes: RSS summed over processes, and PSS (pages
+  shared between workers, e.g. the memory-mapped NumPy index, counted once
+  overall), both in MB (Linux only)
+
+Only the first run builds the index; later runs open the published version.
+
+    python bench_workers.py
+    python bench_workers.py --workers 1 2 4 --clients 16 --seconds 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import threading
+import urllib.error
+import urllib.request
+
+QUERIES = ["traditional music", "breakdance crew", "jazz quartet", "contemporary dance", "pansori"]
+
+
+def post(url: str, body: dict, timeout: float = 10.0):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return None
+
+
+def ready(base: str) -> bool:
+    try:
+        with urllib.request.urlopen(f"{base}/ready", timeout=2) as response:
+            return response.status == 200
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return False
+
+
+def descendants(pid: int):
+    """pid and every process below it (Linux /proc)"""
+    pids, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        pids.append(current)
+        try:
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                stack.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def memory_mb(pid: int):
+    """(RSS, PSS) summed over the server's processes, in MB (None off Linux)"""
+    rss = pss = 0
+    for process in descendants(pid):
+        try:
+            with open(f"/proc/{process}/smaps_rollup") as f:
+                for line in f:
+                    key, value = line.split(":", 1)
+                    if key == "Rss":
+                        rss += int(value.split()[0])
+                    elif key == "Pss":
+                        pss += int(value.split()[0])
+        except OSError:
+            return None, None
+    return round(rss / 1024, 1), round(pss / 1024, 1)
+
+
+def run(app: str, workers: int, port: int, clients: int, seconds: float, timeout: float) -> dict:
+    base = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        # /ready is answered by whichever worker takes the connection
+        start, consecutive = time.perf_counter(), 0
+        while consecutive < 4 * workers:
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError(f"{workers} worker(s) not ready after {timeout} s")
+            consecutive = consecutive + 1 if ready(base) else 0
+            time.sleep(0.05)
+
+        latencies, failures = [], [0]
+        deadline = time.perf_counter() + seconds
+
+        def client(offset: int):
+            i = offset
+            while time.perf_counter() < deadline:
+                t = time.perf_counter()
+                status = post(f"{base}/api/chroma/search",
+                              {"query": QUERIES[i % len(QUERIES)], "n_results": 10})
+                latencies.append(time.perf_counter() - t)
+                if status != 200:
+                    failures[0] += 1
+                i += 1
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies.sort()
+        rss, pss = memory_mb(server.pid)
+        return {
+            "workers": workers,
+            "req_s": round(len(latencies) / seconds, 1),
+            "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 1),
+            "failed": failures[0],
+            "rss_mb": rss,
+            "pss_mb": pss
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure search throughput and memory per worker count")
+    parser.add_argument("--app", default="main:app")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=8124)
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client threads")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for /ready")
+    args = parser.parse_args()
+
+    print(f"\ncpus: {os.cpu_count()}, clients: {args.clients}, {args.seconds:g} s per run")
+    print(f"{'workers':>7} {'req/s':>8} {'p50 ms':>7} {'p95 ms':>7} {'failed':>6} {'RSS MB':>8} {'PSS MB':>8}")
+    for workers in args.workers:
+        r = run(args.app, workers, args.port, args.clients, args.seconds, args.timeout)
+        print(f"{r['workers']:>7} {r['req_s']:>8} {r['p50_ms']:>7} {r['p95_ms']:>7} {r['failed']:>6} "
+              f"{r['rss_mb']:>8} {r['pss_mb']:>8}")
+
+
+if __name__ == "__main__":
+    main()
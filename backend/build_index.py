@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Offline index build: PAMS.csv -> deployable index artifact
+
+Builds the SQLite catalog, embeddings, vector index and neighbour table into
+one versioned directory (see index_artifact.py). Rerunning after an
+interruption resumes the embedding from its last checkpoint; rerunning on an
+unchanged CSV is a no-op.
+
+    python build_index.py
+    python build_index.py --csv PAMS.csv --out ./artifacts --store numpy --workers 4
+
+Then serve it on any host, without embedding anything at startup:
+
+    INDEX_ARTIFACT=./artifacts/pams-<sha>-<backend>-numpy uvicorn main:app
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+from index_artifact import build_artifact, read_manifest
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build a deployable index artifact from PAMS.csv")
+    parser.add_argument("--csv", default="PAMS.csv")
+    parser.add_argument("--out", default="./artifacts", help="Directory the artifact is written under")
+    parser.add_argument("--name", default=None,
+                        help="Artifact directory name (defaults to pams-<csv sha>-<backend>-<store>)")
+    parser.add_argument("--store", default=None, choices=["chroma", "numpy"],
+                        help="Vector index to build (defaults to VECTOR_BACKEND)")
+    parser.add_argument("--backend", default=None,
+                        help="Embedding backend (defaults to EMBEDDING_BACKEND)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Embedding worker processes (each pinned to a share of the cores)")
+    parser.add_argument("--chunk-size", type=int, default=64,
+                        help="Documents per embedding chunk (checkpoint granularity)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.csv):
+        logger.error(f"{args.csv} not found in {os.getcwd()}")
+        sys.exit(1)
+
+    path = build_artifact(args.csv, args.out, vector_store=args.store, backend=args.backend,
+                          workers=args.workers, chunk_size=args.chunk_size, name=args.name)
+    manifest = read_manifest(path)
+    logger.info(f"Artifact: {path}")
+    logger.info(f"  {manifest['count']} documents, {manifest['backend']} ({manifest['dim']}d), "
+                f"{manifest['vector_store']} index, {len(manifest['files'])} files")
+    logger.info(f"Serve it with INDEX_ARTIFACT={os.path.abspath(path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+In-memory catalog snapshot
+
+Read-heavy endpoints (autocomplete, caches, listings) work from one immutable
+snapshot of the showcase table instead of querying SQLite per request. Each
+snapshot carries the catalog generation it was built from, so anything derived
+from it can tell when the catalog has been reloaded.
+
+Catalog imports are deltas (see database.CatalogWriter): each one reports a
+ChangeSet, so the indexes built on the catalog redo only the rows that changed.
+"""
+import os
+from typing import Dict, List, Optional
+
+from models import Showcase
+
+
+class CatalogSnapshot:
+    """Immutable list of showcases for one catalog generation"""
+
+    def __init__(self, showcases: List[Showcase], generation: int):
+        self.showcases = showcases
+        self.generation = generation
+        self.by_id: Dict[int, Showcase] = {s.id: s for s in showcases}
+
+    def __len__(self) -> int:
+        return len(self.showcases)
+
+    def get(self, showcase_id: int) -> Optional[Showcase]:
+        return self.by_id.get(showcase_id)
+
+
+class ChangeSet:
+    """What one catalog import changed, for indexes that update incrementally
+
+    inserted / updated / deleted hold catalog ids; `ids` and `hashes` give the
+    catalog id and content hash of every CSV row, in CSV order, so a vector
+    index can be rebuilt with the same ids and reuse the vectors of rows whose
+    hash it has seen before.
+    """
+
+    def __init__(self, csv_path: Optional[str] = None):
+        self.csv_path = csv_path
+        self.inserted: List[int] = []
+        self.updated: List[int] = []
+        self.deleted: List[int] = []
+        self.unchanged = 0
+        self.ids: List[int] = []
+        self.hashes: List[str] = []
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    @property
+    def doc_ids(self) -> List[str]:
+        """Vector index ids of the CSV rows ("pams_<catalog id>")"""
+        return [f"pams_{showcase_id}" for showcase_id in self.ids]
+
+    def applies_to(self, csv_path: str) -> bool:
+        """True if this import was of `csv_path`"""
+        return (self.csv_path is not None and os.path.exists(csv_path)
+                and os.path.samefile(self.csv_path, csv_path))
+
+    def summary(self) -> Dict[str, int]:
+        return {"inserted": len(self.inserted), "updated": len(self.updated),
+                "deleted": len(self.deleted), "unchanged": self.unchanged}
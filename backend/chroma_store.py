@@ -1,20 +1,66 @@
+import os
 import chromadb
 from chromadb.config import Settings
-from chromadb.utils import embedding_functions
-import pandas as pd
-import os
-from typing import List, Dict, Any
+import numpy as np
+from typing import List, Dict, Any, Optional
 import logging
-import requests
-import json
+
+from embedding_backends import EmbeddingBackend
+from vector_store import VectorStore, empty_results
+from index_versions import VersionPointer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class ChromaVectorStore:
-    def __init__(self, persist_directory: str = "./chroma_db"):
-        """Initialize Chroma vector store with local persistence"""
+# Collection versions are named <alias>__v<n> (see index_versions.py)
+VERSION_SEPARATOR = "__v"
+
+class BackendEmbeddingFunction:
+    """Chroma embedding function that delegates to an EmbeddingBackend"""
+
+    def __init__(self, backend: EmbeddingBackend):
+        self.backend = backend
+
+    def __call__(self, input):
+        # Chroma expects 'input' parameter name - can be string or list of strings
+        texts = [input] if isinstance(input, str) else list(input)
+        return self.backend.encode(texts).tolist()
+
+    # Newer Chroma releases call these instead of __call__
+    def embed_documents(self, input):
+        return self(input)
+
+    def embed_query(self, input):
+        return self(input)
+
+    def name(self):
+        return self.backend.name
+
+
+class ChromaVectorStore(VectorStore):
+    """Persistent Chroma collection (HNSW, cosine space)"""
+
+    backend_name = "chroma"
+
+    def __init__(self, persist_directory: str = "./chroma_db",
+                 embedding_backend: EmbeddingBackend = None,
+                 collection_name: str = "pams_showcases",
+                 version: Optional[str] = None,
+                 read_only: bool = False):
+        """Initialize Chroma vector store with local persistence
+
+        `collection_name` is an alias: the store opens the collection version the
+        alias points to (or `version`, for a build that is not published yet).
+        A `read_only` store only queries an existing collection.
+        """
+        super().__init__(embedding_backend)
+        self.read_only = read_only
         self.persist_directory = persist_directory
+        self.alias = collection_name
+        self.versions = VersionPointer(os.path.join(persist_directory, f"{collection_name}.alias.json"),
+                                       collection_name)
+        self.collection_name = version or self.versions.current or collection_name
+        self.version = self.collection_name
         
         # Create Chroma client with persistence
         self.client = chromadb.PersistentClient(
@@ -25,166 +71,110 @@ class ChromaVectorStore:
             )
         )
         
-        # Use Ollama BGE-M3 for embeddings
-        class OllamaBGEEmbeddingFunction:
-            def __init__(self, ollama_url="http://localhost:11434"):
-                self.ollama_url = ollama_url
-                self._name = "ollama-bge-m3"
-
-            def __call__(self, input):
-                # Chroma expects 'input' parameter name - can be string or list of strings
-                if isinstance(input, str):
-                    texts = [input]
-                else:
-                    texts = input
-
-                embeddings = []
-                for text in texts:
-                    try:
-                        response = requests.post(
-                            f"{self.ollama_url}/api/embeddings",
-                            json={
-                                "model": "bge-m3",
-                                "prompt": text
-                            },
-                            timeout=30
-                        )
-                        response.raise_for_status()
-                        embedding = response.json()["embedding"]
-                        embeddings.append(embedding)
-                    except requests.exceptions.RequestException as e:
-                        logger.error(f"Ollama embedding request failed: {e}")
-                        # Fallback to zero vector if Ollama fails
-                        embeddings.append([0.0] * 1024)  # BGE-M3 has 1024 dimensions
-
-                return embeddings
-
-            def name(self):
-                return self._name
-
-        self.embedding_function = OllamaBGEEmbeddingFunction()
-        logger.info("Using Ollama BGE-M3 for embeddings")
+        self.embedding_function = BackendEmbeddingFunction(self.embedding_backend)
         
         # Get or create collection for PAMS showcases
         try:
             # Try to get existing collection first
             self.collection = self.client.get_collection(
-                name="pams_showcases",
+                name=self.collection_name,
                 embedding_function=self.embedding_function
             )
         except:
+            if read_only:
+                raise RuntimeError(f"Collection {self.collection_name} has not been built yet")
             # Create new collection if it doesn't exist
             self.collection = self.client.create_collection(
-                name="pams_showcases",
+                name=self.collection_name,
                 embedding_function=self.embedding_function,
                 metadata={"hnsw:space": "cosine"}
             )
         
         logger.info(f"Initialized ChromaDB at {persist_directory}")
-        logger.info(f"Collection 'pams_showcases' has {self.collection.count()} documents")
+        logger.info(f"Collection '{self.collection_name}' has {self.collection.count()} documents")
     
-    def load_pams_data(self, csv_path: str = "PAMS.csv"):
-        """Load PAMS data from CSV and create embeddings"""
-        if not os.path.exists(csv_path):
-            logger.error(f"CSV file not found: {csv_path}")
-            return
-        
-        # Read CSV
-        df = pd.read_csv(csv_path, encoding='utf-8-sig')
-        logger.info(f"Loaded {len(df)} rows from {csv_path}")
-        
-        # Check if data already exists
-        existing_count = self.collection.count()
-        if existing_count > 0:
-            logger.info(f"Collection already contains {existing_count} documents. Resetting...")
-            self.collection.delete(where={})
-        
-        # Prepare documents for embedding
-        documents = []
-        metadatas = []
-        ids = []
-        
-        for idx, row in df.iterrows():
-            # Create text representation for embedding
-            doc_text = self._create_document_text(row)
-            documents.append(doc_text)
-
-            # Store all columns as metadata
-            metadata = {}
-            for col in df.columns:
-                value = row[col]
-                # Handle NaN values - skip None values as Chroma doesn't accept them
-                if pd.isna(value):
-                    continue  # Skip None values
-                elif isinstance(value, (int, float)):
-                    metadata[col] = float(value)
-                else:
-                    metadata[col] = str(value)
-
-            metadatas.append(metadata)
-            # Use idx+1 to match database rowid (which starts from 1)
-            ids.append(f"pams_{idx+1}")
-        
+    def count(self) -> int:
+        return self.collection.count()
+    
+    def add_records(self, ids, documents, metadatas, embeddings=None):
+        self._check_writable()
         # Add to collection in batches
         batch_size = 100
         for i in range(0, len(documents), batch_size):
             batch_end = min(i + batch_size, len(documents))
-            self.collection.add(
-                documents=documents[i:batch_end],
-                metadatas=metadatas[i:batch_end],
-                ids=ids[i:batch_end]
-            )
+            batch = {
+                "documents": documents[i:batch_end],
+                "metadatas": metadatas[i:batch_end],
+                "ids": ids[i:batch_end]
+            }
+            if embeddings is not None:
+                batch["embeddings"] = np.asarray(embeddings[i:batch_end], dtype=np.float32).tolist()
+            self.collection.add(**batch)
             logger.info(f"Added batch {i//batch_size + 1}/{(len(documents)-1)//batch_size + 1}")
-        
-        logger.info(f"Successfully embedded {len(documents)} documents")
     
-    def _create_document_text(self, row) -> str:
-        """Create text representation of a showcase for embedding"""
-        text_parts = []
-        
-        # Key fields for embedding - using actual column names from PAMS.csv
-        if pd.notna(row.get('Title')):
-            text_parts.append(f"Title: {row['Title']}")
-        
-        if pd.notna(row.get('Artist')):
-            text_parts.append(f"Artist: {row['Artist']}")
-        
-        if pd.notna(row.get('Genre')):
-            text_parts.append(f"Genre: {row['Genre']}")
-        
-        if pd.notna(row.get('Artist description')):
-            text_parts.append(f"Artist Description: {row['Artist description']}")
-        
-        if pd.notna(row.get('Introduction to the work')):
-            text_parts.append(f"Introduction: {row['Introduction to the work']}")
-        
-        if pd.notna(row.get('PAMS Venue')):
-            text_parts.append(f"Venue: {row['PAMS Venue']}")
-        
-        if pd.notna(row.get('Director')):
-            text_parts.append(f"Director: {row['Director']}")
-        
-        if pd.notna(row.get('Cast')):
-            text_parts.append(f"Cast: {row['Cast']}")
-        
-        if pd.notna(row.get('Review')):
-            text_parts.append(f"Review: {row['Review']}")
-        
-        return " | ".join(text_parts)
+    def _clear(self):
+        self._check_writable()
+        self.client.delete_collection(self.collection_name)
+        self.collection = self.client.create_collection(
+            name=self.collection_name,
+            embedding_function=self.embedding_function,
+            metadata={"hnsw:space": "cosine"}
+        )
     
-    def search_similar(self, query_text: str, n_results: int = 10) -> Dict[str, Any]:
-        """Search for similar showcases based on text query"""
+    def create_version(self) -> "ChromaVectorStore":
+        name, abandoned = self.versions.begin(lambda n: f"{self.alias}{VERSION_SEPARATOR}{n}")
+        if abandoned:
+            self._drop_version(abandoned)
+        store = ChromaVectorStore(self.persist_directory, self.embedding_backend,
+                                  collection_name=self.alias, version=name)
+        store.catalog_year = self.catalog_year
+        return store
+
+    def _drop_version(self, name: str):
+        try:
+            self.client.delete_collection(name)
+        except Exception as e:
+            logger.warning(f"Could not drop collection version {name}: {e}")
+
+    def query_vector(self, query_embedding: np.ndarray, n_results: int,
+                     where: Optional[dict] = None,
+                     include_embeddings: bool = False) -> Dict[str, Any]:
+        if n_results <= 0 or self.collection.count() == 0:
+            return empty_results()
+        include = ["metadatas", "documents", "distances"]
+        if include_embeddings:
+            include.append("embeddings")
+        # Chroma applies `where` as a pre-filter inside the HNSW search
         results = self.collection.query(
-            query_texts=[query_text],
-            n_results=n_results
+            query_embeddings=[np.asarray(query_embedding, dtype=np.float32).tolist()],
+            n_results=n_results,
+            where=where or None,
+            include=include
         )
         
-        return {
+        output = {
             "ids": results["ids"][0] if results["ids"] else [],
             "distances": results["distances"][0] if results["distances"] else [],
             "metadatas": results["metadatas"][0] if results["metadatas"] else [],
             "documents": results["documents"][0] if results["documents"] else []
         }
+        if include_embeddings:
+            output["embeddings"] = results["embeddings"][0] if results["embeddings"] is not None else []
+        return output
+    
+    def get_records(self, ids: List[str], include_embeddings: bool = False) -> Dict[str, Any]:
+        include = ["metadatas", "documents"] + (["embeddings"] if include_embeddings else [])
+        return self.collection.get(ids=ids, include=include)
+    
+    def filter_ids(self, where: Optional[dict]) -> List[str]:
+        return self.collection.get(where=where or None, include=[])["ids"]
+    
+    def get_all_metadatas(self) -> List[Dict[str, Any]]:
+        return self.collection.get(include=["metadatas"])["metadatas"]
+    
+    def get_all_documents(self):
+        stored = self.collection.get(include=["documents"])
+        return stored["ids"], stored["documents"]
     
     def search_by_metadata(self, filters: Dict[str, Any], n_results: int = 10) -> Dict[str, Any]:
         """Search showcases by metadata filters"""
@@ -200,22 +190,9 @@ class ChromaVectorStore:
         
         return results
     
-    def get_showcase_by_id(self, showcase_id: str) -> Dict[str, Any]:
-        """Get a specific showcase by its ID"""
-        result = self.collection.get(
-            ids=[showcase_id]
-        )
-        
-        if result["ids"]:
-            return {
-                "id": result["ids"][0],
-                "metadata": result["metadatas"][0] if result["metadatas"] else {},
-                "document": result["documents"][0] if result["documents"] else ""
-            }
-        return None
-    
     def update_showcase(self, showcase_id: str, metadata: Dict[str, Any], document: str = None):
         """Update a showcase's metadata and/or document"""
+        self._check_writable()
         if document:
             self.collection.update(
                 ids=[showcase_id],
@@ -227,20 +204,13 @@ class ChromaVectorStore:
                 ids=[showcase_id],
                 metadatas=[metadata]
             )
+        self.generation += 1
     
     def delete_showcase(self, showcase_id: str):
         """Delete a showcase from the collection"""
+        self._check_writable()
         self.collection.delete(ids=[showcase_id])
-    
-    def reset_collection(self):
-        """Reset the entire collection"""
-        self.client.delete_collection("pams_showcases")
-        self.collection = self.client.create_collection(
-            name="pams_showcases",
-            embedding_function=self.embedding_function,
-            metadata={"hnsw:space": "cosine"}
-        )
-        logger.info("Collection reset successfully")
+        self.generation += 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,108 @@
+"""
+Overlapping chunks of long showcase documents, pooled back to showcases
+
+BGE-M3 reads at most EMBEDDING_MAX_LENGTH tokens (and Ollama truncates the
+concatenated showcase text on its own), so most of a long introduction or
+review never reaches the single document vector. With CHUNK_WORDS > 0 each
+document is also split into windows of CHUNK_WORDS words overlapping by
+CHUNK_OVERLAP, every chunk after the first prefixed with the showcase title so
+it keeps its context.
+
+Chunks are embedded in batches and stored in one matrix with their parent
+showcase; a parent's chunks are contiguous rows. A query is one GEMV over all
+chunks followed by a segmented reduce (np.maximum.reduceat / np.add.reduceat)
+into one score per showcase:
+
+- max: similarity of the best matching passage
+- sum: adds up every chunk's similarity, favouring showcases that match in
+  several places
+
+so the pooled top-k still comes from a single pass. The index size is
+predictable: a document of w words gives max(1, ceil((w - overlap) / (size -
+overlap))) chunks of `dim` float32 each.
+"""
+import math
+import logging
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from embedding_backends import normalize_rows
+
+logger = logging.getLogger(__name__)
+
+POOLING = ("max", "sum")
+
+
+def chunk_text(text: str, size: int, overlap: int, prefix: str = "") -> List[str]:
+    """Windows of `size` words with `overlap` words shared between neighbours"""
+    words = (text or "").split()
+    if len(words) <= size:
+        return [text or ""]
+    step = max(size - overlap, 1)
+    chunks = []
+    for start in range(0, len(words) - overlap, step):
+        chunk = " ".join(words[start:start + size])
+        chunks.append(f"{prefix}{chunk}" if start and prefix else chunk)
+    return chunks
+
+
+def expected_chunks(n_words: int, size: int, overlap: int) -> int:
+    if n_words <= size:
+        return 1
+    return math.ceil((n_words - overlap) / max(size - overlap, 1))
+
+
+class ChunkIndex:
+    """Unit chunk vectors grouped by parent showcase"""
+
+    def __init__(self, ids: List[str], offsets: np.ndarray, matrix: np.ndarray, chunks: List[str]):
+        self.ids = ids            # parent showcase ids
+        self.offsets = offsets    # (len(ids),) first chunk row of every parent
+        self.matrix = matrix      # (n_chunks, dim) float32
+        self.chunks = chunks      # chunk texts, row-aligned with matrix
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes + self.offsets.nbytes
+
+    @classmethod
+    def build(cls, ids: List[str], documents: List[str], titles: List[Optional[str]],
+              encode: Callable[..., np.ndarray], size: int, overlap: int,
+              batch_size: int = 16) -> "ChunkIndex":
+        chunks, offsets = [], []
+        for document, title in zip(documents, titles):
+            offsets.append(len(chunks))
+            chunks.extend(chunk_text(document, size, overlap, prefix=f"Title: {title} | " if title else ""))
+        vectors = normalize_rows(encode(chunks, batch_size=batch_size)) if chunks else \
+            np.zeros((0, 0), dtype=np.float32)
+        return cls(ids, np.asarray(offsets, dtype=np.int64), vectors, chunks)
+
+    def search(self, query_embedding: np.ndarray, k: int, pooling: str = "max",
+               mask: Optional[np.ndarray] = None) -> List[Tuple[int, float, float, int]]:
+        """Top-k (parent row, pooled score, best chunk similarity, best chunk row)"""
+        if pooling not in POOLING:
+            raise ValueError(f"Unknown pooling '{pooling}', expected one of {POOLING}")
+        if not self.ids:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        similarities = self.matrix @ (query / (np.linalg.norm(query) or 1.0))
+
+        best = np.maximum.reduceat(similarities, self.offsets)
+        pooled = best if pooling == "max" else np.add.reduceat(similarities, self.offsets)
+
+        rows = np.arange(len(self.ids)) if mask is None else np.flatnonzero(mask)
+        k = min(k, len(rows))
+        if k <= 0:
+            return []
+        scores = pooled[rows]
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        ends = np.append(self.offsets[1:], len(self.matrix))
+        hits = []
+        for row in rows[top]:
+            start, end = self.offsets[row], ends[row]
+            best_chunk = int(start + np.argmax(similarities[start:end]))
+            hits.append((int(row), float(pooled[row]), float(best[row]), best_chunk))
+        return hits
@@ -0,0 +1,104 @@
+"""
+Runtime configuration for the backend services
+Values are read from environment variables so a deployment can switch
+embedding and index backends without code changes
+"""
+import os
+
+# Local Ollama server used for BGE-M3 embeddings and ExaONE generation
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+
+# Embedding backend: "ollama", "torch", "onnx" or "onnx-int8"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "ollama")
+
+# Directory produced by export_onnx.py (model.onnx, model_int8.onnx, tokenizer.json)
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "./models/bge-m3-onnx")
+
+# Intra-op threads for in-process inference (0 lets the runtime decide)
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+
+# BGE-M3 dense vector size and query truncation length
+EMBEDDING_DIM = 1024
+EMBEDDING_MAX_LENGTH = int(os.getenv("EMBEDDING_MAX_LENGTH", "512"))
+
+# Query cache in front of vector search: exact-text tier size, approximate
+# (near-duplicate vector) tier size (0 disables it) and its cosine threshold
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+QUERY_CACHE_APPROX_SIZE = int(os.getenv("QUERY_CACHE_APPROX_SIZE", "256"))
+QUERY_CACHE_THRESHOLD = float(os.getenv("QUERY_CACHE_THRESHOLD", "0.97"))
+
+# Vector index: "chroma" (persistent HNSW collection) or "numpy" (exact
+# in-memory search, fastest for catalogs up to a few tens of thousands)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")
+CHROMA_DIR = os.getenv("CHROMA_DIR", "./chroma_db")
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", "./vector_index")
+
+# Year assumed for catalog schedule dates written without one ("14-Oct")
+CATALOG_YEAR = int(os.getenv("CATALOG_YEAR", "2025"))
+
+# CSV rows parsed per ingest chunk: each chunk is written to SQLite and handed
+# to the vector indexer before the next one is read (see ingest.py)
+INGEST_CHUNK_ROWS = int(os.getenv("INGEST_CHUNK_ROWS", "1000"))
+
+# Cross-encoder re-ranking: "none" (disabled), "onnx" or "onnx-int8", with the
+# directory written by `export_onnx.py --reranker`, the per-request time budget
+# and the (query, showcase) score cache size
+RERANKER_BACKEND = os.getenv("RERANKER_BACKEND", "none")
+RERANKER_MODEL_DIR = os.getenv("RERANKER_MODEL_DIR", "./models/bge-reranker-onnx")
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "150"))
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "4096"))
+
+# Two-stage search for the numpy index: candidates are generated on a
+# VECTOR_REDUCED_DIM-d int8 projection ("pca" or "random"; 0 disables it) and
+# the best VECTOR_SHORTLIST_FACTOR * k of them are rescored with the
+# full-precision vectors, which then stay memory-mapped on disk
+VECTOR_REDUCED_DIM = int(os.getenv("VECTOR_REDUCED_DIM", "0"))
+VECTOR_REDUCTION = os.getenv("VECTOR_REDUCTION", "pca")
+VECTOR_SHORTLIST_FACTOR = int(os.getenv("VECTOR_SHORTLIST_FACTOR", "8"))
+
+# Per-field vectors (summary, introduction, artist, review) for mode="fields"
+# searches, with the default weight of each field
+FIELD_VECTORS = os.getenv("FIELD_VECTORS", "0") == "1"
+FIELD_WEIGHTS = os.getenv("FIELD_WEIGHTS", "summary:1.0,introduction:1.0,artist:0.5,review:0.5")
+
+# Chunked retrieval for mode="chunks": documents are split into CHUNK_WORDS-word
+# windows overlapping by CHUNK_OVERLAP, embedded CHUNK_BATCH_SIZE at a time and
+# pooled back to showcases ("max" or "sum"). CHUNK_INDEX=1 builds the chunks when
+# the catalog is loaded instead of on the first chunk query
+CHUNK_INDEX = os.getenv("CHUNK_INDEX", "0") == "1"
+CHUNK_WORDS = int(os.getenv("CHUNK_WORDS", "200"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "40"))
+CHUNK_BATCH_SIZE = int(os.getenv("CHUNK_BATCH_SIZE", "16"))
+CHUNK_POOLING = os.getenv("CHUNK_POOLING", "max")
+
+# Festival editions as "<year>=<csv>" pairs; each gets its own vector index,
+# embedding snapshot and neighbour table under EDITIONS_DIR. The CATALOG_YEAR
+# edition is the current catalog (SQLite, default collection).
+EDITIONS = os.getenv("EDITIONS", f"{CATALOG_YEAR}=PAMS.csv")
+EDITIONS_DIR = os.getenv("EDITIONS_DIR", "./editions")
+NEIGHBOURS_K = int(os.getenv("NEIGHBOURS_K", "10"))
+
+# Build the vector indexes in a background thread after startup, so the API
+# serves catalog endpoints (and /ready) immediately; 0 blocks startup instead
+STARTUP_BACKGROUND_INDEX = os.getenv("STARTUP_BACKGROUND_INDEX", "1") == "1"
+
+# Reloads build a new index version and flip an alias to it; the replaced
+# version is deleted INDEX_VERSION_GRACE_S seconds later, once searches that
+# started on it have finished
+INDEX_VERSION_GRACE_S = float(os.getenv("INDEX_VERSION_GRACE_S", "60"))
+
+# Multi-worker serving (uvicorn --workers N): the worker holding the leader lock
+# in WORKER_STATE_DIR builds the catalog and indexes, the others open them
+# read-only and poll the leader's generation file every WORKER_POLL_S seconds
+WORKER_STATE_DIR = os.getenv("WORKER_STATE_DIR", EDITIONS_DIR)
+WORKER_POLL_S = float(os.getenv("WORKER_POLL_S", "2"))
+
+# Prebuilt index artifact (build_index.py) served instead of indexing PAMS.csv at
+# startup: catalog, FTS index, vectors and neighbours of the current edition
+INDEX_ARTIFACT = os.getenv("INDEX_ARTIFACT", "")
+
+# /api/showcases pagination: default and largest page size (limit=), and the
+# rows read per batch by the NDJSON export (format=ndjson)
+SHOWCASE_PAGE_LIMIT = int(os.getenv("SHOWCASE_PAGE_LIMIT", "100"))
+SHOWCASE_PAGE_MAX_LIMIT = int(os.getenv("SHOWCASE_PAGE_MAX_LIMIT", "1000"))
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "500"))
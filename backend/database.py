@@ -1,17 +1,255 @@
 import sqlite3
-import pandas as pd
-from typing import List, Optional
+import math
+from typing import List, Optional, Dict, Any, Iterator, Sequence, Tuple, Type
 import json
+from pydantic import BaseModel
 from models import Showcase
+from catalog import CatalogSnapshot, ChangeSet
+from ingest import (normalize_record, to_sql_row, split_list, ingest_csv, natural_key,
+                    content_hash, GENRE_PREFIX)
+
+# Columns of the showcases table indexed for keyword search, with their
+# bm25() weights: title and artist matches rank highest
+FTS_COLUMNS = [
+    ('title', 10.0),
+    ('artist', 6.0),
+    ('genre', 3.0),
+    ('introduction', 1.0),
+    ('director', 3.0),
+    ('cast', 2.0),
+    ('review', 0.5),
+]
+
+# Keep showcases_fts in step with inserts, deletes and updates of showcases
+FTS_TRIGGERS = ['showcases_fts_insert', 'showcases_fts_delete', 'showcases_fts_update']
+
+# PAMS.csv columns stored under another name; the rest go through column_name()
+CSV_COLUMNS = {
+    'Artist description': 'artist_description',
+    'Introduction to the work': 'introduction',
+    'Duration(Full-length)': 'duration',
+    'PAMS Venue': 'venue',
+}
+
+# Parsed integer columns; the other typed fields are text, genre flags 0/1
+INTEGER_COLUMNS = {'tour_size', 'performers_count', 'staff_count', 'duration_min', 'venue_capacity'}
+
+# Never written by an import
+KEEP_COLUMNS = {'id', 'embedding'}
+
+# Comma-joined list columns (see ingest.to_sql_row), decoded back into lists
+LIST_COLUMNS = {'genre_tags', 'schedule_dates'}
+
+def column_name(csv_column: str) -> str:
+    """SQL column for a PAMS.csv column ("Schedule_Date" -> "schedule_date")"""
+    if csv_column in CSV_COLUMNS:
+        return CSV_COLUMNS[csv_column]
+    return csv_column.lower().replace(' ', '_').replace('(', '').replace(')', '')
+
+def column_type(column: str) -> str:
+    if column in INTEGER_COLUMNS or (column.startswith(GENRE_PREFIX) and column != 'genre_tags'):
+        return 'INTEGER'
+    return 'TEXT'
+
+LIKE_LITERAL = "LIKE ? ESCAPE '\\'"
+
+def like_pattern(term: str) -> str:
+    """Parameter for LIKE_LITERAL: `term` as a literal substring, wildcards escaped"""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+class CatalogWriter:
+    """Ingest sink: applies a CSV to the showcases table as a delta, in one transaction
+    
+    Rows are matched to the catalog by natural key (ingest.natural_key, title
+    and artist), so a showcase keeps its id across imports. A row whose content
+    hash is unchanged is not written, an edited row is updated in place, a new
+    one inserted, and rows missing from the CSV are deleted at finish(). The
+    FTS index follows through triggers. Readers see the previous catalog until
+    the transaction commits; the ChangeSet ends up in db.last_changes.
+    """
+    
+    def __init__(self, db: 'Database', csv_path: Optional[str] = None):
+        self.db = db
+        self.conn = sqlite3.connect(db.db_path, isolation_level=None)
+        self.conn.execute('BEGIN IMMEDIATE')
+        self.columns = [row[1] for row in self.conn.execute('PRAGMA table_info(showcases)')]
+        # natural key -> (id, content hash); what is left at finish() was deleted
+        self.existing = {
+            key: (showcase_id, digest)
+            for showcase_id, key, digest in self.conn.execute(
+                'SELECT id, source_key, content_hash FROM showcases'
+            )
+        }
+        self.seen: Dict[str, int] = {}
+        self.changes = ChangeSet(csv_path)
+        # A first import is all inserts: index it once at the end rather than row by row
+        self.bulk = not self.existing
+        if self.bulk:
+            db.drop_fts_triggers(self.conn)
+    
+    def _key(self, row) -> str:
+        # Repeated title + artist pairs are told apart by their order in the CSV
+        key = natural_key(row)
+        self.seen[key] = self.seen.get(key, 0) + 1
+        return key if self.seen[key] == 1 else f'{key}\x1f{self.seen[key]}'
+    
+    def _record(self, row, fields: Dict[str, Any]) -> Dict[str, Any]:
+        record = {column_name(c): value for c, value in row.items()}
+        # Typed fields (minutes, genre flags, venue id/capacity, dates) parsed once here
+        record.update(to_sql_row(fields))
+        record['title'] = record.get('title') or ''
+        return record
+    
+    def add(self, first_row: int, rows: List[Dict[str, Any]]):
+        changes = self.changes
+        pending = []
+        for row in rows:
+            key, digest = self._key(row), content_hash(row)
+            current = self.existing.pop(key, None)
+            changes.hashes.append(digest)
+            if current and current[1] == digest:
+                changes.ids.append(current[0])
+                changes.unchanged += 1
+                continue
+            record = self._record(row, normalize_record(row))
+            record.update(source_key=key, content_hash=digest)
+            pending.append((len(changes.ids), current[0] if current else None, record))
+            changes.ids.append(current[0] if current else None)
+        if not pending:
+            return
+        
+        # Genre flags (or CSV columns) first seen in this chunk
+        for column in dict.fromkeys(c for _, _, record in pending for c in record):
+            if column not in self.columns:
+                self.conn.execute(f'ALTER TABLE showcases ADD COLUMN "{column}" {column_type(column)}')
+                self.columns.append(column)
+        
+        columns = [c for c in self.columns if c not in KEEP_COLUMNS]
+        names = ', '.join(f'"{c}"' for c in columns)
+        placeholders = ', '.join('?' * len(columns))
+        assignments = ', '.join(f'"{c}" = ?' for c in columns)
+        updates = []
+        for position, showcase_id, record in pending:
+            values = [record.get(c) for c in columns]
+            if showcase_id is None:
+                cursor = self.conn.execute(f'INSERT INTO showcases ({names}) VALUES ({placeholders})', values)
+                changes.inserted.append(cursor.lastrowid)
+                changes.ids[position] = cursor.lastrowid
+            else:
+                updates.append(values + [showcase_id])
+                changes.updated.append(showcase_id)
+        self.conn.executemany(f'UPDATE showcases SET {assignments} WHERE id = ?', updates)
+    
+    def finish(self):
+        if not self.changes.ids:
+            self.abort()
+            raise ValueError("The CSV has no rows; keeping the current catalog")
+        self.changes.deleted = sorted(showcase_id for showcase_id, _ in self.existing.values())
+        self.conn.executemany('DELETE FROM showcases WHERE id = ?',
+                              [(showcase_id,) for showcase_id in self.changes.deleted])
+        if self.bulk:
+            self.db.rebuild_fts_index(self.conn)
+        else:
+            self.db.ensure_fts_index(self.conn)
+        self.conn.execute('COMMIT')
+        self.conn.close()
+        if self.changes.changed:
+            self.db.generation += 1
+        self.db.last_changes = self.changes
+    
+    def abort(self):
+        self.conn.rollback()
+        self.conn.close()
+
+class RowDecoder:
+    """Rows of one showcases SELECT -> models (or dicts), columns resolved by name once
+    
+    Built for one schema version and projection: `select` names exactly the
+    columns the model (or `fields`) needs that the table has, so nothing else
+    is read, and fields the table lacks keep their model defaults. The
+    embedding column is never read (embeddings live in the vector stores).
+    
+    Models are constructed like model_construct(), without validation: the
+    columns hold what CatalogWriter wrote, already typed. Per row that is one
+    dict and one object, several times cheaper than validating.
+    """
+    
+    def __init__(self, table_columns: Sequence[str], model: Optional[Type[BaseModel]] = Showcase,
+                 fields: Optional[Sequence[str]] = None):
+        wanted = list(model.model_fields) if model is not None else list(fields or table_columns)
+        if fields is not None:
+            wanted = [name for name in wanted if name in fields]
+        present = set(table_columns) - {'embedding'}
+        self.columns = [name for name in wanted if name in present]
+        self.select = ', '.join(f'"{c}"' for c in self.columns)
+        self.lists = [name for name in self.columns if name in LIST_COLUMNS]
+        self.model = model
+        if model is not None:
+            self.defaults = {
+                name: None if info.is_required() else info.get_default(call_default_factory=True)
+                for name, info in model.model_fields.items() if name not in self.columns
+            }
+            # Mutable defaults ([] for list fields) are made per row
+            self.fresh = {name: type(value) for name, value in self.defaults.items()
+                          if isinstance(value, (list, dict, set))}
+            self.fields_set = frozenset(self.columns)
+    
+    def records(self, rows: Sequence[tuple]) -> List[Dict[str, Any]]:
+        columns, lists = self.columns, self.lists
+        records = [dict(zip(columns, row)) for row in rows]
+        for name in lists:
+            for record in records:
+                record[name] = split_list(record[name])
+        return records
+    
+    def decode(self, rows: Sequence[tuple]) -> List[Any]:
+        """Models, or plain dicts when the decoder has no model"""
+        records = self.records(rows)
+        if self.model is None:
+            return records
+        model, defaults, fresh, fields_set = self.model, self.defaults, self.fresh, self.fields_set
+        new, set_attribute = object.__new__, object.__setattr__
+        showcases = []
+        for record in records:
+            if defaults:
+                record.update(defaults)
+                for name, factory in fresh.items():
+                    record[name] = factory()
+            showcase = new(model)
+            set_attribute(showcase, '__dict__', record)
+            set_attribute(showcase, '__pydantic_fields_set__', set(fields_set))
+            set_attribute(showcase, '__pydantic_extra__', None)
+            set_attribute(showcase, '__pydantic_private__', None)
+            showcases.append(showcase)
+        return showcases
 
 class Database:
     def __init__(self, db_path: str = "showcases.db"):
         self.db_path = db_path
+        self.fts_tokenizer = None
+        # Bumped on every catalog load that changed something; derived indexes
+        # and caches compare against it
+        self.generation = 0
+        # ChangeSet of the last CSV import
+        self.last_changes: Optional[ChangeSet] = None
+        self._snapshot = None
+        # (schema version, model, fields) -> RowDecoder
+        self._decoders: Dict[Tuple, RowDecoder] = {}
         self.init_db()
     
     def init_db(self):
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        # Worker processes starting together create the schema one at a time
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        # Tables written by earlier versions (pandas to_sql, no natural keys) are
+        # rebuilt from the CSV by the next import
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(showcases)")}
+        if columns and 'source_key' not in columns:
+            cursor.execute("DROP TABLE IF EXISTS showcases_fts")
+            cursor.execute("DROP TABLE showcases")
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS showcases (
@@ -33,7 +271,14 @@ class Database:
                 contact_emails TEXT,
                 venue TEXT,
                 review TEXT,
-                embedding TEXT
+                embedding TEXT,
+                duration_min INTEGER,
+                genre_tags TEXT,
+                venue_id TEXT,
+                venue_capacity INTEGER,
+                schedule_dates TEXT,
+                source_key TEXT UNIQUE,
+                content_hash TEXT
             )
         ''')
         
@@ -50,98 +295,295 @@ class Database:
             )
         ''')
         
+        self.ensure_fts_index(conn)
         conn.commit()
         conn.close()
     
-    def load_from_csv(self, csv_path: str):
-        """Load PAMS.csv data into database"""
-        df = pd.read_csv(csv_path)
-        
+    def catalog_writer(self, csv_path: Optional[str] = None) -> CatalogWriter:
+        return CatalogWriter(self, csv_path)
+    
+    def load_from_csv(self, csv_path: str) -> ChangeSet:
+        """Apply PAMS.csv to the database as a delta (streamed in chunks, see CatalogWriter)"""
+        ingest_csv(csv_path, self.catalog_writer(csv_path))
+        return self.last_changes
+    
+    def load_from_sqlite(self, source_path: str):
+        """Replace the catalog with a prebuilt one (showcases table plus FTS index)"""
+        source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
         conn = sqlite3.connect(self.db_path)
+        source.backup(conn)
+        source.close()
+        conn.close()
+        # Detected again from the copied FTS table on the next keyword search
+        self.fts_tokenizer = None
+        self.last_changes = None
+        self.generation += 1
+    
+    def get_catalog_snapshot(self) -> CatalogSnapshot:
+        """Cached in-memory snapshot of all showcases for the current generation"""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.generation != self.generation:
+            snapshot = CatalogSnapshot(self.get_all_showcases(), self.generation)
+            self._snapshot = snapshot
+        return snapshot
+    
+    def ensure_fts_index(self, conn: sqlite3.Connection):
+        """Create the FTS5 keyword index if the database has none yet"""
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'showcases_fts'").fetchone():
+            self.rebuild_fts_index(conn)
+    
+    def drop_fts_triggers(self, conn: sqlite3.Connection):
+        for name in FTS_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    
+    def rebuild_fts_index(self, conn: sqlite3.Connection):
+        """(Re)create the FTS5 keyword index over the showcases table
         
-        # Clean column names
-        df.columns = [col.lower().replace(' ', '_').replace('(', '').replace(')', '') for col in df.columns]
+        The index is external-content (it stores only the inverted index and
+        reads text back from showcases); triggers on showcases keep it in step
+        with every insert, update and delete, so a delta import only touches
+        the rows it changed.
+        The trigram tokenizer handles Korean and English substrings alike;
+        SQLite builds older than 3.34 fall back to unicode61.
+        """
+        columns = [f'"{name}"' for name, _ in FTS_COLUMNS]
         
-        # Parse tour_size, performers_count, staff_count from data
-        for col in ['tour_size', 'performers_count', 'staff_count']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        conn.execute("DROP TABLE IF EXISTS showcases_fts")
+        for tokenizer in ("trigram", "unicode61 remove_diacritics 2"):
+            try:
+                conn.execute(
+                    f"CREATE VIRTUAL TABLE showcases_fts USING fts5("
+                    f"{', '.join(columns)}, content='showcases', content_rowid='id', "
+                    f"tokenize='{tokenizer}')"
+                )
+                self.fts_tokenizer = tokenizer.split()[0]
+                break
+            except sqlite3.OperationalError:
+                continue
         
-        # Save to database
-        df.to_sql('showcases', conn, if_exists='replace', index=False)
-        conn.close()
+        names = ', '.join(columns)
+        new_values = ', '.join(f'new.{c}' for c in columns)
+        old_values = ', '.join(f'old.{c}' for c in columns)
+        delete = (f"INSERT INTO showcases_fts(showcases_fts, rowid, {names}) "
+                  f"VALUES ('delete', old.id, {old_values});")
+        insert = f"INSERT INTO showcases_fts(rowid, {names}) VALUES (new.id, {new_values});"
+        bodies = [
+            f"AFTER INSERT ON showcases BEGIN {insert} END",
+            f"AFTER DELETE ON showcases BEGIN {delete} END",
+            f"AFTER UPDATE OF {names} ON showcases BEGIN {delete} {insert} END",
+        ]
+        self.drop_fts_triggers(conn)
+        for name, body in zip(FTS_TRIGGERS, bodies):
+            conn.execute(f"CREATE TRIGGER {name} {body}")
+        
+        conn.execute("INSERT INTO showcases_fts(showcases_fts) VALUES ('rebuild')")
     
-    def get_all_showcases(self) -> List[Showcase]:
+    def search_keyword(self, query: str, limit: int = 10, snippets: bool = True) -> List[Dict[str, Any]]:
+        """Ranked keyword search over the FTS5 index, no embedding model involved"""
+        terms = [t.replace('"', '') for t in query.split() if t.strip('"')]
+        if not terms:
+            return []
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        cursor.execute("SELECT rowid, * FROM showcases")
+        if self.fts_tokenizer is None:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'showcases_fts'")
+            row = cursor.fetchone()
+            if not row:
+                conn.close()
+                return []
+            self.fts_tokenizer = "trigram" if "trigram" in row[0] else "unicode61"
+        
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(showcases_fts)")]
+        weights = dict(FTS_COLUMNS)
+        
+        # Trigrams need at least 3 characters, so shorter terms (most Korean
+        # words: "무용", "연극") cannot use the index. They are matched with
+        # LIKE, which scans the rows the longer terms leave (all rows if there
+        # are none), and ranked with the formula bm25() applies to indexed terms
+        if self.fts_tokenizer == "trigram":
+            long_terms = [t for t in terms if len(t) >= 3]
+            short_terms = [t.lower() for t in terms if len(t) < 3]
+        else:
+            long_terms, short_terms = terms, []
+        
+        where, params = [], []
+        if long_terms:
+            suffix = "" if self.fts_tokenizer == "trigram" else "*"
+            where.append("showcases_fts MATCH ?")
+            params.append(" ".join(f'"{t}"{suffix}' for t in long_terms))
+            bm25_weights = ", ".join(str(weights[col]) for col in columns)
+            long_rank = f"bm25(showcases_fts, {bm25_weights})"
+        else:
+            long_rank = "0.0"
+        for term in short_terms:
+            where.append("(" + " OR ".join(f'"{col}" {LIKE_LITERAL}' for col in columns) + ")")
+            params += [like_pattern(term)] * len(columns)
+        snippet_sql = ("snippet(showcases_fts, -1, '<b>', '</b>', '…', 16)"
+                       if snippets and long_terms else "NULL")
+        short_rank, short_select, short_params = self._short_term_rank(cursor, columns, weights, short_terms)
+        
+        cursor.execute(
+            f"SELECT id, title, artist, genre, long_rank - {short_rank} AS rank, snippet FROM ("
+            f"SELECT rowid AS id, title, artist, genre, {long_rank} AS long_rank, "
+            f"{snippet_sql} AS snippet{short_select} FROM showcases_fts WHERE {' AND '.join(where)}"
+            f") ORDER BY rank, id LIMIT ?",
+            short_params + params + [limit]
+        )
         rows = cursor.fetchall()
         
-        showcases = []
-        for row in rows:
-            # Handle different column names from PAMS.csv
-            showcase_dict = {
-                'id': row[0],  # rowid
-                'title': row[1] if len(row) > 1 else None,
-                'genre': row[2] if len(row) > 2 else None,
-                'artist': row[3] if len(row) > 3 else None,
-                'artist_description': row[4] if len(row) > 4 else None,
-                'introduction': row[5] if len(row) > 5 else None,  # introduction_to_the_work
-                'schedule_date': row[6] if len(row) > 6 else None,
-                'schedule_time': row[7] if len(row) > 7 else None,
-                'director': row[8] if len(row) > 8 else None,
-                'cast': row[9] if len(row) > 9 else None,
-                'duration': row[10] if len(row) > 10 else None,  # durationfull-length
-                'tour_size': row[11] if len(row) > 11 else None,
-                'performers_count': row[12] if len(row) > 12 else None,
-                'staff_count': row[13] if len(row) > 13 else None,
-                'contact_names': row[14] if len(row) > 14 else None,
-                'contact_emails': row[15] if len(row) > 15 else None,
-                'venue': row[16] if len(row) > 16 else None,  # pams_venue
-                'review': row[17] if len(row) > 17 else None,
-                'embedding': None  # Will be handled separately
+        conn.close()
+        return [
+            {
+                'id': row[0],
+                'title': row[1],
+                'artist': row[2],
+                'genre': row[3],
+                # bm25() is lower-is-better; flip it so higher means more relevant
+                'score': round(-row[4], 4) if row[4] else 0.0,
+                'snippet': row[5] if snippets else None
             }
-            showcases.append(Showcase(**showcase_dict))
+            for row in rows
+        ]
+    
+    def _short_term_rank(self, cursor: sqlite3.Cursor, columns: List[str], weights: Dict[str, float],
+                         terms: List[str], k1: float = 1.2, b: float = 0.75) -> Tuple[str, str, List[str]]:
+        """BM25 of `terms` matched by substring, as SQL over one search_keyword row
         
-        conn.close()
-        return showcases
+        Same formula and column weights as FTS5's bm25() (higher is better here):
+        per term, idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg length)),
+        where tf is the weighted count of occurrences per column. Lengths are in
+        characters rather than tokens, which only the length ratio sees. The idf
+        needs every term's document frequency, one more scan of the table.
+        Returns the rank expression, the columns it reads (selected in the
+        inner query) and their parameters.
+        """
+        if not terms:
+            return "0.0", "", []
+        lengths = " + ".join(f"length(coalesce(\"{col}\", ''))" for col in columns)
+        counts = ", ".join(
+            "SUM(" + " OR ".join(f'"{col}" {LIKE_LITERAL}' for col in columns) + ")" for _ in terms
+        )
+        row = cursor.execute(
+            f"SELECT COUNT(*), AVG({lengths}), {counts} FROM showcases_fts",
+            [like_pattern(t) for t in terms for _ in columns]
+        ).fetchone()
+        total, average_length = row[0], row[1] or 1.0
+        
+        selects, params, ranks = [f", {lengths} AS doc_length"], [], []
+        for i, (term, documents) in enumerate(zip(terms, row[2:])):
+            # FTS5's idf, floored the same way for terms in most rows
+            idf = max(math.log((total - documents + 0.5) / (documents + 0.5)), 1e-6)
+            occurrences = " + ".join(
+                f"{weights[col]} * (length(lower(coalesce(\"{col}\", ''))) - "
+                f"length(replace(lower(coalesce(\"{col}\", '')), ?, ''))) / {len(term)}"
+                for col in columns
+            )
+            selects.append(f", {occurrences} AS tf{i}")
+            params += [term] * len(columns)
+            ranks.append(f"{idf!r} * tf{i} * {k1 + 1} / "
+                         f"(tf{i} + {k1} * (1 - {b} + {b} * doc_length / {average_length!r}))")
+        return "(" + " + ".join(ranks) + ")", "".join(selects), params
     
-    def get_showcase_by_id(self, showcase_id: int) -> Optional[Showcase]:
+    def row_decoder(self, conn: sqlite3.Connection, model: Optional[Type[BaseModel]] = Showcase,
+                    fields: Optional[Sequence[str]] = None) -> RowDecoder:
+        """Decoder for the showcases table as it is now (recompiled after a schema change)"""
+        schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        key = (schema_version, model, tuple(fields) if fields is not None else None)
+        decoder = self._decoders.get(key)
+        if decoder is None:
+            if any(k[0] != schema_version for k in self._decoders):
+                self._decoders.clear()
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(showcases)")]
+            decoder = self._decoders[key] = RowDecoder(columns, model, fields)
+        return decoder
+    
+    def get_all_showcases(self, model: Type[BaseModel] = Showcase) -> List[Any]:
+        """Every showcase as `model`; only the columns the model has are read"""
+        return self.get_showcase_rows(model=model)
+    
+    def get_showcase_rows(self, fields: Optional[Sequence[str]] = None,
+                          model: Optional[Type[BaseModel]] = None) -> List[Any]:
+        """Showcases projected to `fields` (dicts), or decoded as `model`, in id order"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        decoder = self.row_decoder(conn, model, fields)
+        if not decoder.columns:
+            conn.close()
+            return []
+        rows = conn.execute(f"SELECT {decoder.select} FROM showcases ORDER BY id").fetchall()
+        conn.close()
+        return decoder.decode(rows)
+    
+    def get_showcase_page(self, after_id: Optional[int] = None, limit: int = 100,
+                          fields: Optional[Sequence[str]] = None,
+                          model: Optional[Type[BaseModel]] = Showcase,
+                          conn: Optional[sqlite3.Connection] = None) -> List[Any]:
+        """Up to `limit` showcases with id > after_id, in id order (keyset pagination)
         
-        cursor.execute("SELECT rowid, * FROM showcases WHERE rowid = ?", (showcase_id,))
-        row = cursor.fetchone()
-        
-        if row:
-            # Handle different column names from PAMS.csv
-            showcase_dict = {
-                'id': row[0],  # rowid
-                'title': row[1] if len(row) > 1 else None,
-                'genre': row[2] if len(row) > 2 else None,
-                'artist': row[3] if len(row) > 3 else None,
-                'artist_description': row[4] if len(row) > 4 else None,
-                'introduction': row[5] if len(row) > 5 else None,  # introduction_to_the_work
-                'schedule_date': row[6] if len(row) > 6 else None,
-                'schedule_time': row[7] if len(row) > 7 else None,
-                'director': row[8] if len(row) > 8 else None,
-                'cast': row[9] if len(row) > 9 else None,
-                'duration': row[10] if len(row) > 10 else None,  # durationfull-length
-                'tour_size': row[11] if len(row) > 11 else None,
-                'performers_count': row[12] if len(row) > 12 else None,
-                'staff_count': row[13] if len(row) > 13 else None,
-                'contact_names': row[14] if len(row) > 14 else None,
-                'contact_emails': row[15] if len(row) > 15 else None,
-                'venue': row[16] if len(row) > 16 else None,  # pams_venue
-                'review': row[17] if len(row) > 17 else None,
-                'embedding': None  # Will be handled separately
-            }
+        Ids are stable across imports (see CatalogWriter), so paging on them
+        neither repeats nor skips rows when the catalog is reloaded between pages.
+        """
+        if fields is not None and 'id' not in fields:
+            fields = ['id', *fields]
+        own = conn is None
+        if own:
+            conn = sqlite3.connect(self.db_path)
+        decoder = self.row_decoder(conn, model, fields)
+        where, params = ("WHERE id > ? ", [after_id]) if after_id is not None else ("", [])
+        rows = conn.execute(
+            f"SELECT {decoder.select} FROM showcases {where}ORDER BY id LIMIT ?", [*params, limit]
+        ).fetchall()
+        if own:
             conn.close()
-            return Showcase(**showcase_dict)
+        return decoder.decode(rows)
+    
+    def iter_showcase_pages(self, after_id: Optional[int] = None, batch_rows: int = 500,
+                            fields: Optional[Sequence[str]] = None,
+                            model: Optional[Type[BaseModel]] = Showcase) -> Iterator[List[Any]]:
+        """Every showcase after `after_id`, `batch_rows` at a time, read as they are consumed
         
+        Each batch is its own short keyset query, so no read lock is held
+        while a slow client drains the stream and memory stays one batch.
+        """
+        # Streaming responses advance the generator from worker threads
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            while True:
+                items = self.get_showcase_page(after_id, batch_rows, fields, model, conn)
+                if not items:
+                    return
+                yield items
+                if len(items) < batch_rows:
+                    return
+                last = items[-1]
+                after_id = last['id'] if isinstance(last, dict) else last.id
+        finally:
+            conn.close()
+    
+    def get_showcases_by_ids(self, showcase_ids: Sequence[int], fields: Optional[Sequence[str]] = None,
+                             model: Optional[Type[BaseModel]] = Showcase) -> Dict[int, Any]:
+        """id -> showcase for the ids that exist, in one query (projected like get_showcase_rows)"""
+        if not showcase_ids:
+            return {}
+        if fields is not None and 'id' not in fields:
+            fields = ['id', *fields]
+        conn = sqlite3.connect(self.db_path)
+        decoder = self.row_decoder(conn, model, fields)
+        placeholders = ', '.join('?' * len(showcase_ids))
+        rows = conn.execute(
+            f"SELECT {decoder.select} FROM showcases WHERE id IN ({placeholders})", list(showcase_ids)
+        ).fetchall()
+        conn.close()
+        items = decoder.decode(rows)
+        return {item['id'] if isinstance(item, dict) else item.id: item for item in items}
+    
+    def get_showcase_by_id(self, showcase_id: int) -> Optional[Showcase]:
+        conn = sqlite3.connect(self.db_path)
+        decoder = self.row_decoder(conn)
+        row = conn.execute(f"SELECT {decoder.select} FROM showcases WHERE id = ?", (showcase_id,)).fetchone()
         conn.close()
-        return None
+        return decoder.decode([row])[0] if row else None
     
     def update_embedding(self, showcase_id: int, embedding: List[float]):
         conn = sqlite3.connect(self.db_path)
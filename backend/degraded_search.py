@@ -0,0 +1,174 @@
+"""
+Degraded search while the vector index is unavailable
+
+The vector index is built in the background after startup (see readiness.py)
+and can fail outright (Ollama down, corrupt collection). Until it is published,
+the vector endpoints are served by DegradedSearch instead of answering 503:
+
+- snapshot: cosine search over the current edition's last embedding snapshot,
+  used when the snapshot was built from the PAMS.csv now in SQLite and the
+  embedding backend answers. Same ranking as the real index, minus hybrid /
+  fields / chunks modes, MMR and re-ranking.
+- lexical:  FTS5 keyword search over the SQLite catalog, one query per term.
+  "similarity" is the fraction of query terms a showcase matches (ties broken
+  by bm25), not a cosine similarity.
+
+DegradedSearch exposes the subset of the VectorStore interface the endpoints
+use, and responses served by it carry the DEGRADED_HEADER header naming the
+mode.
+"""
+import re
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from database import Database
+from embedding_backends import EmbeddingBackend, normalize_rows
+from embedding_snapshot import EmbeddingSnapshot
+from ingest import genre_flags
+from metadata_filter import ProfileFilter, catalog_genres, where_mask
+from vector_store import VectorStore, empty_results
+
+logger = logging.getLogger(__name__)
+
+DEGRADED_HEADER = "X-Search-Degraded"
+
+SNAPSHOT = "snapshot"
+LEXICAL = "lexical"
+
+# Whole showcase documents are used as "similar to" queries; their leading
+# fields (title, artist, genre) carry the useful terms
+MAX_LEXICAL_TERMS = 32
+
+
+def showcase_metadata(showcase) -> Dict[str, Any]:
+    """Vector-store style metadata (CSV column names plus typed fields) for a catalog row"""
+    metadata = {
+        "Title": showcase.title,
+        "Artist": showcase.artist,
+        "Genre": showcase.genre,
+        "PAMS Venue": showcase.venue,
+        "duration_min": showcase.duration_min,
+        "venue_id": showcase.venue_id,
+        "tour_size": showcase.tour_size
+    }
+    metadata.update(genre_flags(showcase.genre_tags))
+    return {key: value for key, value in metadata.items() if value is not None}
+
+
+class DegradedSearch:
+    """Stand-in for the vector store: snapshot vectors if usable, else FTS5"""
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.snapshot_ids: List[str] = []
+        self.snapshot_vectors: Optional[np.ndarray] = None
+        self.embedding_backend: Optional[EmbeddingBackend] = None
+        self._generation = None
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def mode(self) -> str:
+        return SNAPSHOT if self.snapshot_vectors is not None else LEXICAL
+
+    def use_snapshot(self, snapshot: EmbeddingSnapshot, embedding_backend: EmbeddingBackend):
+        """Serve cosine search from `snapshot` (which must match the catalog in SQLite)"""
+        # Copied into memory: a reload may rewrite the snapshot directory
+        self.snapshot_vectors = normalize_rows(np.asarray(snapshot.vectors, dtype=np.float32))
+        self.snapshot_ids = list(snapshot.ids)
+        self.embedding_backend = embedding_backend
+        logger.info(f"Degraded search: {len(self.snapshot_ids)} snapshot vectors")
+
+    def _catalog(self) -> Dict[str, Dict[str, Any]]:
+        """pams_<catalog id> -> metadata for the current catalog generation"""
+        snapshot = self.db.get_catalog_snapshot()
+        if snapshot.generation != self._generation:
+            self._metadata = {f"pams_{s.id}": showcase_metadata(s) for s in snapshot.showcases}
+            self._generation = snapshot.generation
+        return self._metadata
+
+    # ------------------------------------------------------------------
+    # VectorStore subset used by the endpoints
+
+    # Same query text as the vector index builds for "similar showcase" lookups
+    _create_document_text = VectorStore._create_document_text
+
+    def count(self) -> int:
+        return len(self._catalog())
+
+    def profile_filter(self, profile) -> ProfileFilter:
+        catalog = self._catalog()
+        venue_names = {
+            metadata["venue_id"]: metadata["PAMS Venue"]
+            for metadata in catalog.values() if metadata.get("venue_id")
+        }
+        return ProfileFilter.from_profile(profile, venue_names, catalog_genres(catalog.values()))
+
+    def _allowed(self, where: Optional[dict]) -> Dict[str, Dict[str, Any]]:
+        catalog = self._catalog()
+        if not where:
+            return catalog
+        ids = list(catalog)
+        mask = where_mask(where, lambda key: [catalog[i].get(key) for i in ids], len(ids))
+        return {doc_id: catalog[doc_id] for doc_id, keep in zip(ids, mask) if keep}
+
+    def count_matching(self, where: Optional[dict] = None) -> int:
+        return len(self._allowed(where))
+
+    def search(self, query_text: str, n_results: int = 10, where: Optional[dict] = None,
+               **ignored) -> Dict[str, Any]:
+        """Top-n showcases; retrieval mode, MMR and re-ranking options are ignored"""
+        allowed = self._allowed(where)
+        if n_results <= 0 or not allowed:
+            return empty_results()
+        if self.snapshot_vectors is not None:
+            query_embedding = self.embedding_backend.encode_one(query_text)
+            # A zero vector means the embedding backend is down too
+            if np.any(query_embedding):
+                return self._search_snapshot(query_embedding, n_results, allowed)
+        return self._search_lexical(query_text, n_results, allowed)
+
+    def search_similar(self, query_text: str, n_results: int = 10,
+                       where: Optional[dict] = None) -> Dict[str, Any]:
+        return self.search(query_text, n_results, where=where)
+
+    # ------------------------------------------------------------------
+
+    def _search_snapshot(self, query_embedding: np.ndarray, n_results: int,
+                         allowed: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        query = np.asarray(query_embedding, dtype=np.float32)
+        similarities = self.snapshot_vectors @ (query / (np.linalg.norm(query) or 1.0))
+        rows = [row for row, doc_id in enumerate(self.snapshot_ids) if doc_id in allowed]
+        rows = sorted(rows, key=lambda row: -similarities[row])[:n_results]
+        ids = [self.snapshot_ids[row] for row in rows]
+        return {
+            "ids": ids,
+            "distances": [float(1 - similarities[row]) for row in rows],
+            "metadatas": [allowed[doc_id] for doc_id in ids],
+            "documents": [None] * len(ids)
+        }
+
+    def _search_lexical(self, query_text: str, n_results: int,
+                        allowed: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        # Terms are matched one at a time: an AND over every word of a
+        # natural-language query would rarely match anything
+        terms = list(dict.fromkeys(t.lower() for t in re.findall(r"\w+", query_text)))[:MAX_LEXICAL_TERMS]
+        if not terms:
+            return empty_results()
+        matched: Dict[str, int] = {}
+        bm25: Dict[str, float] = {}
+        for term in terms:
+            for hit in self.db.search_keyword(term, limit=len(self._catalog()), snippets=False):
+                doc_id = f"pams_{hit['id']}"
+                if doc_id in allowed:
+                    matched[doc_id] = matched.get(doc_id, 0) + 1
+                    bm25[doc_id] = bm25.get(doc_id, 0.0) + hit["score"]
+
+        ids = sorted(matched, key=lambda doc_id: (-matched[doc_id], -bm25[doc_id]))[:n_results]
+        return {
+            "ids": ids,
+            "distances": [1 - matched[doc_id] / len(terms) for doc_id in ids],
+            "metadatas": [allowed[doc_id] for doc_id in ids],
+            "documents": [None] * len(ids)
+        }
@@ -0,0 +1,49 @@
+"""
+Maximal marginal relevance (MMR) re-ranking
+
+Picks k of the candidates greedily, each time taking the one with the best
+
+    lambda * relevance - (1 - lambda) * max similarity to what is already picked
+
+so near-duplicates (same artist, same genre blurb) stop crowding the top of a
+recommendation list. lambda = 1 is plain relevance order; lower values trade
+relevance for diversity.
+
+The candidate x candidate similarity matrix is one matmul over the stored
+(unit) embeddings; every greedy step is then a vectorised max/argmax over the
+candidates, so re-ranking ~50 candidates costs well under a millisecond.
+"""
+from typing import List
+
+import numpy as np
+
+from embedding_backends import normalize_rows
+
+
+def mmr_select(query_embedding: np.ndarray, candidate_embeddings: np.ndarray,
+               k: int, lambda_mult: float = 0.5) -> List[int]:
+    """Indices of `k` candidates in MMR order"""
+    candidates = normalize_rows(candidate_embeddings)
+    n = len(candidates)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    relevance = candidates @ np.asarray(query_embedding, dtype=np.float32)
+    similarity = candidates @ candidates.T
+
+    selected = [int(np.argmax(relevance))]
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+    # Highest similarity of every candidate to anything selected so far
+    redundancy = similarity[selected[0]].copy()
+
+    while len(selected) < k:
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+
+    return selected
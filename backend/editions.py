@@ -0,0 +1,381 @@
+"""
+Festival editions: one vector index per PAMS year, searched together
+
+Every edition (EDITIONS="2024=PAMS_2024.csv,2025=PAMS.csv") has its own vector
+store (Chroma collection or numpy directory) and its own state directory under
+EDITIONS_DIR/<edition>:
+
+- edition.json   manifest: CSV path and sha256, embedding backend, row count
+- snapshot/      EmbeddingSnapshot of the edition's document vectors
+- neighbours.npz top-NEIGHBOURS_K most similar showcases of every showcase
+- content_hashes.json  content hash of every snapshot row (current edition)
+
+An edition whose CSV and embedding backend match its manifest is reloaded from
+the snapshot without calling the embedding model, so adding a new year only
+embeds that year. When the current edition's CSV changed, the catalog import's
+ChangeSet says which rows did: their vectors are embedded again, every other
+row keeps its snapshot vector.
+
+Federated search embeds the query once, fans out to the selected editions on a
+thread pool and merges the per-edition ranked lists with a heap, so latency is
+bounded by the slowest (largest) edition rather than the sum of all of them.
+"""
+import os
+import json
+import heapq
+import shutil
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from catalog import ChangeSet
+from config import EDITIONS, EDITIONS_DIR, NEIGHBOURS_K, CATALOG_YEAR, INDEX_ARTIFACT
+from embedding_backends import EmbeddingBackend, get_embedding_backend, normalize_rows
+from embedding_snapshot import EmbeddingSnapshot
+from vector_store import VectorStore, create_vector_store, empty_results
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "edition.json"
+SNAPSHOT_DIR = "snapshot"
+NEIGHBOURS_FILE = "neighbours.npz"
+HASHES_FILE = "content_hashes.json"
+
+
+def parse_editions(spec: str) -> Dict[str, str]:
+    """"2024=PAMS_2024.csv,2025=PAMS.csv" -> {"2024": "PAMS_2024.csv", "2025": "PAMS.csv"}"""
+    editions = {}
+    for item in spec.split(","):
+        if item.strip():
+            name, _, csv_path = item.partition("=")
+            editions[name.strip()] = csv_path.strip()
+    return editions
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def nearest_neighbours(vectors: np.ndarray, k: int,
+                       block: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+    """(rows, scores) of the k most similar other rows of every row, in row blocks"""
+    vectors = normalize_rows(vectors)
+    n = len(vectors)
+    k = min(k, n - 1)
+    rows = np.zeros((n, max(k, 0)), dtype=np.int32)
+    scores = np.zeros((n, max(k, 0)), dtype=np.float32)
+    if k <= 0:
+        return rows, scores
+    for start in range(0, n, block):
+        sims = vectors[start:start + block] @ vectors.T
+        # Never return a showcase as its own neighbour
+        sims[np.arange(len(sims)), np.arange(start, start + len(sims))] = -np.inf
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        rows[start:start + len(sims)] = np.take_along_axis(top, order, axis=1)
+        scores[start:start + len(sims)] = np.take_along_axis(top_scores, order, axis=1)
+    return rows, scores
+
+
+class Edition:
+    """One festival year: its vector store plus snapshot, neighbours and manifest"""
+
+    def __init__(self, name: str, csv_path: str, store: VectorStore, state_dir: str):
+        self.name = name
+        self.csv_path = csv_path
+        self.store = store
+        self.state_dir = state_dir
+        self.manifest: Dict[str, Any] = {}
+        self.ids: List[str] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.neighbour_rows: Optional[np.ndarray] = None
+        self.neighbour_scores: Optional[np.ndarray] = None
+        # Served from an index artifact: opened as built, never rebuilt
+        self.prebuilt = False
+
+        manifest_path = os.path.join(state_dir, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    @classmethod
+    def from_artifact(cls, name: str, path: str,
+                      embedding_backend: EmbeddingBackend = None) -> "Edition":
+        """The edition built into the index artifact at `path` (see index_artifact.py)"""
+        from index_artifact import CSV_FILE, open_store
+
+        edition = cls(name, os.path.join(path, CSV_FILE), open_store(path, embedding_backend), path)
+        edition.prebuilt = True
+        return edition
+
+    def _snapshot_is_current(self, csv_sha256: str) -> bool:
+        snapshot_path = os.path.join(self.state_dir, SNAPSHOT_DIR)
+        if (self.manifest.get("csv_sha256") != csv_sha256
+                or self.manifest.get("backend") != self.store.embedding_backend.name
+                or not os.path.exists(os.path.join(snapshot_path, "checkpoint.json"))):
+            return False
+        return EmbeddingSnapshot.open(snapshot_path).complete
+
+    def current_snapshot(self) -> Optional[EmbeddingSnapshot]:
+        """The edition's embedding snapshot, if it was built from the CSV as it is now"""
+        if not os.path.exists(self.csv_path) or not self._snapshot_is_current(file_sha256(self.csv_path)):
+            return None
+        return EmbeddingSnapshot.open(os.path.join(self.state_dir, SNAPSHOT_DIR))
+
+    def load(self, force: bool = False, shadow: bool = False, changes: Optional[ChangeSet] = None):
+        """(Re)build the edition's index, from its snapshot when the CSV is unchanged
+
+        With `shadow`, the index is built into a new version while the current
+        one keeps serving, validated, and published (see index_versions.py).
+        Raises RuntimeError, leaving the current version in place, when the new
+        one fails validation.
+
+        `changes` is the catalog import of this edition's CSV: documents take
+        their catalog ids, and only rows whose content hash is not in the
+        snapshot are embedded.
+        """
+        if self.prebuilt:
+            self.open()
+            return
+        if not os.path.exists(self.csv_path):
+            logger.error(f"Edition {self.name}: CSV not found: {self.csv_path}")
+            return
+        csv_sha256 = file_sha256(self.csv_path)
+        snapshot_path = os.path.join(self.state_dir, SNAPSHOT_DIR)
+        doc_ids = changes.doc_ids if changes is not None else None
+        vectors = None
+        from_snapshot = False
+        if not force and self._snapshot_is_current(csv_sha256):
+            snapshot = EmbeddingSnapshot.open(snapshot_path)
+            if doc_ids is None or snapshot.ids == doc_ids:
+                logger.info(f"Edition {self.name}: loading {len(snapshot.ids)} vectors from snapshot")
+                vectors = np.asarray(snapshot.vectors)
+                from_snapshot = True
+        if vectors is None and not force and changes is not None:
+            vectors = self._reuse_vectors(changes, snapshot_path)
+        if vectors is None:
+            logger.info(f"Edition {self.name}: embedding {self.csv_path}")
+
+        if shadow:
+            store = self.store.build_version(self.csv_path, embeddings=vectors, doc_ids=doc_ids)
+        else:
+            store = self.store
+            store.load_pams_data(self.csv_path, embeddings=vectors, doc_ids=doc_ids)
+        ids, _, _ = store.prepare_pams_records(self.csv_path, doc_ids)
+        # Written after validation: later loads trust the snapshot without re-embedding
+        if not from_snapshot:
+            vectors = self._write_snapshot(store, ids, snapshot_path, vectors)
+        if changes is not None:
+            self._write_hashes(ids, changes.hashes)
+
+        neighbour_rows, neighbour_scores = nearest_neighbours(vectors, NEIGHBOURS_K)
+        # Replaced atomically: follower workers may be reading the previous table
+        tmp_path = os.path.join(self.state_dir, "neighbours.tmp.npz")
+        np.savez(tmp_path, rows=neighbour_rows, scores=neighbour_scores)
+        os.replace(tmp_path, os.path.join(self.state_dir, NEIGHBOURS_FILE))
+
+        if shadow:
+            store.publish(self.store)
+        self.store = store
+        self.ids = ids
+        self.id_to_row = {doc_id: row for row, doc_id in enumerate(ids)}
+        self.neighbour_rows, self.neighbour_scores = neighbour_rows, neighbour_scores
+
+        self.manifest = {
+            "edition": self.name,
+            "csv_path": self.csv_path,
+            "csv_sha256": csv_sha256,
+            "backend": self.store.embedding_backend.name,
+            "vector_store": self.store.backend_name,
+            "count": self.store.count()
+        }
+        tmp_path = os.path.join(self.state_dir, MANIFEST_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, os.path.join(self.state_dir, MANIFEST_FILE))
+
+    def open(self):
+        """Serve what the last load published (ids, neighbours) without rebuilding anything
+
+        Used by follower workers, whose stores are opened read-only on the
+        published index version (see workers.py), and by a worker taking over
+        as leader.
+        """
+        self.ids = EmbeddingSnapshot.open(os.path.join(self.state_dir, SNAPSHOT_DIR)).ids
+        self.id_to_row = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        with np.load(os.path.join(self.state_dir, NEIGHBOURS_FILE)) as neighbours:
+            self.neighbour_rows, self.neighbour_scores = neighbours["rows"], neighbours["scores"]
+        manifest_path = os.path.join(self.state_dir, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    def _reuse_vectors(self, changes: ChangeSet, snapshot_path: str) -> Optional[np.ndarray]:
+        """Vectors for every CSV row: from the snapshot where the row's content
+        hash is unchanged, embedded otherwise; None without a usable snapshot"""
+        hashes_path = os.path.join(self.state_dir, HASHES_FILE)
+        if (self.manifest.get("backend") != self.store.embedding_backend.name
+                or not os.path.exists(hashes_path)
+                or not os.path.exists(os.path.join(snapshot_path, "checkpoint.json"))):
+            return None
+        snapshot = EmbeddingSnapshot.open(snapshot_path)
+        if not snapshot.complete:
+            return None
+        with open(hashes_path, encoding="utf-8") as f:
+            previous = json.load(f)
+        rows = {doc_id: row for row, doc_id in enumerate(snapshot.ids)}
+
+        doc_ids = changes.doc_ids
+        vectors = np.zeros((len(doc_ids), self.store.embedding_backend.dim), dtype=np.float32)
+        stale = []
+        for i, (doc_id, digest) in enumerate(zip(doc_ids, changes.hashes)):
+            row = rows.get(doc_id)
+            if row is not None and previous.get(doc_id) == digest:
+                vectors[i] = snapshot.vectors[row]
+            else:
+                stale.append(i)
+        logger.info(f"Edition {self.name}: reusing {len(doc_ids) - len(stale)} snapshot vectors, "
+                    f"embedding {len(stale)} new or changed rows")
+        if stale:
+            _, documents, _ = self.store.prepare_pams_records(self.csv_path, doc_ids)
+            vectors[stale] = self.store.embedding_backend.encode([documents[i] for i in stale])
+        return vectors
+
+    def _write_hashes(self, ids: List[str], hashes: List[str]):
+        tmp_path = os.path.join(self.state_dir, HASHES_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(zip(ids, hashes)), f)
+        os.replace(tmp_path, os.path.join(self.state_dir, HASHES_FILE))
+
+    def _write_snapshot(self, store: VectorStore, ids: List[str], snapshot_path: str,
+                        vectors: Optional[np.ndarray] = None) -> np.ndarray:
+        """Snapshot `vectors`, or the freshly embedded vectors copied out of `store`, in CSV order"""
+        if vectors is None:
+            stored = store.get_records(ids, include_embeddings=True)
+            by_id = dict(zip(stored["ids"], stored["embeddings"]))
+            vectors = np.asarray([by_id[doc_id] for doc_id in ids], dtype=np.float32)
+
+        # A snapshot of an older CSV with the same row count would otherwise be "resumed"
+        shutil.rmtree(snapshot_path, ignore_errors=True)
+        snapshot = EmbeddingSnapshot.create_or_resume(
+            snapshot_path, ids, store.embedding_backend.dim,
+            chunk_size=max(len(ids), 1), backend=store.embedding_backend.name
+        )
+        if ids:
+            snapshot.write_chunk(0, vectors)
+        return vectors
+
+    def neighbours(self, showcase_id: str, k: int = NEIGHBOURS_K) -> List[Tuple[str, float]]:
+        """Precomputed most similar showcases of the same edition"""
+        row = self.id_to_row.get(showcase_id)
+        if self.neighbour_rows is None or row is None:
+            return []
+        return [
+            (self.ids[neighbour], float(score))
+            for neighbour, score in zip(self.neighbour_rows[row, :k], self.neighbour_scores[row, :k])
+        ]
+
+    def info(self) -> Dict[str, Any]:
+        return {"edition": self.name, "csv_path": self.csv_path, "count": self.store.count(),
+                "csv_sha256": self.manifest.get("csv_sha256"), "version": self.store.version}
+
+
+class EditionRegistry:
+    """All configured editions plus concurrent federated search over them"""
+
+    def __init__(self, editions: Dict[str, Edition], current: str):
+        self.editions = editions
+        self.current = current
+        self._executor = ThreadPoolExecutor(max_workers=max(len(editions), 1),
+                                            thread_name_prefix="edition-search")
+
+    @classmethod
+    def from_config(cls, spec: str = EDITIONS, current: str = str(CATALOG_YEAR),
+                    backend: str = None, embedding_backend: EmbeddingBackend = None,
+                    state_root: str = EDITIONS_DIR, read_only: bool = False,
+                    artifact: str = INDEX_ARTIFACT) -> "EditionRegistry":
+        # One embedding model for every edition
+        embedding_backend = embedding_backend or get_embedding_backend()
+        editions = {}
+        for name, csv_path in parse_editions(spec).items():
+            if name == current and artifact:
+                editions[name] = Edition.from_artifact(name, artifact, embedding_backend)
+                continue
+            # The current edition keeps the original collection / index path
+            store = create_vector_store(backend, embedding_backend,
+                                        edition=None if name == current else name, read_only=read_only)
+            state_dir = os.path.join(state_root, name)
+            os.makedirs(state_dir, exist_ok=True)
+            editions[name] = Edition(name, csv_path, store, state_dir)
+        return cls(editions, current)
+
+    def load_all(self, force: bool = False, changes: Optional[ChangeSet] = None):
+        """Load every edition; `changes` is the catalog import of the current edition's CSV"""
+        for name, edition in self.editions.items():
+            applies = changes is not None and name == self.current and changes.applies_to(edition.csv_path)
+            edition.load(force=force, changes=changes if applies else None)
+
+    def open_all(self):
+        for edition in self.editions.values():
+            edition.open()
+
+    def gc_versions(self) -> List[str]:
+        """Drop every edition's index versions retired longer than the grace period"""
+        return [name for edition in self.editions.values() for name in edition.store.gc_versions()]
+
+    def get(self, name: str) -> Edition:
+        if name not in self.editions:
+            raise KeyError(f"Unknown edition '{name}' (available: {sorted(self.editions)})")
+        return self.editions[name]
+
+    @property
+    def current_store(self) -> Optional[VectorStore]:
+        edition = self.editions.get(self.current)
+        return edition.store if edition else None
+
+    def search(self, query_text: str, n_results: int = 10, editions: Optional[List[str]] = None,
+               mode: str = "dense", where: Optional[dict] = None) -> Dict[str, Any]:
+        """Top-n across `editions` (all by default); results carry their "editions"
+
+        Raises KeyError for an unknown edition name.
+        """
+        selected = [self.get(name) for name in (editions or list(self.editions))]
+        if not selected:
+            return {**empty_results(), "editions": []}
+
+        # Embed once and hand the vector to every edition's query cache
+        query_embedding = selected[0].store.embed_query(query_text)
+        if np.any(query_embedding):
+            for edition in selected[1:]:
+                edition.store.query_cache.put_vector(query_text, query_embedding)
+
+        per_edition = list(self._executor.map(
+            lambda edition: edition.store.search(query_text, n_results, mode=mode, where=where),
+            selected
+        ))
+
+        # Each list is already ranked; heap-merge them on a comparable key
+        def ranked(edition: Edition, results: Dict[str, Any]):
+            for i in range(len(results["ids"])):
+                key = -results["scores"][i] if "scores" in results else results["distances"][i]
+                yield key, edition.name, i, results
+
+        merged = list(heapq.merge(
+            *(ranked(edition, results) for edition, results in zip(selected, per_edition)),
+            key=lambda item: (item[0], item[1], item[2])
+        ))[:n_results]
+
+        combined = {
+            key: [results[key][i] for _, _, i, results in merged]
+            for key in ("ids", "distances", "metadatas", "documents")
+        }
+        combined["editions"] = [name for _, name, _, _ in merged]
+        return combined
@@ -0,0 +1,217 @@
+"""
+Pluggable embedding backends for the BGE-M3 dense path
+
+All backends return L2-normalised float32 arrays of shape (n, 1024) so the
+vector stores can switch between them without caring where vectors come from.
+
+- ollama:    HTTP calls to the local Ollama server (default, previous behaviour)
+- torch:     FlagEmbedding BGEM3FlagModel, fp16 only when CUDA is available
+- onnx:      ONNX Runtime on CPU, fp32 graph exported by export_onnx.py
+- onnx-int8: same graph with int8 dynamic quantisation
+
+The ONNX backends only need onnxruntime and tokenizers, so the API process can
+embed queries in-process without Ollama and without importing torch.
+"""
+import os
+import logging
+from typing import Dict, List
+
+import numpy as np
+
+from config import (
+    OLLAMA_URL, EMBEDDING_BACKEND, ONNX_MODEL_DIR,
+    EMBEDDING_THREADS, EMBEDDING_DIM, EMBEDDING_MAX_LENGTH
+)
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise each row, leaving all-zero rows untouched"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class EmbeddingBackend:
+    """Base class for dense embedding backends"""
+    name = "base"
+    dim = EMBEDDING_DIM
+    # Whether encode_sparse() returns BGE-M3 lexical weights
+    supports_sparse = False
+
+    def encode(self, texts: List[str], batch_size: int = 8) -> np.ndarray:
+        """Encode texts into an (n, dim) float32 array of unit vectors"""
+        raise NotImplementedError
+
+    def encode_one(self, text: str) -> np.ndarray:
+        """Encode a single text into a (dim,) unit vector"""
+        return self.encode([text], batch_size=1)[0]
+
+    def encode_sparse(self, texts: List[str], batch_size: int = 8) -> List[Dict[str, float]]:
+        """BGE-M3 lexical weights (token id -> weight) for each text"""
+        raise NotImplementedError(f"{self.name} does not produce sparse weights")
+
+
+class OllamaBGEM3Backend(EmbeddingBackend):
+    """BGE-M3 served by the local Ollama server"""
+    name = "ollama-bge-m3"
+
+    def __init__(self, ollama_url: str = OLLAMA_URL, timeout: int = 30):
+        self.ollama_url = ollama_url
+        self.timeout = timeout
+
+    def encode(self, texts: List[str], batch_size: int = 8) -> np.ndarray:
+        import requests
+        embeddings = []
+        for text in texts:
+            try:
+                response = requests.post(
+                    f"{self.ollama_url}/api/embeddings",
+                    json={
+                        "model": "bge-m3",
+                        "prompt": text
+                    },
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                embeddings.append(response.json()["embedding"])
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Ollama embedding request failed: {e}")
+                # Fallback to zero vector if Ollama fails
+                embeddings.append([0.0] * self.dim)
+
+        return normalize_rows(np.array(embeddings, dtype=np.float32).reshape(-1, self.dim))
+
+
+class TorchBGEM3Backend(EmbeddingBackend):
+    """BGE-M3 through FlagEmbedding/PyTorch"""
+    name = "torch-bge-m3"
+    supports_sparse = True
+
+    def __init__(self, model_name: str = "BAAI/bge-m3", use_fp16: bool = None,
+                 max_length: int = EMBEDDING_MAX_LENGTH, threads: int = EMBEDDING_THREADS):
+        import torch
+        from FlagEmbedding import BGEM3FlagModel
+
+        # fp16 only pays off on GPU; on CPU it is slower and no smaller in RAM
+        if use_fp16 is None:
+            use_fp16 = torch.cuda.is_available()
+        if threads:
+            torch.set_num_threads(threads)
+
+        logger.info(f"Loading {model_name} with FlagEmbedding (fp16={use_fp16})...")
+        self.model = BGEM3FlagModel(model_name, use_fp16=use_fp16)
+        self.max_length = max_length
+
+    def encode(self, texts: List[str], batch_size: int = 8) -> np.ndarray:
+        dense = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            max_length=self.max_length
+        )['dense_vecs']
+        return normalize_rows(dense)
+
+    def encode_sparse(self, texts: List[str], batch_size: int = 8) -> List[Dict[str, float]]:
+        output = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            max_length=self.max_length,
+            return_dense=False,
+            return_sparse=True
+        )
+        return [
+            {str(token): float(weight) for token, weight in weights.items()}
+            for weights in output['lexical_weights']
+        ]
+
+
+class OnnxBGEM3Backend(EmbeddingBackend):
+    """BGE-M3 dense path on ONNX Runtime (CPU), optionally int8-quantised"""
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR, quantized: bool = False,
+                 max_length: int = EMBEDDING_MAX_LENGTH,
+                 intra_op_threads: int = EMBEDDING_THREADS):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_file = "model_int8.onnx" if quantized else "model.onnx"
+        model_path = os.path.join(model_dir, model_file)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"ONNX model not found: {model_path} (run export_onnx.py first)"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.inter_op_num_threads = 1
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        logger.info(f"Loading ONNX model {model_path}...")
+        self.session = ort.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        # XLM-RoBERTa pads with <pad> (id 1)
+        self.tokenizer.enable_padding(pad_id=1, pad_token="<pad>")
+
+        self.name = "onnx-int8-bge-m3" if quantized else "onnx-bge-m3"
+
+    def encode(self, texts: List[str], batch_size: int = 8) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        # Batch texts of similar length together to keep padding small
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        output = np.empty((len(texts), self.dim), dtype=np.float32)
+
+        for start in range(0, len(order), batch_size):
+            batch_idx = order[start:start + batch_size]
+            encoded = self.tokenizer.encode_batch([texts[i] for i in batch_idx])
+            feeds = {
+                "input_ids": np.array([e.ids for e in encoded], dtype=np.int64),
+                "attention_mask": np.array([e.attention_mask for e in encoded], dtype=np.int64)
+            }
+            feeds = {k: v for k, v in feeds.items() if k in self.input_names}
+            dense = self.session.run(["dense_vecs"], feeds)[0]
+            output[batch_idx] = dense
+
+        return normalize_rows(output)
+
+
+_backends: Dict[str, EmbeddingBackend] = {}
+
+
+def create_embedding_backend(name: str = None, threads: int = None,
+                             max_length: int = EMBEDDING_MAX_LENGTH) -> EmbeddingBackend:
+    """Build a new backend instance; `threads` caps intra-op threads for in-process models,
+    `max_length` is their token truncation length (Ollama truncates server-side)"""
+    name = (name or EMBEDDING_BACKEND).lower()
+    threads = EMBEDDING_THREADS if threads is None else threads
+
+    if name == "ollama":
+        return OllamaBGEM3Backend()
+    if name == "torch":
+        return TorchBGEM3Backend(threads=threads, max_length=max_length)
+    if name == "onnx":
+        return OnnxBGEM3Backend(quantized=False, intra_op_threads=threads, max_length=max_length)
+    if name in ("onnx-int8", "onnx_int8"):
+        return OnnxBGEM3Backend(quantized=True, intra_op_threads=threads, max_length=max_length)
+    raise ValueError(f"Unknown embedding backend: {name}")
+
+
+def get_embedding_backend(name: str = None) -> EmbeddingBackend:
+    """Return the shared backend instance for `name` (defaults to EMBEDDING_BACKEND)"""
+    name = (name or EMBEDDING_BACKEND).lower()
+
+    if name not in _backends:
+        backend = create_embedding_backend(name)
+        logger.info(f"Using embedding backend '{backend.name}'")
+        _backends[name] = backend
+
+    return _backends[name]
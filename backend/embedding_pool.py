@@ -0,0 +1,114 @@
+"""
+Parallel offline catalog embedding
+
+A pool of model worker processes, each pinned to its own share of the CPU cores
+with intra-op threads capped to that share, so N workers do not fight over the
+same cores. The parent hands out fixed-size chunks, writes finished chunks into
+an EmbeddingSnapshot as they arrive and checkpoints after every chunk, so an
+interrupted run picks up where it stopped.
+"""
+import os
+import time
+import logging
+import multiprocessing as mp
+from typing import List, Optional
+
+import numpy as np
+
+from config import EMBEDDING_BACKEND, EMBEDDING_DIM
+from embedding_snapshot import EmbeddingSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Per-process model, created once by the pool initializer
+_worker_backend = None
+_worker_batch_size = 8
+
+
+def available_cores() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def split_cores(cores: List[int], workers: int) -> List[List[int]]:
+    """Split cores into `workers` contiguous, nearly equal groups"""
+    workers = max(1, min(workers, len(cores)))
+    size, extra = divmod(len(cores), workers)
+    groups, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        groups.append(cores[start:end])
+        start = end
+    return groups
+
+
+def _init_worker(backend_name: str, core_groups, batch_size: int):
+    global _worker_backend, _worker_batch_size
+
+    # Each worker claims the next free core group
+    cores = core_groups.get()
+    threads = len(cores)
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+
+    from embedding_backends import create_embedding_backend
+    _worker_backend = create_embedding_backend(backend_name, threads=threads)
+    _worker_batch_size = batch_size
+    logger.info(f"Worker {os.getpid()} ready on cores {cores} ({threads} threads)")
+
+
+def _encode_chunk(task):
+    chunk_index, texts = task
+    return chunk_index, _worker_backend.encode(texts, batch_size=_worker_batch_size)
+
+
+def encode_catalog(texts: List[str], ids: List[str], snapshot_dir: str,
+                   backend: str = None, workers: Optional[int] = None,
+                   chunk_size: int = 64, batch_size: int = 8,
+                   dim: int = EMBEDDING_DIM) -> EmbeddingSnapshot:
+    """Embed `texts` into a snapshot at `snapshot_dir`, resuming a partial run if present"""
+    backend = (backend or EMBEDDING_BACKEND).lower()
+
+    snapshot = EmbeddingSnapshot.create_or_resume(snapshot_dir, ids, dim, chunk_size, backend)
+    pending = snapshot.pending_chunks()
+    if not pending:
+        logger.info(f"Snapshot {snapshot_dir} is already complete ({len(ids)} vectors)")
+        return snapshot
+
+    core_groups = split_cores(available_cores(), workers or len(available_cores()))
+    # No point starting more workers than there are chunks left
+    core_groups = core_groups[:len(pending)]
+    logger.info(
+        f"Encoding {len(pending)} chunks of {chunk_size} with {len(core_groups)} workers"
+    )
+
+    tasks = (
+        (c, texts[c * chunk_size:(c + 1) * chunk_size]) for c in pending
+    )
+
+    # spawn keeps torch/onnxruntime thread pools out of forked children
+    ctx = mp.get_context("spawn")
+    group_queue = ctx.Queue()
+    for group in core_groups:
+        group_queue.put(group)
+
+    start = time.perf_counter()
+    done = 0
+    with ctx.Pool(
+        processes=len(core_groups),
+        initializer=_init_worker,
+        initargs=(backend, group_queue, batch_size)
+    ) as pool:
+        for chunk_index, vectors in pool.imap_unordered(_encode_chunk, tasks):
+            snapshot.write_chunk(chunk_index, np.asarray(vectors, dtype=np.float32))
+            done += 1
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"Chunk {chunk_index} done ({done}/{len(pending)}, "
+                f"{done * chunk_size / elapsed:.1f} docs/s)"
+            )
+
+    return snapshot
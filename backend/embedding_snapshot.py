@@ -0,0 +1,122 @@
+"""
+On-disk embedding snapshot with checkpointing
+
+A snapshot is a directory holding:
+
+- vectors.npy      float32 (n, dim) matrix, written in place through a memmap
+- ids.json         document ids, row i of the matrix belongs to ids[i]
+- checkpoint.json  chunk size, backend name and the chunks already written
+
+Because the matrix is a plain .npy file it can be opened with mmap_mode='r',
+so readers only page in the rows they touch.
+"""
+import os
+import json
+import hashlib
+import logging
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.npy"
+IDS_FILE = "ids.json"
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def _write_json_atomic(path: str, data) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def ids_fingerprint(ids: List[str]) -> str:
+    return hashlib.sha256("\n".join(ids).encode("utf-8")).hexdigest()
+
+
+class EmbeddingSnapshot:
+    """Memory-mapped embedding matrix plus ids and a resumable checkpoint"""
+
+    def __init__(self, path: str, ids: List[str], vectors: np.ndarray, checkpoint: dict):
+        self.path = path
+        self.ids = ids
+        self.vectors = vectors
+        self.checkpoint = checkpoint
+
+    @classmethod
+    def open(cls, path: str, mmap_mode: str = "r") -> "EmbeddingSnapshot":
+        """Open an existing snapshot (read-only by default)"""
+        with open(os.path.join(path, IDS_FILE), encoding="utf-8") as f:
+            ids = json.load(f)
+        checkpoint = {}
+        checkpoint_path = os.path.join(path, CHECKPOINT_FILE)
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode=mmap_mode)
+        return cls(path, ids, vectors, checkpoint)
+
+    @classmethod
+    def create_or_resume(cls, path: str, ids: List[str], dim: int,
+                         chunk_size: int, backend: str) -> "EmbeddingSnapshot":
+        """Resume a matching partial snapshot at `path`, or start a new one"""
+        os.makedirs(path, exist_ok=True)
+        fingerprint = ids_fingerprint(ids)
+        checkpoint_path = os.path.join(path, CHECKPOINT_FILE)
+
+        if os.path.exists(checkpoint_path) and os.path.exists(os.path.join(path, VECTORS_FILE)):
+            with open(checkpoint_path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            if (checkpoint.get("ids_fingerprint") == fingerprint
+                    and checkpoint.get("dim") == dim
+                    and checkpoint.get("chunk_size") == chunk_size
+                    and checkpoint.get("backend") == backend):
+                vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r+")
+                logger.info(
+                    f"Resuming snapshot {path}: {len(checkpoint['done_chunks'])} chunks already done"
+                )
+                return cls(path, ids, vectors, checkpoint)
+            logger.info(f"Snapshot {path} does not match this catalog, starting over")
+
+        vectors = np.lib.format.open_memmap(
+            os.path.join(path, VECTORS_FILE), mode="w+", dtype=np.float32, shape=(len(ids), dim)
+        )
+        _write_json_atomic(os.path.join(path, IDS_FILE), ids)
+        checkpoint = {
+            "ids_fingerprint": fingerprint,
+            "dim": dim,
+            "chunk_size": chunk_size,
+            "backend": backend,
+            "total": len(ids),
+            "done_chunks": [],
+            "complete": False
+        }
+        snapshot = cls(path, ids, vectors, checkpoint)
+        snapshot.save_checkpoint()
+        return snapshot
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.checkpoint.get("complete"))
+
+    def pending_chunks(self) -> List[int]:
+        chunk_size = self.checkpoint["chunk_size"]
+        n_chunks = (len(self.ids) + chunk_size - 1) // chunk_size
+        done = set(self.checkpoint["done_chunks"])
+        return [c for c in range(n_chunks) if c not in done]
+
+    def write_chunk(self, chunk_index: int, vectors: np.ndarray) -> None:
+        """Write one chunk of rows and record it in the checkpoint"""
+        start = chunk_index * self.checkpoint["chunk_size"]
+        self.vectors[start:start + len(vectors)] = vectors
+        # Rows must hit the disk before the checkpoint claims them
+        self.vectors.flush()
+        self.checkpoint["done_chunks"].append(chunk_index)
+        if not self.pending_chunks():
+            self.checkpoint["complete"] = True
+        self.save_checkpoint()
+
+    def save_checkpoint(self) -> None:
+        _write_json_atomic(os.path.join(self.path, CHECKPOINT_FILE), self.checkpoint)
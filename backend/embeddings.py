@@ -1,18 +1,21 @@
-from FlagEmbedding import BGEM3FlagModel
 import numpy as np
 from typing import List, Dict
 import pickle
 import os
+import hashlib
+
+from embedding_backends import get_embedding_backend
 
 class EmbeddingService:
-    def __init__(self, cache_dir: str = "../data/embeddings"):
+    def __init__(self, cache_dir: str = "../data/embeddings", backend: str = None):
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
         
-        # Initialize BGE-M3 model
+        # Initialize BGE-M3 backend (torch, onnx, onnx-int8 or ollama)
         print("Loading BGE-M3 model...")
-        self.model = BGEM3FlagModel('BAAI/bge-m3', use_fp16=True)
-        print("BGE-M3 model loaded successfully!")
+        self.backend_name = backend
+        self.backend = get_embedding_backend(backend)
+        print(f"BGE-M3 model loaded successfully! ({self.backend.name})")
         
         self.embeddings_cache = {}
         self.load_cache()
@@ -37,11 +40,7 @@ class EmbeddingService:
             return self.embeddings_cache[text]
         
         # Generate embedding using BGE-M3
-        embedding = self.model.encode(
-            [text], 
-            batch_size=1, 
-            max_length=512
-        )['dense_vecs'][0]
+        embedding = self.backend.encode_one(text)
         
         # Convert to list and cache
         embedding_list = embedding.tolist()
@@ -51,8 +50,13 @@ class EmbeddingService:
         
         return embedding_list
     
-    def get_batch_embeddings(self, texts: List[str], use_cache: bool = True) -> List[List[float]]:
-        """Get embeddings for multiple texts"""
+    def get_batch_embeddings(self, texts: List[str], use_cache: bool = True,
+                             workers: int = 1) -> List[List[float]]:
+        """Get embeddings for multiple texts
+        
+        With workers > 1 the uncached texts are encoded by a process pool
+        (see embedding_pool.encode_catalog) that checkpoints into cache_dir.
+        """
         embeddings = []
         texts_to_encode = []
         text_indices = []
@@ -69,11 +73,18 @@ class EmbeddingService:
         # Encode uncached texts
         if texts_to_encode:
             print(f"Encoding {len(texts_to_encode)} new texts...")
-            new_embeddings = self.model.encode(
-                texts_to_encode,
-                batch_size=8,
-                max_length=512
-            )['dense_vecs']
+            if workers > 1:
+                from embedding_pool import encode_catalog
+                snapshot = encode_catalog(
+                    texts_to_encode,
+                    [self._text_key(text) for text in texts_to_encode],
+                    os.path.join(self.cache_dir, "pool_snapshot"),
+                    backend=self.backend_name,
+                    workers=workers
+                )
+                new_embeddings = snapshot.vectors
+            else:
+                new_embeddings = self.backend.encode(texts_to_encode, batch_size=8)
             
             # Update results and cache
             for idx, text, embedding in zip(text_indices, texts_to_encode, new_embeddings):
@@ -87,6 +98,10 @@ class EmbeddingService:
         
         return embeddings
     
+    def _text_key(self, text: str) -> str:
+        """Stable id for a text, used by pool snapshots"""
+        return hashlib.md5(text.encode()).hexdigest()
+    
     def create_showcase_text(self, showcase) -> str:
         """Create a comprehensive text representation of a showcase for embedding"""
         parts = []
@@ -1,19 +1,24 @@
-from FlagEmbedding import BGEM3FlagModel
 import numpy as np
 from typing import List, Union
 import logging
 
+from embedding_backends import create_embedding_backend
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Full BGE-M3 context: showcase texts are embedded whole, not cut at the
+# EMBEDDING_MAX_LENGTH the query-time backends use
+MAX_LENGTH = 8192
+
 class BGEM3EmbeddingService:
-    def __init__(self):
+    def __init__(self, backend: str = "torch", max_length: int = MAX_LENGTH):
         """Initialize BGE-M3 embedding model"""
         logger.info("Initializing BGE-M3 embedding model...")
         try:
-            # Load BGE-M3 model
-            self.model = BGEM3FlagModel('BAAI/bge-m3', use_fp16=True)
-            logger.info("BGE-M3 model loaded successfully!")
+            # FlagEmbedding by default; "onnx", "onnx-int8" or "ollama" also work
+            self.backend = create_embedding_backend(backend, max_length=max_length)
+            logger.info(f"BGE-M3 model loaded successfully! ({self.backend.name})")
         except Exception as e:
             logger.error(f"Failed to load BGE-M3 model: {e}")
             logger.info("Falling back to sentence-transformers...")
@@ -71,12 +76,8 @@ class BGEM3EmbeddingService:
                 # Use sentence-transformers API
                 embeddings = self.model.encode(texts, normalize_embeddings=True)
             else:
-                # Use FlagEmbedding API
-                embeddings = self.model.encode(
-                    texts, 
-                    batch_size=12,
-                    max_length=8192
-                )['dense_vecs']
+                # Use the embedding backend
+                embeddings = self.backend.encode(texts, batch_size=12)
             
             if single:
                 return embeddings[0].tolist()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+Export the BGE-M3 dense encoder to ONNX and build an int8 dynamic-quantised copy
+
+Run once on a machine with torch/transformers installed:
+
+    python export_onnx.py --output ./models/bge-m3-onnx
+
+The output directory holds model.onnx, model_int8.onnx and tokenizer.json and
+is what OnnxBGEM3Backend loads (EMBEDDING_BACKEND=onnx or onnx-int8).
+
+With --reranker the bge-reranker cross-encoder is exported instead, for
+RERANKER_BACKEND=onnx / onnx-int8:
+
+    python export_onnx.py --reranker --output ./models/bge-reranker-onnx
+"""
+
+import os
+import argparse
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def export_dense_model(model_name: str, output_dir: str, opset: int = 17):
+    """Export CLS pooling + L2 normalisation (the BGE-M3 dense_vecs path)"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    class DenseEncoder(torch.nn.Module):
+        def __init__(self, encoder):
+            super().__init__()
+            self.encoder = encoder
+
+        def forward(self, input_ids, attention_mask):
+            hidden = self.encoder(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+            return torch.nn.functional.normalize(hidden[:, 0], dim=-1)
+
+    logger.info(f"Loading {model_name}...")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = DenseEncoder(AutoModel.from_pretrained(model_name)).eval()
+
+    # The fast tokenizer file is all the ONNX backend needs at runtime
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, "tokenizer.json"))
+
+    sample = tokenizer(["BGE-M3 export sample", "판소리 공연"], padding=True, return_tensors="pt")
+    model_path = os.path.join(output_dir, "model.onnx")
+
+    logger.info(f"Exporting to {model_path}...")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            model_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["dense_vecs"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "dense_vecs": {0: "batch"}
+            },
+            opset_version=opset
+        )
+    return model_path
+
+
+def export_reranker_model(model_name: str, output_dir: str, opset: int = 17):
+    """Export the cross-encoder relevance logit for (query, document) pairs"""
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    logger.info(f"Loading {model_name}...")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, "tokenizer.json"))
+
+    sample = tokenizer([["rock music", "Title: Gamblerz"], ["판소리", "판소리 공연"]],
+                       padding=True, return_tensors="pt")
+    model_path = os.path.join(output_dir, "model.onnx")
+
+    logger.info(f"Exporting to {model_path}...")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            model_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"}
+            },
+            opset_version=opset
+        )
+    return model_path
+
+
+def quantize_model(model_path: str, output_dir: str):
+    """Int8 dynamic quantisation of the MatMul/Gemm weights"""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    quantized_path = os.path.join(output_dir, "model_int8.onnx")
+    logger.info(f"Quantizing to {quantized_path}...")
+    quantize_dynamic(
+        model_path,
+        quantized_path,
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=["MatMul", "Gemm"],
+        use_external_data_format=False
+    )
+    return quantized_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export BGE-M3 dense encoder (or reranker) to ONNX")
+    parser.add_argument("--reranker", action="store_true",
+                        help="Export the bge-reranker cross-encoder instead of the dense encoder")
+    parser.add_argument("--model", default=None,
+                        help="Defaults to BAAI/bge-m3, or BAAI/bge-reranker-v2-m3 with --reranker")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--skip-quantize", action="store_true")
+    args = parser.parse_args()
+
+    if args.reranker:
+        args.model = args.model or "BAAI/bge-reranker-v2-m3"
+        args.output = args.output or "./models/bge-reranker-onnx"
+    else:
+        args.model = args.model or "BAAI/bge-m3"
+        args.output = args.output or "./models/bge-m3-onnx"
+
+    os.makedirs(args.output, exist_ok=True)
+    export = export_reranker_model if args.reranker else export_dense_model
+    model_path = export(args.model, args.output, args.opset)
+
+    if not args.skip_quantize:
+        quantize_model(model_path, args.output)
+
+    for name in sorted(os.listdir(args.output)):
+        size_mb = os.path.getsize(os.path.join(args.output, name)) / 1024 / 1024
+        logger.info(f"  {name}: {size_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Per-field showcase vectors combined with query-time weights
+
+The main document vector embeds one long "Title | Artist | ... | Review"
+string, so long reviews dominate it and BGE-M3 truncation cuts off whatever
+comes last. With FIELD_VECTORS=1 every showcase also gets one vector per
+semantic field:
+
+- summary        title, artist, genre, venue, director and cast (short)
+- introduction   Introduction to the work
+- artist         Artist description
+- review         Review
+
+The field vectors are stacked into one (fields, rows, dim) float32 tensor, so a
+query is scored against every field with a single einsum and the weighted sum
+is taken over the fields each showcase actually has (missing fields do not pull
+the score down). Weights default to FIELD_WEIGHTS and can be set per query,
+e.g. {"review": 1.0} searches reviews only.
+
+Like the sparse index, it is built in memory when the catalog is loaded (or on
+first use, from the stored metadata).
+"""
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from embedding_backends import normalize_rows
+from ingest import clean_text
+
+logger = logging.getLogger(__name__)
+
+# Field name -> (label, CSV column) pairs whose values make up its text
+FIELD_COLUMNS = {
+    "summary": [
+        ("Title", "Title"), ("Artist", "Artist"), ("Genre", "Genre"),
+        ("Venue", "PAMS Venue"), ("Director", "Director"), ("Cast", "Cast")
+    ],
+    "introduction": [("Introduction", "Introduction to the work")],
+    "artist": [("Artist Description", "Artist description")],
+    "review": [("Review", "Review")]
+}
+FIELDS = list(FIELD_COLUMNS)
+
+
+def field_texts(record: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """Text of every field for one CSV row or metadata dict (None when empty)"""
+    texts = {}
+    for field, columns in FIELD_COLUMNS.items():
+        parts = [f"{label}: {value}" for label, column in columns
+                 if (value := clean_text(record.get(column)))]
+        texts[field] = " | ".join(parts) if parts else None
+    return texts
+
+
+def parse_field_weights(spec: str) -> Dict[str, float]:
+    """"summary:1,review:0.5" -> {"summary": 1.0, "review": 0.5}"""
+    weights = {}
+    for item in spec.split(","):
+        if item.strip():
+            field, _, weight = item.partition(":")
+            weights[field.strip()] = float(weight) if weight.strip() else 1.0
+    return validate_field_weights(weights)
+
+
+def validate_field_weights(weights: Dict[str, float]) -> Dict[str, float]:
+    unknown = set(weights) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s) {sorted(unknown)}; expected some of {FIELDS}")
+    if any(weight < 0 for weight in weights.values()) or not any(weights.values()):
+        raise ValueError("Field weights must be non-negative with at least one above zero")
+    return weights
+
+
+class FieldIndex:
+    """(fields, rows, dim) tensor of unit field vectors plus a presence mask"""
+
+    def __init__(self, ids: List[str], tensor: np.ndarray, present: np.ndarray):
+        self.ids = ids
+        self.tensor = tensor    # (len(FIELDS), n, dim) float32, zero rows for missing fields
+        self.present = present  # (len(FIELDS), n) bool
+
+    @classmethod
+    def build(cls, ids: List[str], records: List[Dict[str, Any]],
+              encode: Callable[[List[str]], np.ndarray], dim: int) -> "FieldIndex":
+        """Embed every non-empty field of every record, one batched encode per field"""
+        texts = [field_texts(record) for record in records]
+        tensor = np.zeros((len(FIELDS), len(ids), dim), dtype=np.float32)
+        present = np.zeros((len(FIELDS), len(ids)), dtype=bool)
+        for f, field in enumerate(FIELDS):
+            rows = [row for row, record_texts in enumerate(texts) if record_texts[field]]
+            if rows:
+                vectors = encode([texts[row][field] for row in rows])
+                tensor[f, rows] = normalize_rows(np.asarray(vectors, dtype=np.float32))
+                present[f, rows] = True
+        return cls(ids, tensor, present)
+
+    def search(self, query_embedding: np.ndarray, k: int, weights: Dict[str, float],
+               mask: Optional[np.ndarray] = None) -> List[tuple]:
+        """Top-k (row, combined similarity, {field: similarity}) by weighted field similarity"""
+        w = np.array([weights.get(field, 0.0) for field in FIELDS], dtype=np.float32)
+        active = np.flatnonzero(w)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        # One pass over the active fields: (fields, rows)
+        similarities = np.einsum("fnd,d->fn", self.tensor[active], query)
+        effective = self.present[active] * w[active, None]
+        total_weight = effective.sum(axis=0)
+        combined = (effective * similarities).sum(axis=0) / np.where(total_weight > 0, total_weight, 1.0)
+        # Showcases without any weighted field cannot match
+        eligible = total_weight > 0
+        if mask is not None:
+            eligible &= mask
+
+        rows = np.flatnonzero(eligible)
+        k = min(k, len(rows))
+        if k <= 0:
+            return []
+        scores = combined[rows]
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        hits = []
+        for row in rows[top]:
+            per_field = {
+                FIELDS[f]: round(float(similarities[i, row]), 4)
+                for i, f in enumerate(active) if self.present[f, row]
+            }
+            hits.append((int(row), float(combined[row]), per_field))
+        return hits
@@ -0,0 +1,192 @@
+"""
+Deployable index artifacts
+
+build_index.py builds the current catalog offline into one self-contained
+directory, and the API serves it at startup (INDEX_ARTIFACT=<dir>) without
+embedding or indexing anything. A deploy is then a file copy:
+
+    artifacts/pams-<csv sha256[:12]>-<embedding backend>-<vector store>/
+        manifest.json   source CSV sha256, embedding backend and dim, document
+                        count, and the sha256 of every other file
+        PAMS.csv        the CSV the artifact was built from
+        showcases.db    SQLite catalog (typed columns) with its FTS5 index
+        edition.json, snapshot/, neighbours.npz, content_hashes.json
+                        edition state of the current edition (see editions.py)
+        index/          vector index: NumPy directory or Chroma persist directory
+
+The build runs in "<name>.partial" and is renamed into place once validated.
+Embeddings go into the snapshot chunk by chunk with a checkpoint after each,
+so an interrupted build resumes where it stopped.
+
+Artifacts are served read-only. Chroma rewrites its own files when a
+collection is opened, so a Chroma index/ is checked by document count
+instead of by hash.
+"""
+import os
+import json
+import time
+import shutil
+import logging
+from typing import Any, Dict, Optional
+
+from config import CATALOG_YEAR, VECTOR_BACKEND
+from embedding_backends import EmbeddingBackend, get_embedding_backend
+from ingest import ingest_csv
+from vector_store import RecordCollector, VectorStore, create_vector_store
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+CSV_FILE = "PAMS.csv"
+CATALOG_FILE = "showcases.db"
+INDEX_DIR = "index"
+
+
+def artifact_name(csv_sha256: str, backend: str, vector_store: str) -> str:
+    return f"pams-{csv_sha256[:12]}-{backend}-{vector_store}"
+
+
+def file_hashes(root: str, skip_dirs=()) -> Dict[str, str]:
+    """Relative path -> sha256 of every file under `root`"""
+    from editions import file_sha256
+
+    hashes = {}
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = sorted(d for d in subdirs
+                            if os.path.relpath(os.path.join(directory, d), root) not in skip_dirs)
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            relative = os.path.relpath(path, root).replace(os.sep, "/")
+            if relative != MANIFEST_FILE:
+                hashes[relative] = file_sha256(path)
+    return hashes
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    with open(os.path.join(path, MANIFEST_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def verify_artifact(path: str) -> Dict[str, Any]:
+    """The artifact's manifest; raises RuntimeError if a file is missing or changed"""
+    if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        raise RuntimeError(f"{path} is not an index artifact (no {MANIFEST_FILE})")
+    manifest = read_manifest(path)
+    if manifest.get("format") != ARTIFACT_FORMAT:
+        raise RuntimeError(f"{path}: artifact format {manifest.get('format')}, expected {ARTIFACT_FORMAT}")
+
+    skip = () if manifest["vector_store"] == "numpy" else (INDEX_DIR,)
+    actual = file_hashes(path, skip_dirs=skip)
+    missing = sorted(set(manifest["files"]) - set(actual))
+    changed = sorted(name for name, digest in manifest["files"].items()
+                     if name in actual and actual[name] != digest)
+    if missing or changed:
+        raise RuntimeError(f"{path} does not match its manifest "
+                           f"(missing: {missing[:5]}, changed: {changed[:5]})")
+    return manifest
+
+
+def open_store(path: str, embedding_backend: EmbeddingBackend = None,
+               manifest: Optional[Dict[str, Any]] = None) -> VectorStore:
+    """The artifact's vector index, opened read-only"""
+    manifest = manifest or read_manifest(path)
+    embedding_backend = embedding_backend or get_embedding_backend()
+    if embedding_backend.name != manifest["backend"]:
+        raise RuntimeError(f"{path} was embedded with {manifest['backend']}, "
+                           f"but the embedding backend is {embedding_backend.name}")
+    store = create_vector_store(manifest["vector_store"], embedding_backend,
+                                read_only=True, path=os.path.join(path, INDEX_DIR))
+    if store.count() != manifest["count"]:
+        raise RuntimeError(f"{path}: index holds {store.count()} documents, "
+                           f"manifest says {manifest['count']}")
+    return store
+
+
+def build_artifact(csv_path: str, out_dir: str, vector_store: str = None,
+                   backend: str = None, workers: int = 1, chunk_size: int = 64,
+                   name: Optional[str] = None) -> str:
+    """Build (or resume building) the artifact for `csv_path`; returns its directory"""
+    from database import Database
+    from editions import Edition, file_sha256
+    from embedding_snapshot import EmbeddingSnapshot
+
+    embedding_backend = get_embedding_backend(backend)
+    csv_sha256 = file_sha256(csv_path)
+    vector_store = (vector_store or VECTOR_BACKEND).lower()
+
+    name = name or artifact_name(csv_sha256, embedding_backend.name, vector_store)
+    final_path = os.path.join(out_dir, name)
+    if os.path.exists(os.path.join(final_path, MANIFEST_FILE)):
+        verify_artifact(final_path)
+        logger.info(f"{final_path} is already built")
+        return final_path
+
+    work_path = final_path + ".partial"
+    os.makedirs(work_path, exist_ok=True)
+    work_csv = os.path.join(work_path, CSV_FILE)
+    if not os.path.exists(work_csv) or file_sha256(work_csv) != csv_sha256:
+        shutil.copyfile(csv_path, work_csv)
+
+    # A half-built index/ from an interrupted run is reset when it is loaded
+    store = create_vector_store(vector_store, embedding_backend, path=os.path.join(work_path, INDEX_DIR))
+
+    # 1. One pass over the CSV: the SQLite catalog (typed columns, FTS5 index),
+    # exactly as the API builds it, and the documents to embed
+    logger.info("Building the SQLite catalog...")
+    catalog_path = os.path.join(work_path, CATALOG_FILE)
+    if os.path.exists(catalog_path):
+        os.remove(catalog_path)
+    catalog = Database(catalog_path)
+    records = RecordCollector(store)
+    ingest_csv(work_csv, catalog.catalog_writer(work_csv), records)
+    # Documents are indexed under the ids the catalog gave their rows
+    changes = catalog.last_changes
+    ids, documents = changes.doc_ids, records.documents
+
+    # 2. Embeddings, checkpointed per chunk (the only expensive, resumable step)
+    snapshot_path = os.path.join(work_path, "snapshot")
+    if workers > 1:
+        from embedding_pool import encode_catalog
+        encode_catalog(documents, ids, snapshot_path, backend=embedding_backend.name,
+                       workers=workers, chunk_size=chunk_size, dim=embedding_backend.dim)
+    else:
+        snapshot = EmbeddingSnapshot.create_or_resume(snapshot_path, ids, embedding_backend.dim,
+                                                      chunk_size, embedding_backend.name)
+        pending = snapshot.pending_chunks()
+        for done, chunk in enumerate(pending, 1):
+            texts = documents[chunk * chunk_size:(chunk + 1) * chunk_size]
+            snapshot.write_chunk(chunk, embedding_backend.encode(texts))
+            logger.info(f"Embedded chunk {chunk} ({done}/{len(pending)})")
+
+    # 3. Vector index and neighbour table from the snapshot. Edition.load()
+    # reuses a complete snapshot recorded against this CSV and backend
+    edition = Edition(str(CATALOG_YEAR), work_csv, store, work_path)
+    edition.manifest = {"csv_sha256": csv_sha256, "backend": embedding_backend.name}
+    edition.load(changes=changes)
+    problems = edition.store.validate(len(ids))
+    if problems:
+        raise RuntimeError(f"Artifact failed validation: {'; '.join(problems)}")
+    # Edition state must not point at the build directory
+    edition.manifest["csv_path"] = CSV_FILE
+    with open(os.path.join(work_path, "edition.json"), "w", encoding="utf-8") as f:
+        json.dump(edition.manifest, f, ensure_ascii=False, indent=2)
+
+    # 4. Manifest last: its presence marks a complete artifact
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "name": name,
+        "created_at": time.time(),
+        "csv_sha256": csv_sha256,
+        "backend": embedding_backend.name,
+        "dim": embedding_backend.dim,
+        "vector_store": vector_store,
+        "count": edition.store.count(),
+        "files": file_hashes(work_path, skip_dirs=() if vector_store == "numpy" else (INDEX_DIR,))
+    }
+    with open(os.path.join(work_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(final_path, ignore_errors=True)
+    os.replace(work_path, final_path)
+    logger.info(f"Built {final_path} ({manifest['count']} documents)")
+    return final_path
@@ -0,0 +1,102 @@
+"""
+Versioned vector indexes behind an alias
+
+A reload never rebuilds the index that is serving. Each build goes into a new
+version of the index (Chroma collection "pams_showcases__v3", NumPy directory
+"vector_index.v3"). The build is validated, then published by flipping the
+alias pointer, a small JSON file naming the alias's current version. Stores open
+the version their pointer names, so a restart picks up the last published build;
+without a pointer the alias name itself is the index (indexes built before
+versioning).
+
+A published-over version is retired with a timestamp. gc() drops it once it is
+older than the grace period, which bounds how long searches that started on the
+old version may keep using it. A version still marked "building" when the next
+build starts belongs to a build that died, and is dropped right away.
+
+The pointer file is re-read for every operation and replaced atomically, so
+several store objects (live and building) can share it.
+
+    {"alias": "pams_showcases", "current": "pams_showcases__v3", "next_version": 4,
+     "building": null, "retired": [{"name": "pams_showcases__v2", "retired_at": 1760000000.0}]}
+"""
+import os
+import json
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_lock = threading.Lock()
+
+
+class VersionPointer:
+    """Alias -> current version, plus the versions being built and retired"""
+
+    def __init__(self, path: str, alias: str):
+        self.path = path
+        self.alias = alias
+
+    def _read(self) -> Dict[str, Any]:
+        if not os.path.exists(self.path):
+            return {"alias": self.alias, "current": None, "next_version": 1,
+                    "building": None, "retired": []}
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, state: Dict[str, Any]):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def current(self) -> Optional[str]:
+        return self._read()["current"]
+
+    def state(self) -> Dict[str, Any]:
+        return self._read()
+
+    def begin(self, name_for: Callable[[int], str]) -> Tuple[str, Optional[str]]:
+        """(name of a new version to build, abandoned build to drop or None)"""
+        with _lock:
+            state = self._read()
+            abandoned = state["building"]
+            name = name_for(state["next_version"])
+            state["next_version"] += 1
+            state["building"] = name
+            self._write(state)
+        return name, abandoned
+
+    def publish(self, name: str, previous: Optional[str]):
+        """Make `name` current; `previous` (the version it replaces) is retired"""
+        with _lock:
+            state = self._read()
+            if previous and previous != name:
+                state["retired"].append({"name": previous, "retired_at": time.time()})
+            state["current"] = name
+            if state["building"] == name:
+                state["building"] = None
+            self._write(state)
+
+    def abandon(self, name: str):
+        with _lock:
+            state = self._read()
+            if state["building"] == name:
+                state["building"] = None
+                self._write(state)
+
+    def expired(self, grace_s: float) -> List[str]:
+        """Retired versions older than the grace period"""
+        cutoff = time.time() - grace_s
+        state = self._read()
+        return [entry["name"] for entry in state["retired"]
+                if entry["retired_at"] <= cutoff and entry["name"] != state["current"]]
+
+    def forget(self, names: List[str]):
+        if not names:
+            return
+        with _lock:
+            state = self._read()
+            state["retired"] = [entry for entry in state["retired"] if entry["name"] not in names]
+            self._write(state)
@@ -0,0 +1,260 @@
+"""
+Ingest normalisation shared by the SQLite catalog and the vector stores
+
+PAMS.csv is free text: durations look like "60min" or "\\t90min", tour sizes
+carry stray non-breaking spaces, genres are comma strings and schedule dates
+come as either "14-Oct" or "2025.10.21 / 2025.10.22". normalize_record() parses
+one raw CSV row into typed fields once, at load time, so matching, filtering and
+scoring never re-parse strings per request:
+
+- duration_min                      integer minutes
+- genre_tags                        display tags ("Showcase", "Dance")
+- genre_<slug>                      one boolean per canonical genre (plus any extra tag)
+- venue_id, venue_capacity          resolved from the venue registry below
+- tour_size, performers_count, staff_count   integers
+- schedule_dates                    ISO dates ("2025-10-14")
+
+ingest_csv() is the single pass over the CSV: rows are parsed INGEST_CHUNK_ROWS
+at a time with the csv module and every chunk is handed to each sink (the
+SQLite catalog writer, a vector store indexer) before the next one is read, so
+memory is bounded by the chunk size rather than the catalog size.
+
+natural_key() and content_hash() identify a row across imports, so a catalog
+reload writes (and re-embeds) only the rows that were added or edited.
+"""
+import re
+import csv
+import json
+import hashlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import CATALOG_YEAR, INGEST_CHUNK_ROWS
+
+GENRE_PREFIX = "genre_"
+
+# Genre tags used across the catalog, as slugs
+CANONICAL_GENRES = [
+    "showcase", "full_performance", "music", "dance", "theater", "multidisciplinary_others"
+]
+
+# PAMS venue name -> seating capacity
+VENUE_CAPACITIES = {
+    "Daloreum Theater, National Theater of Korea": 450,
+    "Haneul Round Theater, National Theater of Korea": 627,
+    "Seoul Namsan Gugakdang": 300,
+    "Daehakro Arts Theater-Main Hall": 600,
+    "Arko Arts Theater-Small Hall": 150,
+    "SFAC Theater QUAD": 200,
+    "Lee O‑young Art Theater": 250,
+    "TINC(This Is Not a Church)": 100,
+    "Daehakro Arts Theater Small Theater": 150
+}
+DEFAULT_VENUE_CAPACITY = 300
+
+_SLUG_RE = re.compile(r"[^0-9a-z]+")
+_INT_RE = re.compile(r"\d+")
+_HOURS_RE = re.compile(r"(\d+)\s*h", re.IGNORECASE)
+_MINUTES_RE = re.compile(r"(\d+)\s*m", re.IGNORECASE)
+_ISO_DATE_RE = re.compile(r"(\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})")
+_DAY_MONTH_RE = re.compile(r"(\d{1,2})-([A-Za-z]{3})")
+
+
+def slug(value: Any) -> str:
+    return _SLUG_RE.sub("_", str(value).lower()).strip("_")
+
+
+def clean_text(value: Any) -> Optional[str]:
+    """Stripped text, or None for missing values (None, NaN, "", "-")"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text or text.lower() == "nan" or text == "-":
+        return None
+    return text
+
+
+def parse_int(value: Any) -> Optional[int]:
+    """First integer in a free-text value ("15", "6\\xa0", 7.0)"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    text = clean_text(value)
+    match = _INT_RE.search(text) if text else None
+    return int(match.group()) if match else None
+
+
+def parse_duration_minutes(value: Any) -> Optional[int]:
+    """Duration in minutes from "60min", "\\t90min", "1h 30min" or a bare number"""
+    text = clean_text(value)
+    if not text:
+        return None
+    hours = _HOURS_RE.search(text)
+    minutes = _MINUTES_RE.search(text)
+    if hours or minutes:
+        return (int(hours.group(1)) * 60 if hours else 0) + (int(minutes.group(1)) if minutes else 0)
+    return parse_int(text)
+
+
+def parse_genre_tags(value: Any) -> List[str]:
+    text = clean_text(value)
+    if not text:
+        return []
+    return [tag.strip() for tag in text.split(",") if tag.strip()]
+
+
+def genre_flags(tags: List[str]) -> Dict[str, bool]:
+    """genre_<slug> booleans: every canonical genre, plus any tag outside that list"""
+    present = {slug(tag) for tag in tags}
+    flags = {GENRE_PREFIX + genre: genre in present for genre in CANONICAL_GENRES}
+    for genre in present - set(CANONICAL_GENRES):
+        flags[GENRE_PREFIX + genre] = True
+    return flags
+
+
+def venue_id(name: Any) -> Optional[str]:
+    text = clean_text(name)
+    return slug(text) if text else None
+
+
+_CAPACITY_BY_ID = {venue_id(name): capacity for name, capacity in VENUE_CAPACITIES.items()}
+
+
+def venue_capacity(name: Any) -> int:
+    return _CAPACITY_BY_ID.get(venue_id(name), DEFAULT_VENUE_CAPACITY)
+
+
+def parse_schedule_dates(value: Any, year: int = CATALOG_YEAR) -> List[str]:
+    """ISO dates from "2025.10.21 / 2025.10.22" or "14-Oct" (year from the catalog)"""
+    text = clean_text(value)
+    if not text:
+        return []
+    dates = []
+    for y, m, d in _ISO_DATE_RE.findall(text):
+        try:
+            dates.append(date(int(y), int(m), int(d)).isoformat())
+        except ValueError:
+            continue
+    if not dates:
+        for d, month in _DAY_MONTH_RE.findall(text):
+            try:
+                dates.append(datetime.strptime(f"{year}-{month}-{d}", "%Y-%b-%d").date().isoformat())
+            except ValueError:
+                continue
+    return dates
+
+
+def normalize_record(row, year: int = CATALOG_YEAR) -> Dict[str, Any]:
+    """Typed fields for one raw PAMS.csv row (dict or pandas Series, CSV column names)
+
+    `year` completes schedule dates written without one (the festival edition).
+    """
+    tags = parse_genre_tags(row.get("Genre"))
+    venue = clean_text(row.get("PAMS Venue"))
+    fields: Dict[str, Any] = {
+        "duration_min": parse_duration_minutes(row.get("Duration(Full-length)")),
+        "genre_tags": tags,
+        "venue_id": venue_id(venue),
+        "venue_capacity": venue_capacity(venue) if venue else None,
+        "tour_size": parse_int(row.get("Tour Size")),
+        "performers_count": parse_int(row.get("Performers_Count")),
+        "staff_count": parse_int(row.get("Staff_Count")),
+        "schedule_dates": parse_schedule_dates(row.get("Schedule_Date"), year)
+    }
+    fields.update(genre_flags(tags))
+    return fields
+
+
+def to_sql_row(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Typed fields as SQLite column values (lists comma-joined, booleans as 0/1)"""
+    row = {}
+    for key, value in fields.items():
+        if isinstance(value, list):
+            value = ",".join(value) if value else None
+        elif isinstance(value, bool):
+            value = int(value)
+        row[key] = value
+    return row
+
+
+def split_list(value: Optional[str]) -> List[str]:
+    """Inverse of the comma-joining in to_sql_row / to_metadata"""
+    return value.split(",") if value else []
+
+
+def to_metadata(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten typed fields into scalar metadata (no None, no lists) for vector stores"""
+    metadata = {}
+    for key, value in fields.items():
+        if value is None:
+            continue
+        if key == "schedule_dates":
+            if value:
+                metadata["first_date"] = value[0]
+                metadata["last_date"] = value[-1]
+            continue
+        if isinstance(value, list):
+            value = ",".join(value)
+        metadata[key] = value
+    return metadata
+
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def natural_key(row) -> str:
+    """Stable identity of a raw CSV row across imports: title and artist, case and spacing folded"""
+    parts = [_SPACE_RE.sub(" ", clean_text(row.get(column)) or "").casefold()
+             for column in ("Title", "Artist")]
+    return "\x1f".join(parts)
+
+
+def content_hash(row) -> str:
+    """sha256 of a raw CSV row; equal hashes mean nothing derived from the row can differ"""
+    payload = json.dumps(row, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Cells read as missing, the same strings pandas.read_csv treats as NaN
+MISSING_VALUES = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+])
+
+
+def read_csv_chunks(csv_path: str, chunk_rows: int = INGEST_CHUNK_ROWS) -> Iterator[List[Dict[str, Optional[str]]]]:
+    """Raw CSV rows (column name -> text, None when missing), `chunk_rows` at a time"""
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        chunk = []
+        for values in reader:
+            chunk.append({
+                column: None if value in MISSING_VALUES else value
+                for column, value in zip(columns, values)
+            })
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def ingest_csv(csv_path: str, *sinks, chunk_rows: int = INGEST_CHUNK_ROWS) -> int:
+    """Parse `csv_path` once, handing each chunk of rows to every sink; returns the row count
+
+    A sink has add(first_row, rows), where first_row is the 0-based CSV row of
+    rows[0], finish() after the last chunk, and abort() if the pass fails.
+    """
+    count = 0
+    try:
+        for rows in read_csv_chunks(csv_path, chunk_rows):
+            for sink in sinks:
+                sink.add(count, rows)
+            count += len(rows)
+    except BaseException:
+        for sink in sinks:
+            sink.abort()
+        raise
+    for sink in sinks:
+        sink.finish()
+    return count
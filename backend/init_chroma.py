@@ -6,7 +6,10 @@ Run this script once to set up the vector database
 
 import os
 import sys
-from chroma_store import ChromaVectorStore
+import argparse
+from database import Database
+from vector_store import create_vector_store
+from embedding_backends import get_embedding_backend
 import logging
 
 logging.basicConfig(
@@ -15,8 +18,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Initialize Chroma DB with PAMS data")
+    parser.add_argument("--store", default=None, choices=["chroma", "numpy"],
+                        help="Vector index to populate (defaults to VECTOR_BACKEND)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Embedding worker processes (each pinned to a share of the cores)")
+    parser.add_argument("--backend", default=None,
+                        help="Embedding backend for the workers (defaults to EMBEDDING_BACKEND)")
+    parser.add_argument("--snapshot-dir", default="./embedding_snapshot",
+                        help="Where parallel runs write vectors and their resume checkpoint")
+    parser.add_argument("--chunk-size", type=int, default=64)
+    return parser.parse_args()
+
 def main():
     """Initialize Chroma DB with PAMS data"""
+    args = parse_args()
     
     # Check if PAMS.csv exists
     csv_path = "PAMS.csv"
@@ -26,12 +43,27 @@ def main():
         sys.exit(1)
     
     # Initialize vector store
-    logger.info("Initializing Chroma vector store...")
-    store = ChromaVectorStore(persist_directory="./chroma_db")
+    logger.info("Initializing vector store...")
+    store = create_vector_store(
+        args.store,
+        embedding_backend=get_embedding_backend(args.backend)
+    )
+    
+    # Catalog first: documents are indexed under the ids it gives the CSV rows
+    doc_ids = Database().load_from_csv(csv_path).doc_ids
     
     # Load PAMS data
     logger.info("Loading PAMS data into vector store...")
-    store.load_pams_data(csv_path)
+    embeddings = None
+    if args.workers > 1:
+        from embedding_pool import encode_catalog
+        ids, documents, _ = store.prepare_pams_records(csv_path, doc_ids)
+        snapshot = encode_catalog(
+            documents, ids, args.snapshot_dir,
+            backend=args.backend, workers=args.workers, chunk_size=args.chunk_size
+        )
+        embeddings = snapshot.vectors
+    store.load_pams_data(csv_path, embeddings=embeddings, doc_ids=doc_ids)
     
     # Test the store with a sample query
     logger.info("\n=== Testing vector store with sample queries ===")
@@ -60,9 +92,9 @@ def main():
                 f"(similarity: {similarity:.3f})"
             )
     
-    logger.info("\n=== Chroma vector store initialization complete ===")
-    logger.info(f"Database location: ./chroma_db")
-    logger.info(f"Total documents: {store.collection.count()}")
+    logger.info(f"\n=== {store.backend_name} vector store initialization complete ===")
+    logger.info(f"Database location: {store.persist_directory}")
+    logger.info(f"Total documents: {store.count()}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
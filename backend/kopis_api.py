@@ -1,4 +1,3 @@
-import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from typing import Dict, Optional
@@ -18,6 +17,7 @@ class KOPISClient:
         Returns:
             Dict[str, float]: 장르별 지수 (0.0 ~ 1.0)
         """
+        import requests
         # 날짜 계산 (최대 31일)
         end_date = datetime.now()
         start_date = end_date - timedelta(days=min(days_back, 31))
@@ -1,46 +1,199 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from typing import List, Generator
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Any, Dict, List, Generator, Literal, Optional, Tuple, Union
+from pydantic import BaseModel, Field
 import os
 import shutil
 import json
-import requests
 import time
+import threading
 from contextlib import asynccontextmanager
 import xml.etree.ElementTree as ET
 
 from models import (
-    Showcase, BookerProfile, MatchingRequest,
-    SimilarityRequest, MatchingResult, VenueFitScore
+    Showcase, ShowcaseSummary, ShowcaseView, ShowcasePage, BookerProfile, MatchingRequest,
+    SimilarityRequest, MatchingResult, MatchingSummary, MatchingView, VenueFitScore
 )
 from database import Database
 from matching import MatchingService
-from chroma_store import ChromaVectorStore
+from vector_store import create_vector_store
+from editions import EditionRegistry
 from kopis_api import get_current_genre_indices
+from autocomplete import AutocompleteIndex
+from reranker import get_rerank_stage
+from readiness import Readiness, LOADING
+from degraded_search import DegradedSearch, DEGRADED_HEADER
+from workers import WorkerRole
+from projection import (SUMMARY, SHOWCASE_FIELDS, SEARCH_RESULT_FIELDS, SEARCH_SUMMARY_FIELDS,
+                        parse_fields, project, model_json)
+from pagination import NDJSON_MEDIA_TYPE, decode_cursor, next_cursor, ndjson_lines
+from editions import file_sha256
+from config import (STARTUP_BACKGROUND_INDEX, INDEX_VERSION_GRACE_S, WORKER_POLL_S, INDEX_ARTIFACT,
+                    SHOWCASE_PAGE_LIMIT, SHOWCASE_PAGE_MAX_LIMIT, EXPORT_BATCH_ROWS)
+
+# Startup stages reported by /ready
+readiness = Readiness("catalog", "vector_index")
+
+# Leader / follower role of this process under `uvicorn --workers N`
+role = WorkerRole()
+_watcher = None
+
+def build_vector_index():
+    """Startup stage 2: per-edition vector stores (runs in a background thread)"""
+    global chroma_store, editions
+    readiness.loading("vector_index")
+    try:
+        # One vector store per festival edition (Chroma or in-memory NumPy, see
+        # VECTOR_BACKEND); the current edition serves the single-catalog endpoints
+        print("Initializing vector stores...")
+        registry = EditionRegistry.from_config()
+
+        # Until the index is up, degraded search can use the last snapshot's vectors
+        if registry.current in registry.editions:
+            current = registry.get(registry.current)
+            snapshot = current.current_snapshot()
+            if snapshot is not None:
+                degraded.use_snapshot(snapshot, current.store.embedding_backend)
+
+        # Rebuilt from each edition's embedding snapshot; the current edition
+        # re-embeds only the rows the catalog import changed
+        print("Reloading edition vector stores for correct ID mapping...")
+        registry.load_all(changes=db.last_changes)
+        store = registry.current_store
+        if store is None:
+            print("Warning: current edition missing from EDITIONS, indexing PAMS.csv directly")
+            store = create_vector_store()
+            store.load_pams_data("PAMS.csv", doc_ids=catalog_doc_ids())
+
+        # Vector endpoints answer 503 until both are published
+        editions = registry
+        chroma_store = store
+        print(f"Vector store reloaded with {chroma_store.count()} documents "
+              f"({len(editions.editions)} edition(s))")
+        readiness.ready("vector_index")
+        role.bump("index_generation", index_ready=True, version=chroma_store.version,
+                  document_count=chroma_store.count())
+    except Exception as e:
+        print(f"Vector index failed to load: {e}")
+        readiness.failed("vector_index", str(e))
+        return
+    # Versions retired before the last shutdown; a failure here leaves the index serving
+    try:
+        editions.gc_versions()
+    except Exception as e:
+        print(f"Dropping retired index versions failed: {e}")
+
+def open_vector_index(read_only: bool = True):
+    """Serve the index versions the leader published, without building anything"""
+    global chroma_store, editions
+    registry = EditionRegistry.from_config(read_only=read_only)
+    registry.open_all()
+    store = registry.current_store or create_vector_store(read_only=read_only)
+    editions = registry
+    chroma_store = store
+    print(f"Worker {os.getpid()} serving index {chroma_store.version} ({chroma_store.count()} documents)")
+    readiness.ready("vector_index")
+
+def catalog_sha256() -> str:
+    """sha256 of the CSV behind the catalog being served"""
+    if INDEX_ARTIFACT:
+        from index_artifact import read_manifest
+        return read_manifest(INDEX_ARTIFACT)["csv_sha256"]
+    return file_sha256("PAMS.csv")
+
+def catalog_doc_ids():
+    """Vector ids of the PAMS.csv rows as the catalog numbered them (None: CSV row + 1)"""
+    changes = db.last_changes
+    return changes.doc_ids if changes is not None and changes.applies_to("PAMS.csv") else None
+
+def load_catalog():
+    """Startup stage 1: the SQLite catalog, needed by the catalog endpoints"""
+    readiness.loading("catalog")
+    if INDEX_ARTIFACT:
+        from index_artifact import CATALOG_FILE, verify_artifact
+        # Refuses to start on an artifact that was modified or copied incompletely
+        manifest = verify_artifact(INDEX_ARTIFACT)
+        print(f"Loading the catalog of index artifact {manifest['name']}...")
+        db.load_from_sqlite(os.path.join(INDEX_ARTIFACT, CATALOG_FILE))
+    else:
+        print("Loading PAMS.csv into database...")
+        changes = db.load_from_csv("PAMS.csv")
+        print(f"Catalog import: {changes.summary()}")
+    print("Data loaded successfully!")
+    role.bump("catalog_generation", catalog_sha256=catalog_sha256())
+    readiness.ready("catalog")
+
+def lead():
+    """Leader startup: the catalog, then the vector indexes"""
+    # Followers wait for this leader's catalog and index, not the last run's
+    role.update_generation(catalog_sha256=None, index_ready=False)
+    load_catalog()
+
+    # Stage 2 (embeddings, vector indexes) must not hold up the server
+    if STARTUP_BACKGROUND_INDEX:
+        threading.Thread(target=build_vector_index, name="vector-index", daemon=True).start()
+    else:
+        build_vector_index()
+
+def take_over_leadership():
+    """A follower whose leader died: reuse what it published, rebuild what it did not"""
+    print(f"Worker {os.getpid()} takes over as leader")
+    # Followers go on serving what the dead leader published
+    state = role.update_generation()
+    if state.get("catalog_sha256") != catalog_sha256():
+        load_catalog()
+    if state.get("index_ready"):
+        # Writable stores on the published versions, so reloads work from here
+        open_vector_index(read_only=False)
+    else:
+        build_vector_index()
+
+def watch_workers():
+    """Leader: serve reload requests from followers. Follower: track the leader's generations"""
+    seen_catalog = seen_index = None
+    while True:
+        if not role.is_leader and role.try_lead():
+            take_over_leadership()
+        if role.is_leader:
+            # Same guards as /api/chroma/reload; a request that cannot run yet
+            # stays in place for the next poll instead of being dropped
+            if (role.has_reload_request() and readiness.status("vector_index") != LOADING
+                    and reload_lock.acquire(blocking=False)):
+                role.take_reload_request()
+                run_reload()
+        else:
+            state = role.leader_generation()
+            if state.get("catalog_sha256") and state.get("catalog_generation") != seen_catalog:
+                # Catalog snapshots and autocomplete rebuild when the generation moves
+                db.generation = seen_catalog = state["catalog_generation"]
+                readiness.ready("catalog")
+            if state.get("index_ready") and state.get("index_generation") != seen_index:
+                try:
+                    open_vector_index()
+                    seen_index = state["index_generation"]
+                except Exception as e:
+                    # The leader may be mid-way through the next reload; retry on the next poll
+                    print(f"Could not open the published index yet: {e}")
+        time.sleep(WORKER_POLL_S)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    global chroma_store
-
-    if os.path.exists("PAMS.csv"):
-        print("Loading PAMS.csv into database...")
-        db.load_from_csv("PAMS.csv")
-        print("Data loaded successfully!")
-
-        # Initialize Chroma vector store
-        print("Initializing Chroma vector store...")
-        chroma_store = ChromaVectorStore(persist_directory="./chroma_db")
-
-        # Reset and reload vector store to ensure correct ID mapping
-        print("Resetting and reloading Chroma vector store for correct ID mapping...")
-        chroma_store.reset_collection()
-        chroma_store.load_pams_data("PAMS.csv")
-        print(f"Vector store reloaded with {chroma_store.collection.count()} documents")
+    global _watcher
+    if INDEX_ARTIFACT or os.path.exists("PAMS.csv"):
+        # Only one worker builds; the others serve what it publishes (see workers.py)
+        if role.try_lead():
+            lead()
+        else:
+            print(f"Worker {os.getpid()} follows the leader worker")
+            readiness.loading("catalog")
+        if _watcher is None:
+            _watcher = threading.Thread(target=watch_workers, name="workers", daemon=True)
+            _watcher.start()
     else:
         print("Warning: PAMS.csv not found")
+        readiness.failed("catalog", "PAMS.csv not found")
+        readiness.failed("vector_index", "PAMS.csv not found")
 
     yield
     # Shutdown
@@ -55,12 +208,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[DEGRADED_HEADER],
 )
 
 # Initialize services
 db = Database()
 matching_service = MatchingService()
 chroma_store = None  # Will be initialized on startup
+editions = None  # Per-edition vector stores, initialized on startup
+autocomplete_index = None  # Built from the catalog snapshot on first use
+degraded = DegradedSearch(db)  # Serves vector endpoints while the index is warming up
+reload_lock = threading.Lock()
+reload_status = {"status": "idle", "started_at": None, "finished_at": None, "error": None}
 
 # Copy PAMS.csv to backend directory if not exists
 if not os.path.exists("PAMS.csv"):
@@ -74,32 +233,132 @@ if not os.path.exists("PAMS.csv"):
 def read_root():
     return {"message": "Sootreaming PoC API is running"}
 
-@app.get("/api/showcases", response_model=List[Showcase])
-def get_all_showcases():
-    """Get all showcases"""
-    return db.get_all_showcases()
+@app.get("/ready")
+def ready():
+    """Per-subsystem startup readiness (503 until every subsystem is ready)"""
+    state = readiness.to_dict()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+def get_search_store(response: Response):
+    """The vector store, or degraded search (flagged in a response header) until it is up"""
+    if chroma_store:
+        return chroma_store
+    if not readiness.is_ready("catalog"):
+        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    response.headers[DEGRADED_HEADER] = degraded.mode
+    return degraded
 
-@app.get("/api/showcases/{showcase_id}", response_model=Showcase)
-def get_showcase(showcase_id: int):
-    """Get a specific showcase by ID"""
-    showcase = db.get_showcase_by_id(showcase_id)
-    if not showcase:
+def requested_fields(fields: Optional[str], allowed: List[str] = SHOWCASE_FIELDS,
+                     summary: Optional[List[str]] = None) -> Optional[List[str]]:
+    try:
+        return parse_fields(fields, allowed, summary)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def showcase_shape(fields: Optional[str]) -> Tuple[Optional[List[str]], Any, Any]:
+    """`fields=` -> (projected field names, model to decode, type of each item)"""
+    if fields == SUMMARY:
+        return None, ShowcaseSummary, ShowcaseSummary
+    names = requested_fields(fields)
+    if names is None:
+        return None, Showcase, Showcase
+    return names, None, Dict[str, Any]
+
+def load_showcases(showcase_ids: List[int], fields: Optional[str]) -> Tuple[Dict[int, Any], Any]:
+    """id -> showcase shaped by `fields=` (full, summary or projected), and its type"""
+    names, model, kind = showcase_shape(fields)
+    return db.get_showcases_by_ids(showcase_ids, fields=names, model=model), kind
+
+def matching_response(hits: List[Tuple[int, float]], matching_factors: List[str],
+                      fields: Optional[str], limit: Optional[int] = None):
+    """Matching results for (showcase id, similarity) hits, showcases loaded in one query
+
+    Full results are returned as models for FastAPI to validate against the
+    route's response_model; summaries and projections are serialised directly.
+    """
+    showcases, kind = load_showcases([showcase_id for showcase_id, _ in hits], fields)
+    model = {Showcase: MatchingResult, ShowcaseSummary: MatchingSummary}.get(kind)
+    results = []
+    for showcase_id, similarity_score in hits:
+        showcase = showcases.get(showcase_id)
+        if showcase is None:
+            continue
+        if model:
+            results.append(model(showcase=showcase, similarity_score=similarity_score,
+                                 matching_factors=matching_factors))
+        else:
+            results.append({"showcase": showcase, "similarity_score": similarity_score,
+                            "venue_fit_score": None, "matching_factors": matching_factors})
+    results = results[:limit] if limit is not None else results
+    if model is MatchingResult:
+        return results
+    return model_json(results, List[model] if model else List[Dict[str, Any]])
+
+@app.get("/api/showcases", response_model=Union[List[ShowcaseView], ShowcasePage],
+         responses={200: {"content": {NDJSON_MEDIA_TYPE: {}},
+                          "description": "Showcases, a ShowcasePage, or NDJSON (format=ndjson)"}})
+def get_all_showcases(fields: Optional[str] = None, limit: Optional[int] = None,
+                      cursor: Optional[str] = None, format: Literal["json", "ndjson"] = "json"):
+    """Get all showcases
+
+    `fields=summary` returns ShowcaseSummary card views, `fields=id,title,...`
+    only the listed fields; only those columns are read (see projection.py).
+    With `limit` or `cursor` the catalog is served a page at a time as a
+    ShowcasePage; `format=ndjson` streams every showcase after `cursor` as one
+    JSON line each (see pagination.py). Full showcases go through the
+    response_model; summaries and projections are serialised directly.
+    """
+    names, model, kind = showcase_shape(fields)
+    try:
+        after_id = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format == "json" and limit is None and cursor is None:
+        items = db.get_showcase_rows(fields=names, model=model)
+        return items if kind is Showcase else model_json(items, List[kind])
+
+    # Totals come from the cached catalog snapshot, not a COUNT per page
+    total = len(db.get_catalog_snapshot())
+    if format == "ndjson":
+        pages = db.iter_showcase_pages(after_id, EXPORT_BATCH_ROWS, fields=names, model=model)
+        return StreamingResponse(ndjson_lines(pages, kind), media_type=NDJSON_MEDIA_TYPE,
+                                 headers={"X-Total-Count": str(total)})
+
+    limit = SHOWCASE_PAGE_LIMIT if limit is None else limit
+    if not 1 <= limit <= SHOWCASE_PAGE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {SHOWCASE_PAGE_MAX_LIMIT}")
+    # One row past the page tells whether there is a next one
+    items = db.get_showcase_page(after_id, limit + 1, fields=names, model=model)
+    page = ShowcasePage.model_construct(
+        items=items[:limit], next_cursor=next_cursor(items[:limit], len(items) > limit), total=total
+    )
+    return page if kind is Showcase else model_json(page, ShowcasePage)
+
+@app.get("/api/showcases/{showcase_id}", response_model=ShowcaseView)
+def get_showcase(showcase_id: int, fields: Optional[str] = None):
+    """Get a specific showcase by ID (`fields=` as for /api/showcases)"""
+    showcases, kind = load_showcases([showcase_id], fields)
+    if showcase_id not in showcases:
         raise HTTPException(status_code=404, detail="Showcase not found")
-    return showcase
+    showcase = showcases[showcase_id]
+    return showcase if kind is Showcase else model_json(showcase, kind)
 
 
-@app.post("/api/matching/similar", response_model=List[MatchingResult])
-def find_similar_showcases(request: SimilarityRequest):
-    """Find similar showcases using Chroma vector similarity"""
-    if not chroma_store:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+@app.post("/api/matching/similar", response_model=List[MatchingView])
+def find_similar_showcases(request: SimilarityRequest, response: Response, fields: Optional[str] = None):
+    """Find similar showcases using Chroma vector similarity
+
+    `fields=summary` returns MatchingSummary entries (card views of the
+    showcases), `fields=id,title,...` projects each showcase.
+    """
+    store = get_search_store(response)
 
     target_showcase = db.get_showcase_by_id(request.showcase_id)
     if not target_showcase:
         raise HTTPException(status_code=404, detail="Showcase not found")
 
     # Create query text from target showcase
-    query_text = chroma_store._create_document_text({
+    query_text = store._create_document_text({
         'Title': target_showcase.title,
         'Artist': target_showcase.artist,
         'Genre': target_showcase.genre,
@@ -112,10 +371,10 @@ def find_similar_showcases(request: SimilarityRequest):
     })
 
     # Search for similar showcases
-    results = chroma_store.search_similar(query_text, n_results=request.top_k + 1)
+    results = store.search_similar(query_text, n_results=request.top_k + 1)
 
     # Format results (excluding the target showcase itself)
-    similar = []
+    hits = []
     for i, (id, distance, metadata) in enumerate(zip(
         results["ids"],
         results["distances"],
@@ -126,24 +385,15 @@ def find_similar_showcases(request: SimilarityRequest):
 
         if showcase_id == request.showcase_id:
             continue
+        hits.append((showcase_id, 1 - distance))
 
-        # Get showcase from database
-        showcase = db.get_showcase_by_id(showcase_id)
-        if showcase:
-            similarity_score = 1 - distance
-            similar.append(MatchingResult(
-                showcase=showcase,
-                similarity_score=similarity_score,
-                matching_factors=["BGE-M3 semantic similarity"]
-            ))
-
-    return similar[:request.top_k]
-
-@app.post("/api/matching/recommend", response_model=List[MatchingResult])
-def get_recommendations(request: MatchingRequest):
-    """Get showcase recommendations for a booker profile using Chroma"""
-    if not chroma_store:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    # Showcases from the database, in one query
+    return matching_response(hits, ["BGE-M3 semantic similarity"], fields, limit=request.top_k)
+
+@app.post("/api/matching/recommend", response_model=List[MatchingView])
+def get_recommendations(request: MatchingRequest, response: Response, fields: Optional[str] = None):
+    """Get showcase recommendations for a booker profile using Chroma (`fields=` as for /similar)"""
+    store = get_search_store(response)
     
     # Use the search-by-profile functionality
     profile = request.booker_profile
@@ -159,25 +409,25 @@ def get_recommendations(request: MatchingRequest):
     
     query_text = " | ".join(query_parts) if query_parts else "showcase performance"
     
-    results = chroma_store.search_similar(query_text, n_results=request.top_k)
+    results = store.search(
+        query_text, n_results=request.top_k,
+        mmr_lambda=request.mmr_lambda, rerank_top_n=request.rerank_top_n
+    )
+    matching_factors = ["BGE-M3 semantic similarity", "Profile-based matching"]
+    if results.get("reranked"):
+        matching_factors.append("Cross-encoder re-ranking")
     
     # Format results
-    recommendations = []
+    hits = []
     for i, (id, distance, metadata) in enumerate(zip(
         results["ids"], 
         results["distances"], 
         results["metadatas"]
     )):
         showcase_id = int(id.split('_')[1]) if id.startswith('pams_') else -1
-        showcase = db.get_showcase_by_id(showcase_id)
-        if showcase:
-            recommendations.append(MatchingResult(
-                showcase=showcase,
-                similarity_score=1 - distance,
-                matching_factors=["BGE-M3 semantic similarity", "Profile-based matching"]
-            ))
+        hits.append((showcase_id, 1 - distance))
     
-    return recommendations
+    return matching_response(hits, matching_factors, fields)
 
 @app.get("/api/showcases/{showcase_id}/venue-fit", response_model=VenueFitScore)
 def get_venue_fit_score(showcase_id: int, venue: str = None):
@@ -196,10 +446,8 @@ def get_all_genres():
     genres = set()
     
     for showcase in showcases:
-        if showcase.genre:
-            # Split by comma and clean
-            genre_parts = [g.strip() for g in showcase.genre.split(',')]
-            genres.update(genre_parts)
+        # Split into tags at ingest
+        genres.update(showcase.genre_tags)
     
     return {"genres": sorted(list(genres))}
 
@@ -215,20 +463,58 @@ def get_all_venues():
     
     return {"venues": sorted(list(venues))}
 
+@app.get("/api/search/keyword")
+def keyword_search(q: str, limit: int = 10, snippets: bool = True):
+    """Ranked keyword search over the SQLite FTS5 index (no embedding call)"""
+    start = time.perf_counter()
+    results = db.search_keyword(q, limit=limit, snippets=snippets)
+    return {
+        "query": q,
+        "count": len(results),
+        "took_ms": round((time.perf_counter() - start) * 1000, 3),
+        "results": results
+    }
+
+def get_autocomplete_index() -> AutocompleteIndex:
+    """Prefix index for the current catalog generation, rebuilt after reloads"""
+    global autocomplete_index
+    snapshot = db.get_catalog_snapshot()
+    if autocomplete_index is None or autocomplete_index.generation != snapshot.generation:
+        autocomplete_index = AutocompleteIndex.from_showcases(snapshot.showcases, snapshot.generation)
+    return autocomplete_index
+
+@app.get("/api/autocomplete")
+def autocomplete(q: str, limit: int = 8):
+    """Search-as-you-type completions over titles, artists, genres and venues"""
+    return {
+        "query": q,
+        "suggestions": get_autocomplete_index().complete(q, limit=limit)
+    }
+
 class SearchRequest(BaseModel):
     query: str
     n_results: int = 10
+    # "hybrid" fuses dense BGE-M3 results with lexical matches (exact titles, artists);
+    # "fields" weights per-field vectors, e.g. field_weights={"review": 1.0};
+    # "chunks" pools passages of long documents ("max" or "sum" pooling)
+    mode: Literal["dense", "hybrid", "fields", "chunks"] = "dense"
+    field_weights: Optional[Dict[str, float]] = None
+    pooling: Optional[Literal["max", "sum"]] = None
 
 @app.post("/api/chroma/search")
-def search_chroma(request: SearchRequest):
-    """Search showcases using Chroma vector similarity"""
+def search_chroma(request: SearchRequest, response: Response, fields: Optional[str] = None):
+    """Search showcases using Chroma vector similarity (`fields=` projects each result)"""
     print(f"SIMPLE LOG: API called with query: {request.query}")
+    names = requested_fields(fields, SEARCH_RESULT_FIELDS, SEARCH_SUMMARY_FIELDS)
 
-    if not chroma_store:
-        return {"error": "Vector store not initialized"}
+    store = get_search_store(response)
 
     print("SIMPLE LOG: Starting search...")
-    results = chroma_store.search_similar(request.query, n_results=request.n_results)
+    try:
+        results = store.search(request.query, n_results=request.n_results, mode=request.mode,
+                                      field_weights=request.field_weights, pooling=request.pooling)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     print(f"SIMPLE LOG: Got {len(results.get('ids', []))} results")
 
     simple_results = []
@@ -242,18 +528,28 @@ def search_chroma(request: SearchRequest):
             "title": str(metadata.get("Title", "Unknown")),
             "similarity": round(1 - distance, 3)
         })
+        if "field_scores" in results:
+            simple_results[-1]["field_scores"] = results["field_scores"][i]
+        if "matched_chunks" in results:
+            simple_results[-1]["matched_chunk"] = results["matched_chunks"][i]
 
     print("SIMPLE LOG: Returning results")
     return {
         "query": request.query,
-        "results": simple_results
+        "mode": request.mode,
+        "results": project(simple_results, names)
     }
 
 @app.post("/api/chroma/search-by-profile")
-def search_by_profile(profile: BookerProfile, n_results: int = 10):
-    """Search showcases based on booker profile using Chroma"""
-    if not chroma_store:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
+def search_by_profile(profile: BookerProfile, response: Response, n_results: int = 10,
+                      fields: Optional[str] = None):
+    """Search showcases based on booker profile using Chroma
+
+    `fields=summary` drops each result's full CSV metadata; `fields=id,title,...`
+    keeps only the listed keys.
+    """
+    names = requested_fields(fields, SEARCH_RESULT_FIELDS, SEARCH_SUMMARY_FIELDS)
+    store = get_search_store(response)
     
     # Create query text from profile
     query_parts = []
@@ -268,7 +564,7 @@ def search_by_profile(profile: BookerProfile, n_results: int = 10):
     
     query_text = " | ".join(query_parts)
     
-    results = chroma_store.search_similar(query_text, n_results=n_results)
+    results = store.search_similar(query_text, n_results=n_results)
     
     # Format results
     formatted_results = []
@@ -293,13 +589,16 @@ def search_by_profile(profile: BookerProfile, n_results: int = 10):
         "profile": profile,
         "query_text": query_text,
         "n_results": len(formatted_results),
-        "results": formatted_results
+        "results": project(formatted_results, names)
     }
 
 class FilteredSearchRequest(BaseModel):
     profile: BookerProfile
     query: str
     n_results: int = 10
+    mode: Literal["dense", "hybrid", "fields", "chunks"] = "dense"
+    field_weights: Optional[Dict[str, float]] = None
+    pooling: Optional[Literal["max", "sum"]] = None
 
 class UserAnalysisRequest(BaseModel):
     survey_data: dict
@@ -307,56 +606,46 @@ class UserAnalysisRequest(BaseModel):
 class RecommendationStepRequest(BaseModel):
     survey_data: dict
     step: int = 1
+    mmr_lambda: Optional[float] = Field(None, ge=0.0, le=1.0)
+    rerank_top_n: int = Field(0, ge=0, le=100)
 
 @app.post("/api/chroma/filtered-search")
-def filtered_semantic_search(request: FilteredSearchRequest):
-    """Two-step search: 1) Filter by profile preferences 2) Semantic search within filtered results"""
-    if not chroma_store:
-        raise HTTPException(status_code=503, detail="Vector store not initialized")
-    
-    # Step 1: Get all showcases and filter by profile preferences (TEMPORARILY DISABLED)
-    # all_showcases = db.get_all_showcases()
-    # filtered_showcases = []
-    
-    # for showcase in all_showcases:
-    #     # Filter by genre if preferences exist
-    #     if request.profile.preferred_genres:
-    #         genre_match = False
-    #         if showcase.genre:
-    #             for pref_genre in request.profile.preferred_genres:
-    #                 if pref_genre.lower() in showcase.genre.lower():
-    #                     genre_match = True
-    #                     break
-    #         if not genre_match:
-    #             continue
-    #     
-    #     # Filter by venue type if specified
-    #     if request.profile.venue_type and showcase.venue:
-    #         if request.profile.venue_type.lower() not in showcase.venue.lower():
-    #             continue
-    #     
-    #     # Filter by budget range if specified (skip for now as budget_range not in model)
-    #     # if hasattr(request.profile, 'budget_range') and request.profile.budget_range and request.profile.budget_range.min > 0:
-    #     #     pass
-    #     
-    #     filtered_showcases.append(showcase)
+def filtered_semantic_search(request: FilteredSearchRequest, response: Response,
+                             fields: Optional[str] = None):
+    """Semantic search restricted to showcases matching the booker profile
+
+    Profile preferences (genres, venues, duration and tour size ranges) become a
+    metadata filter applied inside the vector search, so the results are the
+    top-k among matching showcases in a single pass. `fields=` projects each
+    result as for /api/chroma/search-by-profile.
+    """
+    names = requested_fields(fields, SEARCH_RESULT_FIELDS, SEARCH_SUMMARY_FIELDS)
+    store = get_search_store(response)
     
-    # TEMPORARY: Skip profile filtering and just do semantic search
-    all_showcases = db.get_all_showcases()
-    filtered_showcases = all_showcases  # Use all showcases for now
-    
-    # Step 2: Perform semantic search (without profile filtering for now)
-    # if not filtered_showcases:
-    #     return {
-    #         "query": request.query,
-    #         "filtered_count": 0,
-    #         "results": [],
-    #         "message": "No showcases match your profile preferences"
-    #     }
+    profile_filter = store.profile_filter(request.profile)
+    if profile_filter.matches_nothing:
+        return {
+            "query": request.query,
+            "mode": request.mode,
+            "filter": None,
+            "profile_filtered_count": 0,
+            "semantic_results_count": 0,
+            "results": [],
+            "message": "No showcases match your profile preferences"
+        }
     
-    # Perform semantic search without filtering
-    results = chroma_store.search_similar(request.query, n_results=request.n_results)
-    # Return all semantic search results without profile filtering
+    filtered_count = store.count_matching(profile_filter.where)
+    try:
+        results = store.search(
+            request.query,
+            n_results=min(request.n_results, filtered_count),
+            mode=request.mode,
+            where=profile_filter.where,
+            field_weights=request.field_weights,
+            pooling=request.pooling
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     final_results = []
     for i, (id, distance, metadata) in enumerate(zip(
         results["ids"],
@@ -372,38 +661,228 @@ def filtered_semantic_search(request: FilteredSearchRequest):
             "genre": metadata.get("Genre"),
             "venue": metadata.get("PAMS Venue"),
             "country": metadata.get("Country") if "Country" in metadata else None,
+            "field_scores": results["field_scores"][i] if "field_scores" in results else None,
+            "matched_chunk": results["matched_chunks"][i] if "matched_chunks" in results else None,
             "metadata": metadata
         })
     
-    return {
+    response_body = {
         "query": request.query,
-        "profile_filtered_count": len(filtered_showcases),
+        "mode": request.mode,
+        "filter": profile_filter.where,
+        "profile_filtered_count": filtered_count,
         "semantic_results_count": len(final_results),
-        "results": final_results
+        "results": project(final_results, names)
     }
+    if profile_filter.notes:
+        response_body["message"] = "; ".join(profile_filter.notes)
+    return response_body
 
-@app.post("/api/chroma/reload")
-def reload_chroma_store():
-    """Reload Chroma vector store with fresh PAMS data"""
+@app.get("/api/cache/stats")
+def get_query_cache_stats():
+    """Hit-rate metrics of the query cache in front of vector search"""
+    if not chroma_store:
+        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    stats = chroma_store.query_cache.get_stats()
+    stage = get_rerank_stage()
+    stats["rerank"] = stage.get_stats() if stage else None
+    return stats
+
+def run_reload():
+    """Build, validate and publish a new version of the current index (reload thread)"""
     global chroma_store
+    reload_status.update(status="building", started_at=time.time(), finished_at=None, error=None,
+                         catalog=None)
+    try:
+        # Catalog first: the delta import says which rows the index must redo
+        changes = db.load_from_csv("PAMS.csv")
+        reload_status["catalog"] = changes.summary()
+        if changes.changed:
+            role.bump("catalog_generation", catalog_sha256=catalog_sha256())
+        if editions and editions.current in editions.editions:
+            # Re-embeds only the rows that changed since the edition's snapshot
+            current = editions.get(editions.current)
+            current.load(shadow=True, changes=changes if changes.applies_to(current.csv_path) else None)
+            chroma_store = current.store
+        elif chroma_store:
+            version = chroma_store.build_version("PAMS.csv", doc_ids=changes.doc_ids)
+            version.publish(chroma_store)
+            chroma_store = version
+        else:
+            store = create_vector_store()
+            store.load_pams_data("PAMS.csv", doc_ids=changes.doc_ids)
+            chroma_store = store
+            readiness.ready("vector_index")
+        reload_status.update(status="published", version=chroma_store.version,
+                             document_count=chroma_store.count())
+        # Followers reopen the published version on their next poll
+        role.bump("index_generation", index_ready=True, version=chroma_store.version,
+                  document_count=chroma_store.count())
+        # The replaced version goes once searches that started on it are done
+        store = chroma_store
+        timer = threading.Timer(INDEX_VERSION_GRACE_S, store.gc_versions)
+        timer.daemon = True
+        timer.start()
+    except Exception as e:
+        print(f"Reload failed, keeping the current index: {e}")
+        reload_status.update(status="failed", error=str(e))
+    finally:
+        reload_status["finished_at"] = time.time()
+        role.update_generation(reload=reload_status)
+        reload_lock.release()
+
+def forward_reload(response: Response, wait: bool):
+    """Follower: have the leader worker run the reload"""
+    requested_at = time.time()
+    role.request_reload()
+    if not wait:
+        response.status_code = 202
+        return {"message": "Reload requested from the leader worker", "status": "requested"}
+
+    deadline = requested_at + 600
+    while time.time() < deadline:
+        state = role.leader_generation()
+        outcome = state.get("reload") or {}
+        if (outcome.get("finished_at") or 0) > requested_at:
+            if outcome["status"] == "failed":
+                raise HTTPException(status_code=500, detail=f"Reload failed: {outcome['error']}")
+            return {
+                "message": "Chroma vector store reloaded successfully",
+                "document_count": state.get("document_count"),
+                "version": state.get("version"),
+                "catalog": outcome.get("catalog")
+            }
+        time.sleep(WORKER_POLL_S / 4)
+    raise HTTPException(status_code=504, detail="The leader worker did not finish the reload in time")
 
+@app.post("/api/chroma/reload")
+def reload_chroma_store(response: Response, wait: bool = False):
+    """Reload Chroma vector store with fresh PAMS data
+
+    PAMS.csv is first applied to the catalog as a delta ("catalog": rows
+    inserted / updated / deleted / unchanged), and only the rows it changed
+    are embedded again. A new index version is built in the background while the current one keeps
+    answering searches, validated (document count, sample queries) and then
+    published by flipping the alias searches read. Returns 202 right away
+    (poll GET /api/chroma/versions), or the outcome with `wait=true`.
+    """
+    if INDEX_ARTIFACT:
+        raise HTTPException(status_code=409,
+                            detail="Serving a prebuilt index artifact: build a new one with build_index.py and deploy it")
     if not os.path.exists("PAMS.csv"):
         raise HTTPException(status_code=404, detail="PAMS.csv not found")
+    if not role.is_leader:
+        return forward_reload(response, wait)
+    if readiness.status("vector_index") == LOADING:
+        raise HTTPException(status_code=409, detail="The vector index is still being built")
+    if not reload_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A reload is already in progress")
+
+    if not wait:
+        threading.Thread(target=run_reload, name="reload", daemon=True).start()
+        response.status_code = 202
+        return {"message": "Building a new index version", "status": "building"}
+
+    run_reload()
+    if reload_status["status"] == "failed":
+        raise HTTPException(status_code=500, detail=f"Reload failed: {reload_status['error']}")
+    return {
+        "message": "Chroma vector store reloaded successfully",
+        "document_count": chroma_store.count(),
+        "version": chroma_store.version,
+        "catalog": reload_status["catalog"]
+    }
 
-    if not chroma_store:
-        chroma_store = ChromaVectorStore(persist_directory="./chroma_db")
+@app.get("/api/chroma/versions")
+def get_index_versions():
+    """Index version each alias points to, retired versions and the last reload"""
+    stores = {name: edition.store for name, edition in editions.editions.items()} if editions else {}
+    if not stores and chroma_store:
+        stores = {"current": chroma_store}
+    return {
+        "worker": {"pid": os.getpid(), "leader": role.is_leader},
+        "artifact": INDEX_ARTIFACT or None,
+        "reload": reload_status if role.is_leader else role.leader_generation().get("reload"),
+        "grace_s": INDEX_VERSION_GRACE_S,
+        "indexes": {
+            name: {"serving": store.version, **(store.versions.state() if store.versions else {})}
+            for name, store in stores.items()
+        }
+    }
 
-    # Reload data
-    chroma_store.load_pams_data("PAMS.csv")
+class EditionSearchRequest(BaseModel):
+    query: str
+    n_results: int = 10
+    # Festival editions to search (all configured editions by default)
+    editions: Optional[List[str]] = None
+    mode: Literal["dense", "hybrid", "fields", "chunks"] = "dense"
+
+@app.get("/api/editions")
+def list_editions():
+    """Configured festival editions and their index sizes"""
+    if not editions:
+        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    return {
+        "current": editions.current,
+        "editions": [edition.info() for edition in editions.editions.values()]
+    }
+
+@app.post("/api/editions/search")
+def search_editions(request: EditionSearchRequest):
+    """Semantic search across festival editions, searched concurrently and merged"""
+    if not editions:
+        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    try:
+        results = editions.search(request.query, n_results=request.n_results,
+                                  editions=request.editions, mode=request.mode)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
 
     return {
-        "message": "Chroma vector store reloaded successfully",
-        "document_count": chroma_store.collection.count()
+        "query": request.query,
+        "mode": request.mode,
+        "results": [
+            {
+                "edition": edition,
+                "id": id,
+                "title": metadata.get("Title"),
+                "genre": metadata.get("Genre"),
+                "similarity": round(1 - distance, 3)
+            }
+            for edition, id, distance, metadata in zip(
+                results["editions"], results["ids"], results["distances"], results["metadatas"]
+            )
+        ]
+    }
+
+@app.get("/api/editions/{edition}/showcases/{showcase_id}/neighbours")
+def get_edition_neighbours(edition: str, showcase_id: int, k: int = 5):
+    """Most similar showcases of the same edition, from the precomputed neighbour table"""
+    if not editions:
+        raise HTTPException(status_code=503, detail="Vector store not initialized")
+    try:
+        selected = editions.get(edition)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+    neighbours = selected.neighbours(f"pams_{showcase_id}", k)
+    if not neighbours:
+        raise HTTPException(status_code=404, detail="Showcase not found")
+    records = selected.store.get_records([doc_id for doc_id, _ in neighbours])
+    titles = {doc_id: metadata.get("Title") for doc_id, metadata in zip(records["ids"], records["metadatas"])}
+    return {
+        "edition": edition,
+        "showcase_id": showcase_id,
+        "neighbours": [
+            {"id": doc_id, "title": titles.get(doc_id), "similarity": round(score, 3)}
+            for doc_id, score in neighbours
+        ]
     }
 
 @app.post("/api/recommendation/analyze-user")
 def analyze_user_with_ollama(request: UserAnalysisRequest):
     """Step 1: Analyze user survey data with Ollama to extract keywords"""
+    import requests
     print(f"[AI ANALYSIS] Starting user analysis with Ollama...")
 
     # Create prompt for Ollama
@@ -510,7 +989,7 @@ def analyze_user_with_ollama(request: UserAnalysisRequest):
 
 
 @app.post("/api/recommendation/step-by-step")
-def get_step_by_step_recommendations(request: RecommendationStepRequest):
+def get_step_by_step_recommendations(request: RecommendationStepRequest, response: Response):
     """Get recommendations with step-by-step progress display"""
     print("[DEBUG] Function called!")
     print(f"[DEBUG] Request step: {request.step}")
@@ -533,8 +1012,7 @@ def get_step_by_step_recommendations(request: RecommendationStepRequest):
             # Step 2: Similarity Search with BGE-M3
             print("[BGE-M3] Starting BGE-M3 similarity search...")
 
-            if not chroma_store:
-                raise HTTPException(status_code=503, detail="Vector store not initialized")
+            store = get_search_store(response)
 
             # Create query from survey data
             query_parts = []
@@ -552,7 +1030,10 @@ def get_step_by_step_recommendations(request: RecommendationStepRequest):
 
             # Perform search
             print(f"[DEBUG] Starting ChromaDB search with query: '{query}'")
-            results = chroma_store.search_similar(query, n_results=10)
+            results = store.search(
+                query, n_results=10,
+                mmr_lambda=request.mmr_lambda, rerank_top_n=request.rerank_top_n
+            )
             print(f"[DEBUG] Search results keys: {results.keys() if results else 'None'}")
 
             if not results:
@@ -638,7 +1119,8 @@ def get_step_by_step_recommendations(request: RecommendationStepRequest):
                 "message": "유사도 검색 기반 맞춤 공연 추천 완료",
                 "progress": 100,
                 "recommendations": recommendations,
-                "query_used": query
+                "query_used": query,
+                "reranked": bool(results.get("reranked"))
             }
 
         else:
@@ -655,6 +1137,7 @@ def stream_user_analysis(survey_data: str):
     """Stream real-time AI analysis with ExaONE inference"""
 
     def generate_stream() -> Generator[str, None, None]:
+        import requests
         try:
             # Parse survey data
             survey_dict = json.loads(survey_data)
@@ -824,6 +1307,7 @@ API_KEY = '9e9bc3ee73e34fa0b7faa7ff8b97d045'
 @app.get("/api/kopis/period-stats")
 def get_period_stats(stdate: str, eddate: str):
     """Proxy KOPIS period statistics API - REAL API CALLS ONLY"""
+    import requests
     try:
         url = f"http://kopis.or.kr/openApi/restful/prfstsTotal"
         params = {
@@ -873,6 +1357,7 @@ def get_period_stats(stdate: str, eddate: str):
 @app.get("/api/kopis/performance-list")
 def get_performance_list(stdate: str, eddate: str, rows: int = 1000, prfstate: str = None):
     """Proxy KOPIS performance list API - REAL API CALLS ONLY"""
+    import requests
     print("CLAUDE DEBUG: PERFORMANCE-LIST ENDPOINT CALLED!")
     print("=" * 50)
     print(f"[DEBUG] ENDPOINT CALLED: /api/kopis/performance-list")
@@ -931,6 +1416,7 @@ def get_performance_list(stdate: str, eddate: str, rows: int = 1000, prfstate: s
 @app.get("/api/kopis/box-stats")
 def get_box_stats(stdate: str, eddate: str, ststype: str = "day"):
     """Proxy KOPIS box office statistics API for real-time booking rankings - REAL API CALLS ONLY"""
+    import requests
     try:
         url = f"http://kopis.or.kr/openApi/restful/boxStats"
         params = {
@@ -980,6 +1466,7 @@ def get_box_stats(stdate: str, eddate: str, ststype: str = "day"):
 @app.get("/api/kopis/box-stats-price")
 def get_box_stats_price(stdate: str, eddate: str):
     """Proxy KOPIS box office statistics by price range API - REAL API CALLS ONLY"""
+    import requests
     try:
         url = f"http://kopis.or.kr/openApi/restful/boxStatsPrice"
         params = {
@@ -1028,6 +1515,7 @@ def get_box_stats_price(stdate: str, eddate: str):
 @app.get("/api/kopis/box-stats-category")
 def get_box_stats_category(stdate: str, eddate: str, catecode: str = None):
     """Proxy KOPIS box office statistics by category API - REAL API CALLS ONLY"""
+    import requests
     try:
         url = f"http://kopis.or.kr/openApi/restful/boxStatsCate"
         params = {
@@ -1078,6 +1566,7 @@ def get_box_stats_category(stdate: str, eddate: str, catecode: str = None):
 @app.get("/api/kopis/boxoffice")
 def get_kopis_boxoffice(stdate: str, eddate: str, catecode: str = None, area: str = None, srchseatscale: str = None):
     """Proxy KOPIS boxoffice ranking API - REAL API CALLS ONLY"""
+    import requests
     try:
         url = f"http://www.kopis.or.kr/openApi/restful/boxoffice"
         params = {
@@ -1134,6 +1623,7 @@ def get_kopis_boxoffice(stdate: str, eddate: str, catecode: str = None, area: st
 @app.get("/api/kopis/regional-stats")
 def get_regional_stats(stdate: str, eddate: str, signgucode: str = None, signgunm: str = None):
     """Proxy KOPIS regional statistics API - prfstsAreaService for detailed area analysis"""
+    import requests
     try:
         url = f"http://kopis.or.kr/openApi/restful/prfstsArea"
         params = {
@@ -1188,6 +1678,7 @@ def get_regional_stats(stdate: str, eddate: str, signgucode: str = None, signgun
 @app.get("/api/kopis/genre-box-stats")
 def get_genre_box_stats(stdate: str, eddate: str, catecode: str = None):
     """Proxy KOPIS genre-specific box office statistics API - boxStatsCate for detailed genre analysis"""
+    import requests
     try:
         url = f"http://kopis.or.kr/openApi/restful/boxStatsCate"
         params = {
@@ -1240,6 +1731,7 @@ def get_genre_box_stats(stdate: str, eddate: str, catecode: str = None):
 @app.get("/api/kopis/genre-performance-stats")
 def get_genre_performance_stats(stdate: str, eddate: str):
     """Proxy KOPIS genre performance statistics API - prfstsCate for genre-specific performance lists"""
+    import requests
     try:
         url = f"http://kopis.or.kr/openApi/restful/prfstsCate"
         params = {
@@ -1353,6 +1845,7 @@ def stream_kopis_ai_insights(data: str):
     return {"message": "AI insights temporarily disabled for debugging"}
 
     def generate_insights_stream() -> Generator[str, None, None]:
+        import requests
         try:
             # Parse KOPIS data
             kopis_data = json.loads(data)
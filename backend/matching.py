@@ -1,32 +1,25 @@
 import numpy as np
 from typing import List, Tuple
-from sklearn.metrics.pairwise import cosine_similarity
 from models import Showcase, BookerProfile, MatchingResult, VenueFitScore
+from ingest import VENUE_CAPACITIES, DEFAULT_VENUE_CAPACITY, venue_capacity
 
 class MatchingService:
     def __init__(self):
-        self.venue_capacity_map = {
-            "Daloreum Theater, National Theater of Korea": 450,
-            "Haneul Round Theater, National Theater of Korea": 627,
-            "Seoul Namsan Gugakdang": 300,
-            "Daehakro Arts Theater-Main Hall": 600,
-            "Arko Arts Theater-Small Hall": 150,
-            "SFAC Theater QUAD": 200,
-            "Lee O‑young Art Theater": 250,
-            "TINC(This Is Not a Church)": 100,
-            "Daehakro Arts Theater Small Theater": 150
-        }
+        self.venue_capacity_map = VENUE_CAPACITIES
     
     def calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors"""
         if not vec1 or not vec2:
             return 0.0
         
-        vec1_np = np.array(vec1).reshape(1, -1)
-        vec2_np = np.array(vec2).reshape(1, -1)
+        vec1_np = np.asarray(vec1, dtype=np.float64)
+        vec2_np = np.asarray(vec2, dtype=np.float64)
         
-        similarity = cosine_similarity(vec1_np, vec2_np)[0][0]
-        return float(similarity)
+        # Plain NumPy: importing sklearn for this one call cost ~1s of API startup
+        norms = np.linalg.norm(vec1_np) * np.linalg.norm(vec2_np)
+        if norms == 0:
+            return 0.0
+        return float(np.dot(vec1_np, vec2_np) / norms)
     
     def find_similar_showcases(
         self, 
@@ -59,33 +52,33 @@ class MatchingService:
     
     def calculate_venue_fit(self, showcase: Showcase, venue: str = None) -> VenueFitScore:
         """Calculate how well a showcase fits a venue"""
-        if not venue:
+        if venue and venue != showcase.venue:
+            capacity = venue_capacity(venue)
+        else:
+            # Resolved once at ingest
             venue = showcase.venue
-        
-        venue_capacity = self.venue_capacity_map.get(venue, 300)  # Default capacity
+            capacity = showcase.venue_capacity or DEFAULT_VENUE_CAPACITY
         
         # Tour size fit (ideal tour size vs venue capacity ratio)
         tour_size_fit = 1.0
         if showcase.tour_size:
             # Ideal ratio is tour_size * 30 = venue_capacity (rough estimate)
             ideal_capacity = showcase.tour_size * 30
-            ratio = min(venue_capacity, ideal_capacity) / max(venue_capacity, ideal_capacity)
+            ratio = min(capacity, ideal_capacity) / max(capacity, ideal_capacity)
             tour_size_fit = ratio
         
         # Duration fit (shorter shows for smaller venues)
         duration_fit = 1.0
-        if showcase.duration:
-            # Extract minutes from duration string
-            try:
-                duration_min = int(''.join(filter(str.isdigit, showcase.duration.split('min')[0])))
-                if venue_capacity < 200:  # Small venue
-                    duration_fit = 1.0 if duration_min <= 60 else 0.7
-                elif venue_capacity < 400:  # Medium venue
-                    duration_fit = 1.0 if duration_min <= 90 else 0.8
-                else:  # Large venue
-                    duration_fit = 1.0  # Any duration is fine
-            except:
-                duration_fit = 0.8
+        if showcase.duration_min is not None:
+            if capacity < 200:  # Small venue
+                duration_fit = 1.0 if showcase.duration_min <= 60 else 0.7
+            elif capacity < 400:  # Medium venue
+                duration_fit = 1.0 if showcase.duration_min <= 90 else 0.8
+            else:  # Large venue
+                duration_fit = 1.0  # Any duration is fine
+        elif showcase.duration:
+            # Duration text that could not be parsed at ingest
+            duration_fit = 0.8
         
         overall_score = (tour_size_fit * 0.6 + duration_fit * 0.4)
         
@@ -105,30 +98,23 @@ class MatchingService:
     ) -> List[MatchingResult]:
         """Match showcases to a booker's profile"""
         results = []
+        preferred_genres = [pref.lower() for pref in booker_profile.preferred_genres or []]
         
         for showcase in all_showcases:
             score = 0.0
             match_count = 0
             
             # Genre matching
-            if booker_profile.preferred_genres and showcase.genre:
-                genre_parts = showcase.genre.lower().split(',')
-                for genre in genre_parts:
-                    genre = genre.strip()
-                    if any(pref.lower() in genre for pref in booker_profile.preferred_genres):
-                        score += 0.3
-                        match_count += 1
-                        break
+            if preferred_genres and showcase.genre_tags:
+                if any(pref in tag.lower() for tag in showcase.genre_tags for pref in preferred_genres):
+                    score += 0.3
+                    match_count += 1
             
             # Duration matching
-            if booker_profile.preferred_duration_min and showcase.duration:
-                try:
-                    duration_min = int(''.join(filter(str.isdigit, showcase.duration.split('min')[0])))
-                    if booker_profile.preferred_duration_min <= duration_min <= (booker_profile.preferred_duration_max or 999):
-                        score += 0.2
-                        match_count += 1
-                except:
-                    pass
+            if booker_profile.preferred_duration_min and showcase.duration_min is not None:
+                if booker_profile.preferred_duration_min <= showcase.duration_min <= (booker_profile.preferred_duration_max or 999):
+                    score += 0.2
+                    match_count += 1
             
             # Tour size matching
             if booker_profile.preferred_tour_size_min and showcase.tour_size:
@@ -0,0 +1,166 @@
+"""
+Booker profile constraints pushed down into vector search
+
+Profiles are turned into a Chroma-style `where` clause over the typed metadata
+fields written at ingest (see ingest.py): genre_<slug> flags, venue_id,
+duration_min and tour_size.
+
+ChromaVectorStore passes the clause straight to collection.query(where=...);
+NumpyVectorStore evaluates it into a boolean row mask with where_mask(). Either
+way the filter is applied inside the search, so top-k means top-k among the
+matching showcases.
+
+Venue and genre preferences are substrings ("National Theater" matches two
+halls, "multidisciplinary" the Multidisciplinary/Others tag, as in
+MatchingService), which `where` cannot express, so they are resolved against
+the catalog's venue names and genre flags first and sent as a `$in` over venue
+ids and an `$or` over the matching genre_<slug> flags.
+"""
+import json
+import operator
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ingest import CANONICAL_GENRES, GENRE_PREFIX, slug
+
+_COMPARISONS = {
+    "$eq": operator.eq,
+    "$ne": operator.ne,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le
+}
+
+
+def _all_of(conditions: List[dict]) -> Optional[dict]:
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def _any_of(conditions: List[dict]) -> dict:
+    return conditions[0] if len(conditions) == 1 else {"$or": conditions}
+
+
+def _range(field: str, low: Optional[int], high: Optional[int]) -> List[dict]:
+    conditions = []
+    if low is not None:
+        conditions.append({field: {"$gte": low}})
+    if high is not None:
+        conditions.append({field: {"$lte": high}})
+    return conditions
+
+
+class ProfileFilter:
+    """A `where` clause for one booker profile
+
+    `where` is None when the profile has no constraints. `matches_nothing` is
+    set when a venue preference matches no venue in the catalog, in which case
+    the search can be skipped entirely. Genre preferences matching no catalog
+    genre are dropped rather than emptying the results; `notes` says so.
+    """
+
+    def __init__(self, where: Optional[dict] = None, matches_nothing: bool = False,
+                 notes: Optional[List[str]] = None):
+        self.where = where
+        self.matches_nothing = matches_nothing
+        self.notes = notes or []
+
+    @classmethod
+    def from_profile(cls, profile, venue_names: Dict[str, str],
+                     genres: Iterable[str] = CANONICAL_GENRES) -> "ProfileFilter":
+        """Build the filter; `venue_names` maps venue_id -> venue name, `genres`
+        are the genre slugs flagged in the catalog"""
+        conditions = []
+        notes = []
+
+        preferences = [slug(genre) for genre in profile.preferred_genres or [] if slug(genre)]
+        if preferences:
+            genres = list(genres)
+            flags = resolve_genres(preferences, genres)
+            unknown = [pref for pref in preferences
+                       if not any(pref in genre for genre in genres)]
+            if unknown:
+                notes.append(f"Genre preferences {unknown} match no catalog genre")
+            if flags:
+                conditions.append(_any_of([{GENRE_PREFIX + genre: True} for genre in flags]))
+            else:
+                notes.append("genres are not filtered")
+
+        venue_terms = [
+            [v.lower() for v in profile.preferred_venues or [] if v.strip()],
+            [profile.venue_type.lower()] if profile.venue_type and profile.venue_type.strip() else []
+        ]
+        for terms in venue_terms:
+            if not terms:
+                continue
+            keys = sorted(
+                key for key, name in venue_names.items()
+                if any(term in name.lower() for term in terms)
+            )
+            if not keys:
+                return cls(matches_nothing=True)
+            conditions.append({"venue_id": {"$in": keys}})
+
+        conditions += _range("duration_min", profile.preferred_duration_min, profile.preferred_duration_max)
+        conditions += _range("tour_size", profile.preferred_tour_size_min, profile.preferred_tour_size_max)
+
+        return cls(_all_of(conditions), notes=notes)
+
+
+def resolve_genres(preferences: Iterable[str], genres: Iterable[str]) -> List[str]:
+    """Catalog genre slugs containing any preference slug ("dance" -> ["dance"],
+    "multidisciplinary" -> ["multidisciplinary_others"])"""
+    preferences = list(preferences)
+    return sorted(genre for genre in set(genres) if any(pref in genre for pref in preferences))
+
+
+def catalog_genres(metadatas: Iterable[dict]) -> List[str]:
+    """Genre slugs with a genre_<slug> flag in any of `metadatas`"""
+    genres = set(CANONICAL_GENRES)
+    for metadata in metadatas:
+        genres.update(key[len(GENRE_PREFIX):] for key in metadata if key.startswith(GENRE_PREFIX))
+    return sorted(genres)
+
+
+def where_key(where: Optional[dict]) -> str:
+    """Canonical string for a where clause (cache keys)"""
+    return json.dumps(where, sort_keys=True, ensure_ascii=False) if where else ""
+
+
+def where_mask(where: Optional[dict], column: Callable[[str], Iterable], size: int) -> np.ndarray:
+    """Evaluate a Chroma-style where clause into a boolean mask
+
+    `column(key)` returns the metadata values for every row (None where the key
+    is missing). Rows missing a field never match a condition on it.
+    """
+    mask = np.ones(size, dtype=bool)
+    for key, condition in (where or {}).items():
+        if key == "$and":
+            for sub in condition:
+                mask &= where_mask(sub, column, size)
+        elif key == "$or":
+            any_mask = np.zeros(size, dtype=bool)
+            for sub in condition:
+                any_mask |= where_mask(sub, column, size)
+            mask &= any_mask
+        else:
+            values = column(key)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for op, operand in condition.items():
+                if op == "$in":
+                    allowed = set(operand)
+                    matches = (v is not None and v in allowed for v in values)
+                elif op == "$nin":
+                    excluded = set(operand)
+                    matches = (v is not None and v not in excluded for v in values)
+                elif op in _COMPARISONS:
+                    compare = _COMPARISONS[op]
+                    matches = (v is not None and compare(v, operand) for v in values)
+                else:
+                    raise ValueError(f"Unsupported where operator '{op}'")
+                mask &= np.fromiter(matches, dtype=bool, count=size)
+    return mask
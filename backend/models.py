@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Annotated, Any, Dict, Optional, List, Union
 from datetime import datetime
 
 class Showcase(BaseModel):
@@ -22,6 +22,32 @@ class Showcase(BaseModel):
     venue: Optional[str] = None
     review: Optional[str] = None
     embedding: Optional[List[float]] = None
+    # Typed fields parsed once at ingest (see ingest.py)
+    duration_min: Optional[int] = None
+    genre_tags: List[str] = []
+    venue_id: Optional[str] = None
+    venue_capacity: Optional[int] = None
+    schedule_dates: List[str] = []
+
+class ShowcaseSummary(BaseModel):
+    """Card view of a showcase for list pages and recommendation lists (`fields=summary`)"""
+    id: Optional[int] = None
+    title: str
+    genre: str
+    artist: str
+    venue: Optional[str] = None
+    schedule_date: Optional[str] = None
+    duration_min: Optional[int] = None
+    genre_tags: List[str] = []
+
+# A showcase as served with `fields=`: full, summary, or only the listed fields
+ShowcaseView = Annotated[Union[Showcase, ShowcaseSummary, Dict[str, Any]], Field(union_mode="left_to_right")]
+
+class ShowcasePage(BaseModel):
+    """One page of /api/showcases?limit=&cursor= (items shaped by `fields=`)"""
+    items: List[ShowcaseView]
+    next_cursor: Optional[str] = None
+    total: int
 
 class BookerProfile(BaseModel):
     id: Optional[int] = None
@@ -39,6 +65,10 @@ class BookerProfile(BaseModel):
 class MatchingRequest(BaseModel):
     booker_profile: BookerProfile
     top_k: int = 10
+    # MMR diversity: None keeps plain similarity order, 1.0 = relevance only, lower = more diverse
+    mmr_lambda: Optional[float] = Field(None, ge=0.0, le=1.0)
+    # Candidates re-ranked by the cross-encoder (0 = dense order only)
+    rerank_top_n: int = Field(0, ge=0, le=100)
 
 class SimilarityRequest(BaseModel):
     showcase_id: int
@@ -48,7 +78,17 @@ class MatchingResult(BaseModel):
     showcase: Showcase
     similarity_score: float
     venue_fit_score: Optional[float] = None
+    matching_factors: Optional[List[str]] = None
     
+class MatchingSummary(BaseModel):
+    showcase: ShowcaseSummary
+    similarity_score: float
+    venue_fit_score: Optional[float] = None
+    matching_factors: Optional[List[str]] = None
+
+# A matching result as served with `fields=` (projected results are plain dicts)
+MatchingView = Annotated[Union[MatchingResult, MatchingSummary, Dict[str, Any]], Field(union_mode="left_to_right")]
+
 class VenueFitScore(BaseModel):
     showcase_id: int
     venue: str
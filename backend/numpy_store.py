@@ -0,0 +1,384 @@
+"""
+Exact in-memory vector index for small catalogs
+
+For a few hundred to a few tens of thousands of showcases, brute force is
+faster than going through Chroma's client, SQLite and HNSW layers: every query
+is one GEMV against an L2-normalised float32 matrix followed by argpartition.
+Results are exact, so there is no recall/latency trade-off to tune.
+
+Metadata lives in a plain list next to the matrix. `where` clauses are
+evaluated into boolean row masks (cached per index generation) that restrict a
+query to the matching rows before scoring, so a filtered query still returns a
+full top-k.
+
+The index is saved as vectors.npy + records.json under persist_directory after
+every load and reopened from there on startup.
+
+With reduced_dim > 0 (VECTOR_REDUCED_DIM) search becomes two-stage: a small
+int8 projection of the matrix (reduced_index.py) picks a shortlist of
+shortlist_factor * k rows and only those are rescored exactly. The
+full-precision matrix is then memory-mapped from vectors.npy instead of held
+in memory, so only the shortlisted rows are ever paged in.
+"""
+import os
+import json
+import shutil
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config import VECTOR_REDUCED_DIM, VECTOR_REDUCTION, VECTOR_SHORTLIST_FACTOR
+from embedding_backends import EmbeddingBackend, normalize_rows
+from reduced_index import ReducedIndex
+from vector_store import VectorStore, empty_results
+from metadata_filter import where_key, where_mask
+from index_versions import VersionPointer
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.npy"
+RECORDS_FILE = "records.json"
+REDUCED_FILE = "reduced.npz"
+
+# Index versions live in <persist_directory>.v<n> (see index_versions.py)
+VERSION_SEPARATOR = ".v"
+
+
+class NumpyVectorStore(VectorStore):
+    """Brute-force cosine search over an in-memory matrix"""
+
+    backend_name = "numpy"
+
+    def __init__(self, persist_directory: Optional[str] = "./vector_index",
+                 embedding_backend: EmbeddingBackend = None,
+                 reduced_dim: int = VECTOR_REDUCED_DIM,
+                 reduction: str = VECTOR_REDUCTION,
+                 shortlist_factor: int = VECTOR_SHORTLIST_FACTOR,
+                 version: Optional[str] = None,
+                 read_only: bool = False):
+        """`persist_directory` is an alias: the index is read from the version
+        directory the alias points to (or `version`, for an unpublished build).
+        A `read_only` store memory-maps the vectors and never writes."""
+        super().__init__(embedding_backend)
+        self.read_only = read_only
+        self.alias = persist_directory
+        if persist_directory:
+            self.versions = VersionPointer(f"{persist_directory}.alias.json", persist_directory)
+            persist_directory = version or self.versions.current or persist_directory
+            self.version = persist_directory
+        self.persist_directory = persist_directory
+        self.reduced_dim = reduced_dim
+        self.reduction = reduction
+        self.shortlist_factor = max(shortlist_factor, 1)
+        self.reduced: Optional[ReducedIndex] = None
+
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.matrix = np.zeros((0, self.embedding_backend.dim), dtype=np.float32)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._masks: Dict[str, np.ndarray] = {}
+        # Bulk loads append into spare capacity and save once, at end_bulk()
+        self._bulk = False
+        self._buffer: Optional[np.ndarray] = None
+
+        if persist_directory and os.path.exists(os.path.join(persist_directory, VECTORS_FILE)):
+            self._load()
+        logger.info(f"Initialized in-memory vector index with {self.count()} documents")
+
+    # ------------------------------------------------------------------
+    # Persistence
+
+    def _load(self):
+        with open(os.path.join(self.persist_directory, RECORDS_FILE), encoding="utf-8") as f:
+            records = json.load(f)
+        self.ids = records["ids"]
+        self.documents = records["documents"]
+        self.metadatas = records["metadatas"]
+        self.id_to_row = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        vectors_path = os.path.join(self.persist_directory, VECTORS_FILE)
+        # Memory-mapped vectors are shared through the page cache by every worker
+        self.matrix = np.load(vectors_path, mmap_mode="r" if self.reduced_dim or self.read_only else None)
+        self._invalidate_masks()
+
+        if self.reduced_dim:
+            reduced_path = os.path.join(self.persist_directory, REDUCED_FILE)
+            if os.path.exists(reduced_path):
+                self.reduced = ReducedIndex.load(reduced_path)
+            # PCA cannot keep more components than rows or input dimensions
+            expected_dim = (self.reduced_dim if self.reduction == "random"
+                            else min(self.reduced_dim, *self.matrix.shape))
+            stale = (self.reduced is None or len(self.reduced.codes) != len(self.ids)
+                     or self.reduced.method != self.reduction
+                     or self.reduced.dim != expected_dim)
+            if stale and self.read_only:
+                logger.warning(f"{reduced_path} is stale, searching {self.persist_directory} exactly")
+                self.reduced = None
+            elif stale:
+                self._refit_reduced()
+                if self.reduced is not None:
+                    self.reduced.save(reduced_path)
+
+    def save(self):
+        if not self.persist_directory:
+            return
+        os.makedirs(self.persist_directory, exist_ok=True)
+        # Written to a temp file and swapped in, so a memory-mapped copy of the
+        # previous vectors.npy stays valid while this runs
+        vectors_path = os.path.join(self.persist_directory, VECTORS_FILE)
+        with open(vectors_path + ".tmp", "wb") as f:
+            np.save(f, np.asarray(self.matrix))
+        os.replace(vectors_path + ".tmp", vectors_path)
+        if self.reduced is not None:
+            self.reduced.save(os.path.join(self.persist_directory, REDUCED_FILE))
+        records_path = os.path.join(self.persist_directory, RECORDS_FILE)
+        with open(records_path + ".tmp", "w", encoding="utf-8") as f:
+            # dumps() uses the C encoder; dump() streams through the pure-Python one
+            f.write(json.dumps({"ids": self.ids, "documents": self.documents,
+                                "metadatas": self.metadatas}, ensure_ascii=False))
+        os.replace(records_path + ".tmp", records_path)
+        if self.reduced is not None:
+            # Drop the in-memory copy: rescoring reads shortlisted rows from disk
+            self.matrix = np.load(vectors_path, mmap_mode="r")
+
+    # ------------------------------------------------------------------
+    # Reduced index
+
+    def _refit_reduced(self):
+        if not self.reduced_dim or len(self.matrix) == 0:
+            self.reduced = None
+            return
+        self.reduced = ReducedIndex.fit(self.matrix, self.reduced_dim, self.reduction)
+        logger.info(
+            f"Fitted {self.reduced.dim}-d int8 {self.reduction} index "
+            f"({self.reduced.codes.nbytes / 1024:.0f} KiB vs {self.matrix.nbytes / 1024:.0f} KiB full)"
+        )
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Bytes held for search: the full matrix (if resident) and the reduced index"""
+        mapped = isinstance(self.matrix, np.memmap)
+        return {
+            "full_bytes": int(self.matrix.nbytes),
+            "full_resident": not mapped,
+            "reduced_bytes": int(self.reduced.nbytes) if self.reduced is not None else 0,
+            "resident_bytes": (0 if mapped else int(self.matrix.nbytes))
+                              + (int(self.reduced.nbytes) if self.reduced is not None else 0)
+        }
+
+    # ------------------------------------------------------------------
+    # Storage primitives
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def add_records(self, ids, documents, metadatas, embeddings=None):
+        self._check_writable()
+        if embeddings is None:
+            embeddings = self.embedding_backend.encode(list(documents))
+        vectors = normalize_rows(np.asarray(embeddings, dtype=np.float32))
+
+        new_rows = []
+        for doc_id, document, metadata, vector in zip(ids, documents, metadatas, vectors):
+            row = self.id_to_row.get(doc_id)
+            if row is None:
+                self.id_to_row[doc_id] = len(self.ids)
+                new_rows.append(vector)
+                self.ids.append(doc_id)
+                self.documents.append(document)
+                self.metadatas.append(metadata)
+            elif row >= len(self.matrix):
+                # Repeated id within this batch
+                new_rows[row - len(self.matrix)] = vector
+                self.documents[row] = document
+                self.metadatas[row] = metadata
+            else:
+                if not self.matrix.flags.writeable:
+                    self.matrix = np.array(self.matrix)
+                self.matrix[row] = vector
+                self.documents[row] = document
+                self.metadatas[row] = metadata
+        if new_rows:
+            self._append_rows(np.stack(new_rows))
+        self._invalidate_masks()
+        if self._bulk:
+            return
+        self._refit_reduced()
+        self.save()
+
+    def _append_rows(self, vectors: np.ndarray):
+        """Append rows, growing a spare-capacity buffer geometrically (amortised O(1) per row)"""
+        n = len(self.matrix)
+        buffer = self._buffer
+        if buffer is None or self.matrix.base is not buffer or len(buffer) < n + len(vectors):
+            buffer = np.empty((max(n + len(vectors), 2 * n), self.matrix.shape[1]), dtype=np.float32)
+            buffer[:n] = self.matrix
+            self._buffer = buffer
+        buffer[n:n + len(vectors)] = vectors
+        self.matrix = buffer[:n + len(vectors)]
+
+    def begin_bulk(self):
+        self._bulk = True
+
+    def end_bulk(self):
+        if not self._bulk:
+            return
+        self._bulk = False
+        # Give back the spare capacity
+        self.matrix = np.array(self.matrix)
+        self._buffer = None
+        self._invalidate_masks()
+        self._refit_reduced()
+        self.save()
+
+    def create_version(self) -> "NumpyVectorStore":
+        name = None
+        if self.versions is not None:
+            name, abandoned = self.versions.begin(lambda n: f"{self.alias}{VERSION_SEPARATOR}{n}")
+            if abandoned:
+                self._drop_version(abandoned)
+        store = NumpyVectorStore(self.alias, self.embedding_backend, self.reduced_dim,
+                                 self.reduction, self.shortlist_factor, version=name)
+        store.catalog_year = self.catalog_year
+        return store
+
+    def _drop_version(self, name: str):
+        # Memory-mapped vectors of a store still serving survive the unlink
+        if name:
+            shutil.rmtree(name, ignore_errors=True)
+
+    def _clear(self):
+        self._check_writable()
+        self.ids, self.documents, self.metadatas = [], [], []
+        self.id_to_row = {}
+        self.matrix = np.zeros((0, self.embedding_backend.dim), dtype=np.float32)
+        self.reduced = None
+        self._invalidate_masks()
+        self.save()
+
+    def query_vector(self, query_embedding: np.ndarray, n_results: int,
+                     where: Optional[dict] = None,
+                     include_embeddings: bool = False,
+                     mask: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Top-n by cosine similarity, restricted to rows matching `where`/`mask`
+
+        Exact unless the reduced index is enabled and more rows match than the
+        shortlist, in which case only the shortlisted rows are scored exactly.
+        """
+        query_embedding = np.asarray(query_embedding, dtype=np.float32)
+        if where:
+            mask = self.where_mask(where) if mask is None else mask & self.where_mask(where)
+        rows = None if mask is None else np.flatnonzero(mask)
+
+        shortlist = n_results * self.shortlist_factor
+        matching = self.count() if rows is None else len(rows)
+        if self.reduced is not None and matching > shortlist:
+            # Sorted so the memory-mapped rows are read front to back
+            rows = np.sort(self.reduced.shortlist(query_embedding, shortlist, rows))
+        if rows is None:
+            scores = self.matrix @ query_embedding
+        else:
+            scores = self.matrix[rows] @ query_embedding
+
+        k = min(n_results, len(scores))
+        if k <= 0:
+            return empty_results()
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            top = np.argsort(-scores, kind="stable")
+        picked = top if rows is None else rows[top]
+
+        results = {
+            "ids": [self.ids[i] for i in picked],
+            "distances": (1.0 - scores[top]).tolist(),
+            "metadatas": [self.metadatas[i] for i in picked],
+            "documents": [self.documents[i] for i in picked]
+        }
+        if include_embeddings:
+            results["embeddings"] = self.matrix[picked]
+        return results
+
+    def get_records(self, ids: List[str], include_embeddings: bool = False) -> Dict[str, Any]:
+        rows = [self.id_to_row[doc_id] for doc_id in ids if doc_id in self.id_to_row]
+        result = {
+            "ids": [self.ids[row] for row in rows],
+            "metadatas": [self.metadatas[row] for row in rows],
+            "documents": [self.documents[row] for row in rows]
+        }
+        if include_embeddings:
+            result["embeddings"] = self.matrix[rows]
+        return result
+
+    def filter_ids(self, where: Optional[dict]) -> List[str]:
+        if not where:
+            return list(self.ids)
+        return [self.ids[row] for row in np.flatnonzero(self.where_mask(where))]
+
+    def get_all_metadatas(self) -> List[Dict[str, Any]]:
+        return list(self.metadatas)
+
+    def get_all_documents(self):
+        return list(self.ids), list(self.documents)
+
+    # ------------------------------------------------------------------
+    # Metadata masks
+
+    def column(self, key: str) -> np.ndarray:
+        """Metadata field as an object array aligned with the matrix rows"""
+        if key not in self._columns:
+            self._columns[key] = np.array(
+                [metadata.get(key) for metadata in self.metadatas], dtype=object
+            )
+        return self._columns[key]
+
+    def where_mask(self, where: Optional[dict]) -> np.ndarray:
+        """Boolean row mask for a where clause"""
+        key = where_key(where)
+        if key not in self._masks:
+            self._masks[key] = where_mask(where, self.column, self.count())
+        return self._masks[key]
+
+    def _invalidate_masks(self):
+        self._columns = {}
+        self._masks = {}
+
+    def search_by_metadata(self, filters: Dict[str, Any], n_results: int = 10) -> Dict[str, Any]:
+        """Search showcases by metadata filters"""
+        where = {key: value for key, value in filters.items() if value is not None}
+        rows = np.flatnonzero(self.where_mask(where))[:n_results]
+        return {
+            "ids": [self.ids[row] for row in rows],
+            "metadatas": [self.metadatas[row] for row in rows],
+            "documents": [self.documents[row] for row in rows]
+        }
+
+    def update_showcase(self, showcase_id: str, metadata: Dict[str, Any], document: str = None):
+        """Update a showcase's metadata and/or document (re-embedding a new document)"""
+        self._check_writable()
+        row = self.id_to_row.get(showcase_id)
+        if row is None:
+            return
+        if document:
+            self.add_records([showcase_id], [document], [metadata])
+        else:
+            self.metadatas[row] = metadata
+            self._invalidate_masks()
+            self.save()
+        self.generation += 1
+
+    def delete_showcase(self, showcase_id: str):
+        """Delete a showcase from the index"""
+        self._check_writable()
+        row = self.id_to_row.pop(showcase_id, None)
+        if row is None:
+            return
+        del self.ids[row], self.documents[row], self.metadatas[row]
+        self.matrix = np.delete(self.matrix, row, axis=0)
+        self.id_to_row = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self._invalidate_masks()
+        self._refit_reduced()
+        self.save()
+        self.generation += 1
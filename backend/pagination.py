@@ -0,0 +1,55 @@
+"""
+Cursor pagination and NDJSON export for /api/showcases
+
+Pages are keyset pages over the showcase id: a page holds the first `limit`
+showcases with an id above the cursor, so the cost of a page does not grow
+with its position in the catalog, and ids being stable across imports keeps
+the order stable while a client pages through a reload. Cursors are opaque
+to clients (base64 of the last id served).
+
+format=ndjson streams the whole catalog, one JSON showcase per line, reading
+and serialising EXPORT_BATCH_ROWS rows at a time (Database.iter_showcase_pages)
+so server memory does not depend on the catalog size.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Iterable, Iterator, List, Optional, Type
+
+from projection import type_adapter
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def encode_cursor(last_id: int) -> str:
+    payload = json.dumps({"after": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Showcase id a cursor continues after (None: from the start); ValueError if malformed"""
+    if not cursor:
+        return None
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        after = json.loads(payload)["after"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(after, int):
+        raise ValueError("Invalid cursor")
+    return after
+
+
+def next_cursor(items: List[Any], more: bool) -> Optional[str]:
+    """Cursor of the page after `items`, or None when there are no `more` showcases"""
+    if not more or not items:
+        return None
+    last = items[-1]
+    return encode_cursor(last["id"] if isinstance(last, dict) else last.id)
+
+
+def ndjson_lines(batches: Iterable[List[Any]], annotation: Type) -> Iterator[bytes]:
+    """One JSON line per item, a chunk per batch"""
+    dump_json = type_adapter(annotation).dump_json
+    for items in batches:
+        yield b"".join(dump_json(item) + b"\n" for item in items)
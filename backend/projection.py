@@ -0,0 +1,75 @@
+"""
+Field projection for list, matching and search responses
+
+List pages and recommendation lists show a handful of fields per showcase,
+while a full Showcase carries the long introduction, artist description and
+review texts. Endpoints take a `fields=` query parameter:
+
+    fields=summary          ShowcaseSummary card views
+    fields=id,title,venue   only these fields (the id is always included)
+
+Showcase projections are pushed down to SQLite (database.RowDecoder selects
+only the projected columns). Responses are serialised straight from the
+models with pydantic's JSON serializer (model_json) instead of being
+validated again against the response model.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from models import Showcase
+
+SUMMARY = "summary"
+
+# Projectable showcase fields (embeddings are never served)
+SHOWCASE_FIELDS = [name for name in Showcase.model_fields if name != "embedding"]
+
+# Keys of the entries returned by the vector search endpoints
+SEARCH_RESULT_FIELDS = [
+    "rank", "id", "similarity", "title", "artist", "genre", "venue", "country",
+    "field_scores", "matched_chunk", "metadata"
+]
+
+# fields=summary for search results: no metadata, scores or chunks
+SEARCH_SUMMARY_FIELDS = ["id", "rank", "similarity", "title", "artist", "genre", "venue"]
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str],
+                 summary: Optional[List[str]] = None) -> Optional[List[str]]:
+    """`fields=` value -> field names, "id" first (None: every field)
+
+    `summary` is what fields=summary stands for. Raises ValueError for names
+    outside `allowed`.
+    """
+    if fields is None or not fields.strip():
+        return None
+    if fields == SUMMARY and summary is not None:
+        return summary
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}; available: {', '.join(allowed)}")
+    return ["id"] + [name for name in names if name != "id"]
+
+
+def project(entries: Iterable[Dict[str, Any]], fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Entries reduced to `fields` (all of them when None)"""
+    if fields is None:
+        return list(entries)
+    return [{name: entry[name] for name in fields if name in entry} for entry in entries]
+
+
+def type_adapter(annotation: Type) -> TypeAdapter:
+    """Cached TypeAdapter for `annotation`"""
+    adapter = _adapters.get(annotation)
+    if adapter is None:
+        adapter = _adapters[annotation] = TypeAdapter(annotation)
+    return adapter
+
+
+def model_json(items: Any, annotation: Type) -> Response:
+    """`items` (typed as `annotation`, e.g. List[Showcase]) as a JSON response"""
+    return Response(type_adapter(annotation).dump_json(items), media_type="application/json")
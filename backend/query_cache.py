@@ -0,0 +1,188 @@
+"""
+Two-tier query cache in front of vector search
+
+Tier 1 maps normalised query text to its embedding and to the results already
+computed for it (per search parameters), so a repeated query skips both the
+embedding call and the ANN search.
+
+Tier 2 (optional) keeps recent query vectors in a small matrix and reuses the
+results of a cached query whose vector is within a cosine threshold of the new
+one. Booker profile queries built from the same genre/venue combinations land
+here even when their text differs slightly.
+
+Both tiers are LRU-bounded and are cleared when the index generation changes.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    EMBEDDING_DIM, QUERY_CACHE_SIZE, QUERY_CACHE_APPROX_SIZE, QUERY_CACHE_THRESHOLD
+)
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class _TextEntry:
+    __slots__ = ("vector", "results")
+
+    def __init__(self, vector: np.ndarray):
+        self.vector = vector
+        self.results: Dict[Hashable, Any] = {}
+
+
+class QueryCache:
+    def __init__(self, max_entries: int = QUERY_CACHE_SIZE,
+                 approx_entries: int = QUERY_CACHE_APPROX_SIZE,
+                 threshold: float = QUERY_CACHE_THRESHOLD,
+                 dim: int = EMBEDDING_DIM):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.generation = None
+        self._lock = threading.Lock()
+
+        # Tier 1: normalised text -> vector + results per params
+        self._exact: "OrderedDict[str, _TextEntry]" = OrderedDict()
+
+        # Tier 2: fixed matrix of unit vectors; slot order in _approx_lru is the LRU order
+        self.approx_entries = approx_entries
+        self._approx_vectors = np.zeros((approx_entries, dim), dtype=np.float32)
+        self._approx_params = [None] * approx_entries
+        self._approx_results = [None] * approx_entries
+        self._approx_lru: "OrderedDict[int, None]" = OrderedDict()
+        # (normalised text, params) -> slot, so a re-put query reuses its slot
+        self._approx_slots: Dict[Tuple[str, Hashable], int] = {}
+        self._approx_keys = [None] * approx_entries
+
+        self.stats = {
+            "exact_hits": 0,
+            "approx_hits": 0,
+            "vector_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0
+        }
+
+    def sync_generation(self, generation) -> None:
+        """Drop everything cached for an older index generation"""
+        if generation == self.generation:
+            return
+        with self._lock:
+            if self.generation is not None:
+                self.stats["invalidations"] += 1
+            self.generation = generation
+            self._exact.clear()
+            self._approx_lru.clear()
+            self._approx_slots.clear()
+            self._approx_params = [None] * self.approx_entries
+            self._approx_results = [None] * self.approx_entries
+            self._approx_keys = [None] * self.approx_entries
+
+    def get(self, text: str, params: Hashable) -> Optional[Any]:
+        """Tier 1 lookup of results for exactly this query text and params"""
+        key = normalize_query(text)
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is not None and params in entry.results:
+                self._exact.move_to_end(key)
+                self.stats["exact_hits"] += 1
+                return entry.results[params]
+        return None
+
+    def get_vector(self, text: str) -> Optional[np.ndarray]:
+        """Cached embedding for this query text, whatever params it was searched with"""
+        key = normalize_query(text)
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is None:
+                return None
+            self._exact.move_to_end(key)
+            self.stats["vector_hits"] += 1
+            return entry.vector
+
+    def get_similar(self, vector: np.ndarray, params: Hashable) -> Optional[Any]:
+        """Tier 2 lookup: results of a cached query within the cosine threshold"""
+        with self._lock:
+            if not self.approx_entries:
+                self.stats["misses"] += 1
+                return None
+            slots = [s for s in self._approx_lru if self._approx_params[s] == params]
+            if slots:
+                sims = self._approx_vectors[slots] @ vector
+                best = int(np.argmax(sims))
+                if sims[best] >= self.threshold:
+                    slot = slots[best]
+                    self._approx_lru.move_to_end(slot)
+                    self.stats["approx_hits"] += 1
+                    return self._approx_results[slot]
+            self.stats["misses"] += 1
+        return None
+
+    def record_miss(self) -> None:
+        """A lookup that skipped tier 2 and missed tier 1"""
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def put(self, text: str, params: Hashable, vector: np.ndarray, results: Any,
+            approximate: bool = True) -> None:
+        """Cache results; `approximate=False` keeps them out of tier 2"""
+        key = normalize_query(text)
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is None:
+                entry = self._exact[key] = _TextEntry(vector)
+                if len(self._exact) > self.max_entries:
+                    self._exact.popitem(last=False)
+                    self.stats["evictions"] += 1
+            else:
+                self._exact.move_to_end(key)
+            entry.results[params] = results
+
+            if self.approx_entries and approximate:
+                slot = self._approx_slots.get((key, params))
+                if slot is not None:
+                    self._approx_lru.move_to_end(slot)
+                elif len(self._approx_lru) < self.approx_entries:
+                    slot = len(self._approx_lru)
+                else:
+                    slot, _ = self._approx_lru.popitem(last=False)
+                    del self._approx_slots[self._approx_keys[slot]]
+                self._approx_vectors[slot] = vector
+                self._approx_params[slot] = params
+                self._approx_results[slot] = results
+                self._approx_keys[slot] = (key, params)
+                self._approx_slots[(key, params)] = slot
+                self._approx_lru[slot] = None
+
+    def put_vector(self, text: str, vector: np.ndarray) -> None:
+        """Remember an embedding before any results exist for it"""
+        key = normalize_query(text)
+        with self._lock:
+            if key not in self._exact:
+                self._exact[key] = _TextEntry(np.asarray(vector, dtype=np.float32))
+                if len(self._exact) > self.max_entries:
+                    self._exact.popitem(last=False)
+                    self.stats["evictions"] += 1
+
+    def vectors(self):
+        """(normalised query text, embedding) of every tier 1 entry, oldest first"""
+        with self._lock:
+            return [(key, entry.vector) for key, entry in self._exact.items()]
+
+    def get_stats(self) -> dict:
+        lookups = self.stats["exact_hits"] + self.stats["approx_hits"] + self.stats["misses"]
+        hits = self.stats["exact_hits"] + self.stats["approx_hits"]
+        return {
+            **self.stats,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "exact_entries": len(self._exact),
+            "approx_entries": len(self._approx_lru),
+            "threshold": self.threshold,
+            "generation": self.generation
+        }
@@ -0,0 +1,74 @@
+"""
+Startup readiness of the API's subsystems
+
+The server accepts requests as soon as the catalog is in SQLite; slower
+subsystems (vector indexes and their embeddings) come up in the background.
+Each subsystem moves pending -> loading -> ready (or failed), and /ready
+reports all of them, with the seconds since process start at which each one
+changed state.
+"""
+import time
+import threading
+from typing import Any, Dict, Optional
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+# Imported early in the process, so this is close enough to "process start"
+_PROCESS_START = time.monotonic()
+
+
+class Readiness:
+    """Thread-safe state of each startup subsystem"""
+
+    def __init__(self, *subsystems: str):
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._state: Dict[str, Dict[str, Any]] = {
+            name: {"status": PENDING, "since_s": None, "error": None} for name in subsystems
+        }
+
+    def _set(self, name: str, status: str, error: Optional[str] = None):
+        with self._lock:
+            self._state[name] = {
+                "status": status,
+                "since_s": round(time.monotonic() - _PROCESS_START, 3),
+                "error": error
+            }
+            if all(s["status"] == READY for s in self._state.values()):
+                self._ready.set()
+            else:
+                self._ready.clear()
+
+    def loading(self, name: str):
+        self._set(name, LOADING)
+
+    def ready(self, name: str):
+        self._set(name, READY)
+
+    def failed(self, name: str, error: str):
+        self._set(name, FAILED, error)
+
+    def is_ready(self, name: Optional[str] = None) -> bool:
+        if name is None:
+            return self._ready.is_set()
+        with self._lock:
+            return self._state[name]["status"] == READY
+
+    def status(self, name: str) -> str:
+        with self._lock:
+            return self._state[name]["status"]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every subsystem is ready (False on timeout)"""
+        return self._ready.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": all(s["status"] == READY for s in self._state.values()),
+                "uptime_s": round(time.monotonic() - _PROCESS_START, 3),
+                "subsystems": {name: dict(state) for name, state in self._state.items()}
+            }
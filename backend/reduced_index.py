@@ -0,0 +1,99 @@
+"""
+Reduced-dimension int8 copy of the vector matrix for two-stage retrieval
+
+Stage 1 scores every row against a low-dimensional int8 projection of the
+catalog (e.g. 128-d instead of 1024-d float32: 32x less memory to scan) and
+keeps a shortlist. Stage 2 rescores only the shortlist against the original
+full-precision vectors, which NumpyVectorStore then leaves memory-mapped on
+disk, so the exact top-k is recovered as long as it made the shortlist.
+
+Projections:
+- "pca": top principal components of the catalog itself. BGE-M3 vectors are
+  strongly anisotropic, so a few hundred components keep nearly all of the
+  ranking signal.
+- "random": Gaussian random projection (Johnson-Lindenstrauss). Data
+  independent and cheaper to fit, but needs more dimensions for the same recall.
+
+Codes are quantised symmetrically per dimension to int8.
+"""
+from typing import Optional
+
+import numpy as np
+
+# PCA is fitted on at most this many rows
+_PCA_SAMPLE = 20000
+
+
+class ReducedIndex:
+    """int8 codes of (x - mean) @ projection for every row"""
+
+    def __init__(self, projection: np.ndarray, mean: np.ndarray,
+                 scales: np.ndarray, codes: np.ndarray, method: str):
+        self.projection = projection  # (dim, reduced_dim) float32
+        self.mean = mean              # (dim,) float32
+        self.scales = scales          # (reduced_dim,) float32
+        self.codes = codes            # (n, reduced_dim) int8
+        self.method = method
+
+    @property
+    def dim(self) -> int:
+        return self.codes.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.scales.nbytes + self.projection.nbytes + self.mean.nbytes
+
+    @classmethod
+    def fit(cls, matrix: np.ndarray, reduced_dim: int = 128, method: str = "pca",
+            seed: int = 0) -> "ReducedIndex":
+        matrix = np.asarray(matrix, dtype=np.float32)
+        n, dim = matrix.shape
+        rng = np.random.default_rng(seed)
+
+        if method == "pca":
+            sample = matrix if n <= _PCA_SAMPLE else matrix[rng.choice(n, _PCA_SAMPLE, replace=False)]
+            mean = sample.mean(axis=0)
+            # Rows of vt are the principal directions, strongest first
+            _, _, vt = np.linalg.svd(sample - mean, full_matrices=False)
+            projection = np.ascontiguousarray(vt[:reduced_dim].T, dtype=np.float32)
+        elif method == "random":
+            mean = np.zeros(dim, dtype=np.float32)
+            projection = (rng.standard_normal((dim, reduced_dim)) / np.sqrt(reduced_dim)).astype(np.float32)
+        else:
+            raise ValueError(f"Unknown reduction method: {method}")
+
+        return cls.from_projection(matrix, projection, mean.astype(np.float32), method)
+
+    @classmethod
+    def from_projection(cls, matrix: np.ndarray, projection: np.ndarray, mean: np.ndarray,
+                        method: str) -> "ReducedIndex":
+        reduced = (np.asarray(matrix, dtype=np.float32) - mean) @ projection
+        scales = np.abs(reduced).max(axis=0) / 127.0 if len(reduced) else np.ones(projection.shape[1])
+        scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+        codes = np.clip(np.rint(reduced / scales), -127, 127).astype(np.int8)
+        return cls(projection, mean, scales, codes, method)
+
+    def scores(self, query_embedding: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Approximate inner products (up to a per-query constant) with the query"""
+        weights = (np.asarray(query_embedding, dtype=np.float32) @ self.projection) * self.scales
+        codes = self.codes if rows is None else self.codes[rows]
+        return codes @ weights
+
+    def shortlist(self, query_embedding: np.ndarray, k: int,
+                  rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Row numbers of the k best approximate matches (restricted to `rows` if given)"""
+        scores = self.scores(query_embedding, rows)
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        return top if rows is None else rows[top]
+
+    def save(self, path: str):
+        np.savez(path, projection=self.projection, mean=self.mean, scales=self.scales,
+                 codes=self.codes, method=np.array(self.method))
+
+    @classmethod
+    def load(cls, path: str) -> "ReducedIndex":
+        data = np.load(path)
+        return cls(data["projection"], data["mean"], data["scales"], data["codes"], str(data["method"]))
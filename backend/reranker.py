@@ -0,0 +1,196 @@
+"""
+Second-stage cross-encoder re-ranking for search results
+
+A cross-encoder (bge-reranker-v2-m3 exported by `export_onnx.py --reranker`)
+reads the query and each candidate document together, which is a much stronger
+relevance signal for long free-text booker surveys than dense cosine alone. It
+is also ~N model calls per query, so the stage is bounded:
+
+- only the top-N dense candidates are scored (N is chosen per request)
+- scores are cached per (query hash, showcase id), so repeated queries and
+  overlapping candidate lists only score what is new
+- scoring runs in small batches against a fixed time budget; if the next batch
+  would not fit, the stage gives up and the dense order is returned unchanged
+
+Ollama has no re-ranking endpoint, so only the in-process ONNX runtime is
+supported. RERANKER_BACKEND=none (the default) disables the stage.
+"""
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config import (
+    RERANKER_BACKEND, RERANKER_MODEL_DIR, RERANK_BUDGET_MS, RERANK_CACHE_SIZE,
+    EMBEDDING_MAX_LENGTH, EMBEDDING_THREADS
+)
+from query_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+class OnnxCrossEncoder:
+    """bge-reranker cross-encoder on ONNX Runtime (CPU)"""
+
+    def __init__(self, model_dir: str = RERANKER_MODEL_DIR, quantized: bool = False,
+                 max_length: int = EMBEDDING_MAX_LENGTH,
+                 intra_op_threads: int = EMBEDDING_THREADS):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_file = "model_int8.onnx" if quantized else "model.onnx"
+        model_path = os.path.join(model_dir, model_file)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"Reranker model not found: {model_path} (run export_onnx.py --reranker first)"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.inter_op_num_threads = 1
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        logger.info(f"Loading reranker {model_path}...")
+        self.session = ort.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        # XLM-RoBERTa pads with <pad> (id 1)
+        self.tokenizer.enable_padding(pad_id=1, pad_token="<pad>")
+
+        self.name = "onnx-int8-bge-reranker" if quantized else "onnx-bge-reranker"
+
+    def score(self, query: str, documents: List[str]) -> np.ndarray:
+        """Relevance in [0, 1] of each document to the query"""
+        if not documents:
+            return np.zeros(0, dtype=np.float32)
+        encoded = self.tokenizer.encode_batch([(query, document) for document in documents])
+        feeds = {
+            "input_ids": np.array([e.ids for e in encoded], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encoded], dtype=np.int64)
+        }
+        feeds = {k: v for k, v in feeds.items() if k in self.input_names}
+        logits = self.session.run(["logits"], feeds)[0].reshape(-1)
+        return (1.0 / (1.0 + np.exp(-logits))).astype(np.float32)
+
+
+class RerankStage:
+    """Budgeted, cached re-ranking of the top-N results of a search"""
+
+    def __init__(self, model, budget_ms: float = RERANK_BUDGET_MS,
+                 cache_size: int = RERANK_CACHE_SIZE, batch_size: int = 4):
+        self.model = model
+        self.budget_ms = budget_ms
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "reranked": 0,
+            "budget_fallbacks": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "last_ms": 0.0
+        }
+
+    def _cached(self, key: tuple) -> Optional[float]:
+        with self._lock:
+            score = self._cache.get(key)
+            if score is not None:
+                self._cache.move_to_end(key)
+            return score
+
+    def _store(self, key: tuple, score: float):
+        with self._lock:
+            self._cache[key] = score
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def rerank(self, query_text: str, results: Dict[str, Any], top_n: int) -> Dict[str, Any]:
+        """Copy of `results` with the first `top_n` reordered by cross-encoder score
+
+        The copy carries "reranked" (False when the budget ran out) and
+        "rerank_scores" (None for entries outside the re-ranked head).
+        """
+        start = time.perf_counter()
+        ids = results["ids"][:top_n]
+        query_hash = hashlib.md5(normalize_query(query_text).encode("utf-8")).hexdigest()
+
+        scores: List[Optional[float]] = [self._cached((query_hash, doc_id)) for doc_id in ids]
+        missing = [i for i, score in enumerate(scores) if score is None]
+        self.stats["cache_hits"] += len(ids) - len(missing)
+        self.stats["cache_misses"] += len(missing)
+
+        batch_ms = 0.0
+        for offset in range(0, len(missing), self.batch_size):
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            # Stop before a batch that would overrun the budget (already scored pairs stay cached)
+            if elapsed_ms + batch_ms > self.budget_ms:
+                self.stats["budget_fallbacks"] += 1
+                self.stats["last_ms"] = round(elapsed_ms, 2)
+                return {**results, "reranked": False, "rerank_scores": [None] * len(results["ids"])}
+            batch = missing[offset:offset + self.batch_size]
+            t0 = time.perf_counter()
+            batch_scores = self.model.score(query_text, [results["documents"][i] for i in batch])
+            batch_ms = (time.perf_counter() - t0) * 1000
+            for i, score in zip(batch, batch_scores):
+                scores[i] = float(score)
+                self._store((query_hash, ids[i]), float(score))
+
+        order = sorted(range(len(ids)), key=lambda i: scores[i], reverse=True)
+        order += list(range(len(ids), len(results["ids"])))
+        # Every per-result list moves together (hybrid "scores", "field_scores", ...)
+        reranked = {
+            key: [value[i] for i in order]
+            for key, value in results.items()
+            if isinstance(value, list) and len(value) == len(results["ids"])
+        }
+        reranked["rerank_scores"] = [scores[i] if i < len(ids) else None for i in order]
+        reranked["reranked"] = True
+
+        self.stats["reranked"] += 1
+        self.stats["last_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return reranked
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "model": self.model.name,
+            "budget_ms": self.budget_ms,
+            "cache_entries": len(self._cache)
+        }
+
+
+_stage = None
+_stage_loaded = False
+_stage_lock = threading.Lock()
+
+
+def get_rerank_stage() -> Optional[RerankStage]:
+    """Shared rerank stage for RERANKER_BACKEND, loaded on first use (None when disabled)"""
+    global _stage, _stage_loaded
+    if _stage_loaded:
+        return _stage
+    with _stage_lock:
+        if not _stage_loaded:
+            name = RERANKER_BACKEND.lower()
+            try:
+                if name == "onnx":
+                    _stage = RerankStage(OnnxCrossEncoder(quantized=False))
+                elif name in ("onnx-int8", "onnx_int8"):
+                    _stage = RerankStage(OnnxCrossEncoder(quantized=True))
+                elif name != "none":
+                    logger.error(f"Unknown reranker backend: {name}")
+            except Exception as e:
+                logger.error(f"Reranker unavailable, keeping dense order: {e}")
+            _stage_loaded = True
+    return _stage
@@ -0,0 +1,127 @@
+"""
+Compact in-memory sparse lexical index and reciprocal rank fusion
+
+Postings are stored per term as two numpy arrays (document rows, weights), so a
+query touches only the postings of its own terms. Weights are either BM25
+scores over our own tokenizer, or BGE-M3 lexical weights when the embedding
+backend can produce them.
+
+Tokenization keeps Latin words whole and adds Hangul character bigrams, since
+Korean particles attach to nouns ("판소리를", "판소리의") and whitespace alone
+would miss exact title/artist matches.
+"""
+import re
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_LATIN_RE = re.compile(r"[a-z0-9]+")
+_HANGUL_RE = re.compile(r"[가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased Latin words plus Hangul words and their character bigrams"""
+    if not text:
+        return []
+    text = text.lower()
+    tokens = _LATIN_RE.findall(text)
+    for word in _HANGUL_RE.findall(text):
+        tokens.append(word)
+        if len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class SparseIndex:
+    """Inverted index of term -> (doc rows, weights) numpy posting lists"""
+
+    def __init__(self, ids: List[str], postings: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                 use_bm25: bool):
+        self.ids = ids
+        self.postings = postings
+        self.use_bm25 = use_bm25
+
+    @classmethod
+    def from_texts(cls, ids: List[str], texts: List[str],
+                   k1: float = 1.2, b: float = 0.75) -> "SparseIndex":
+        """BM25 index; per-posting weights are precomputed so queries only add"""
+        term_freqs = [Counter(tokenize(text)) for text in texts]
+        lengths = np.array([sum(tf.values()) for tf in term_freqs], dtype=np.float32)
+        avg_length = float(lengths.mean()) if len(lengths) and lengths.mean() > 0 else 1.0
+
+        rows = defaultdict(list)
+        freqs = defaultdict(list)
+        for row, tf in enumerate(term_freqs):
+            for term, count in tf.items():
+                rows[term].append(row)
+                freqs[term].append(count)
+
+        n_docs = len(texts)
+        postings = {}
+        for term, term_rows in rows.items():
+            doc_rows = np.array(term_rows, dtype=np.int32)
+            tf = np.array(freqs[term], dtype=np.float32)
+            idf = math.log(1 + (n_docs - len(doc_rows) + 0.5) / (len(doc_rows) + 0.5))
+            norm = k1 * (1 - b + b * lengths[doc_rows] / avg_length)
+            postings[term] = (doc_rows, (idf * tf * (k1 + 1) / (tf + norm)).astype(np.float32))
+
+        return cls(ids, postings, use_bm25=True)
+
+    @classmethod
+    def from_lexical_weights(cls, ids: List[str],
+                             weights: List[Dict[str, float]]) -> "SparseIndex":
+        """Index BGE-M3 lexical weights (token -> weight per document)"""
+        rows = defaultdict(list)
+        values = defaultdict(list)
+        for row, doc_weights in enumerate(weights):
+            for term, weight in doc_weights.items():
+                rows[str(term)].append(row)
+                values[str(term)].append(float(weight))
+
+        postings = {
+            term: (np.array(term_rows, dtype=np.int32), np.array(values[term], dtype=np.float32))
+            for term, term_rows in rows.items()
+        }
+        return cls(ids, postings, use_bm25=False)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search_weights(self, query_weights: Dict[str, float], k: int = 10,
+                       mask: Optional[np.ndarray] = None) -> List[Tuple[str, float]]:
+        """Top-k (id, score) for a weighted bag of query terms"""
+        if k <= 0:
+            return []
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for term, query_weight in query_weights.items():
+            posting = self.postings.get(str(term))
+            if posting is not None:
+                # Each document appears at most once per posting list
+                scores[posting[0]] += query_weight * posting[1]
+
+        if mask is not None:
+            scores[~mask] = 0.0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self.ids[i], float(scores[i])) for i in candidates]
+
+    def search(self, query_text: str, k: int = 10,
+               mask: Optional[np.ndarray] = None) -> List[Tuple[str, float]]:
+        """Top-k (id, score) for a free-text query using the index tokenizer"""
+        return self.search_weights(Counter(tokenize(query_text)), k, mask)
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60,
+                           weights: Optional[List[float]] = None) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: score(d) = sum_i w_i / (k + rank_i(d))"""
+    weights = weights or [1.0] * len(rankings)
+    fused = defaultdict(float)
+    for ranking, weight in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking, 1):
+            fused[doc_id] += weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
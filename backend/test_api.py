@@ -4,6 +4,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from fastapi import Response
 from models import SimilarityRequest
 from database import Database
 from chroma_store import ChromaVectorStore
@@ -18,7 +19,7 @@ def test_search_api():
         print(f"Created request: {request}")
 
         # Call the search function directly
-        result = search_chroma(request)
+        result = search_chroma(request, Response())
         print(f"Success! Result: {result}")
 
     except Exception as e:
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+# Delta catalog imports: natural-key upserts keep ids stable, deletes and edits
+# reach the FTS5 index, and the vector index re-embeds only changed rows
+
+import sys
+import os
+import re
+import csv
+import shutil
+import sqlite3
+import hashlib
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from database import Database, FTS_TRIGGERS
+from embedding_backends import EmbeddingBackend, normalize_rows
+from vector_store import create_vector_store
+from editions import Edition
+
+SAMPLE_ROWS = 8
+
+
+class CountingBackend(EmbeddingBackend):
+    """Deterministic bag-of-words vectors; counts the texts it embeds"""
+    name = "counting"
+    dim = 64
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts, batch_size=8):
+        self.encoded += len(texts)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                vectors[i, int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1
+        return normalize_rows(vectors)
+
+
+def write_rows(path, header, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def keyword_ids(db, query):
+    return sorted(result["id"] for result in db.search_keyword(query, snippets=False))
+
+
+def titles(db):
+    return {showcase.id: showcase.title for showcase in db.get_all_showcases()}
+
+
+def test_catalog_import(csv_path: str = "PAMS.csv"):
+    print("=== Delta catalog import ===")
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for _, row in zip(range(SAMPLE_ROWS), reader)]
+    review = header.index("Review")
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        catalog_csv = os.path.join(work_dir, "catalog.csv")
+        write_rows(catalog_csv, header, rows)
+        db = Database(os.path.join(work_dir, "showcases.db"))
+        backend = CountingBackend()
+        store = create_vector_store("numpy", embedding_backend=backend,
+                                    path=os.path.join(work_dir, "vector_index"))
+        edition = Edition("test", catalog_csv, store, os.path.join(work_dir, "edition"))
+        os.makedirs(edition.state_dir)
+
+        # First import: every row inserted, FTS index rebuilt with its triggers
+        changes = db.load_from_csv(catalog_csv)
+        assert changes.inserted == list(range(1, SAMPLE_ROWS + 1)), changes.summary()
+        assert not (changes.updated or changes.deleted)
+        conn = sqlite3.connect(db.db_path)
+        triggers = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        fts_rows = conn.execute("SELECT COUNT(*) FROM showcases_fts").fetchone()[0]
+        conn.close()
+        assert triggers == set(FTS_TRIGGERS), triggers
+        assert fts_rows == SAMPLE_ROWS
+        before = titles(db)
+        edition.load(changes=changes)
+        assert backend.encoded == SAMPLE_ROWS and store.count() == SAMPLE_ROWS
+        print(f"first import: {changes.summary()}, embedded {backend.encoded}")
+
+        # Edit one row: updated in place, FTS follows, one row re-embedded
+        rows[0][review] = "zebracorn review"
+        write_rows(catalog_csv, header, rows)
+        generation = db.generation
+        changes = db.load_from_csv(catalog_csv)
+        assert changes.updated == [1] and not (changes.inserted or changes.deleted), changes.summary()
+        assert changes.unchanged == SAMPLE_ROWS - 1
+        assert db.generation == generation + 1
+        assert titles(db) == before
+        assert keyword_ids(db, "zebracorn") == [1]
+        backend.encoded = 0
+        edition.load(changes=changes)
+        assert backend.encoded == 1, backend.encoded
+        print(f"edit: {changes.summary()}, embedded {backend.encoded}")
+
+        # Delete one row: the other ids stay, nothing is embedded
+        deleted_title = rows[1][header.index("Title")]
+        assert 2 in keyword_ids(db, deleted_title)
+        del rows[1]
+        write_rows(catalog_csv, header, rows)
+        changes = db.load_from_csv(catalog_csv)
+        assert changes.deleted == [2] and not (changes.inserted or changes.updated), changes.summary()
+        expected = {k: v for k, v in before.items() if k != 2}
+        assert titles(db) == expected
+        assert 2 not in keyword_ids(db, deleted_title)
+        backend.encoded = 0
+        edition.load(changes=changes)
+        assert backend.encoded == 0 and store.count() == SAMPLE_ROWS - 1
+        assert "pams_2" not in edition.ids and edition.ids[0] == "pams_1"
+        print(f"delete: {changes.summary()}, embedded {backend.encoded}")
+
+        # Re-importing the same CSV changes nothing
+        generation = db.generation
+        changes = db.load_from_csv(catalog_csv)
+        assert not changes.changed and changes.unchanged == SAMPLE_ROWS - 1, changes.summary()
+        assert db.generation == generation
+        backend.encoded = 0
+        edition.load(changes=changes)
+        assert backend.encoded == 0
+        print(f"no-op reimport: {changes.summary()}, embedded {backend.encoded}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print("Delta import OK")
+
+
+if __name__ == "__main__":
+    test_catalog_import()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+# Genre preferences -> profile filter: the values the survey page sends must
+# select the same showcases MatchingService scores as genre matches
+
+import sys
+import os
+import csv
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models import BookerProfile
+from ingest import normalize_record, to_metadata
+from metadata_filter import ProfileFilter, catalog_genres, resolve_genres, where_mask
+
+# BookerMatchingPage.js genre options
+SURVEY_GENRES = ['traditional', 'contemporary', 'dance', 'music', 'theater', 'multidisciplinary']
+
+
+def profile(genres):
+    return BookerProfile(name="booker", preferred_genres=genres)
+
+
+def test_resolve_genres():
+    print("=== Genre preference resolution ===")
+    genres = catalog_genres([])
+    assert resolve_genres(["multidisciplinary"], genres) == ["multidisciplinary_others"]
+    assert resolve_genres(["multidisciplinary_others"], genres) == ["multidisciplinary_others"]
+    assert resolve_genres(["dance"], genres) == ["dance"]
+    assert resolve_genres(["contemporary"], genres) == []
+
+    where = ProfileFilter.from_profile(profile(["multidisciplinary"]), {}).where
+    assert where == {"genre_multidisciplinary_others": True}, where
+    where = ProfileFilter.from_profile(profile(["Multidisciplinary/Others"]), {}).where
+    assert where == {"genre_multidisciplinary_others": True}, where
+
+    # Unknown genres are dropped with a note, never an empty result
+    unknown = ProfileFilter.from_profile(profile(["contemporary"]), {})
+    assert unknown.where is None and not unknown.matches_nothing and unknown.notes
+    mixed = ProfileFilter.from_profile(profile(["dance", "contemporary"]), {})
+    assert mixed.where == {"genre_dance": True} and len(mixed.notes) == 1
+
+    # Tags outside the canonical list are picked up from the catalog
+    genres = catalog_genres([{"genre_contemporary_dance": True, "genre_dance": False}])
+    assert resolve_genres(["contemporary"], genres) == ["contemporary_dance"]
+    assert resolve_genres(["dance"], genres) == ["contemporary_dance", "dance"]
+    print("Resolution OK")
+
+
+def test_survey_genres_match_matching_service(csv_path: str = "PAMS.csv"):
+    print("=== Survey genres: filter vs MatchingService substring match ===")
+    if not os.path.exists(csv_path):
+        print(f"{csv_path} not found, skipped")
+        return
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        records = [normalize_record(row) for row in csv.DictReader(f)]
+    metadatas = [to_metadata(record) for record in records]
+    genres = catalog_genres(metadatas)
+
+    def column(key):
+        return [metadata.get(key) for metadata in metadatas]
+
+    for genre in SURVEY_GENRES:
+        profile_filter = ProfileFilter.from_profile(profile([genre]), {}, genres)
+        mask = where_mask(profile_filter.where, column, len(metadatas))
+        expected = [any(genre in tag.lower() for tag in record["genre_tags"]) for record in records]
+        if profile_filter.where is None:
+            # Unfiltered: only allowed when MatchingService matches nothing either
+            assert not any(expected), genre
+            print(f"{genre:18} not filtered ({profile_filter.notes[0]})")
+        else:
+            assert mask.tolist() == expected, genre
+            print(f"{genre:18} {int(mask.sum())} showcases")
+    print("Survey genres OK")
+
+
+if __name__ == "__main__":
+    test_resolve_genres()
+    test_survey_genres_match_matching_service()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+# Parity check: ONNX Runtime (fp32 and int8) dense vectors vs the FlagEmbedding/torch output
+
+import sys
+import os
+import csv
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+from config import ONNX_MODEL_DIR
+from embedding_backends import TorchBGEM3Backend, OnnxBGEM3Backend
+
+MIN_COSINE = 0.99
+
+
+def load_sample_texts(csv_path: str = "PAMS.csv", limit: int = 12):
+    texts = [
+        "rock music concert",
+        "Contemporary dance performance with electronic music",
+        "판소리 공연",
+        "전통 음악과 현대무용의 만남",
+        "Gamblerz"
+    ]
+    if os.path.exists(csv_path):
+        with open(csv_path, encoding="utf-8-sig", newline="") as f:
+            for i, row in enumerate(csv.DictReader(f)):
+                if i >= limit:
+                    break
+                texts.append(" | ".join(
+                    f"{key}: {row[key]}" for key in
+                    ("Title", "Artist", "Genre", "Introduction to the work")
+                    if row.get(key)
+                ))
+    return texts
+
+
+def test_onnx_parity():
+    print("=== ONNX / torch parity for BGE-M3 dense vectors ===")
+    pytest.importorskip("FlagEmbedding")
+    pytest.importorskip("onnxruntime")
+    if not os.path.exists(ONNX_MODEL_DIR):
+        pytest.skip(f"{ONNX_MODEL_DIR} not found: export the model with export_onnx.py")
+    texts = load_sample_texts()
+    reference = TorchBGEM3Backend(use_fp16=False).encode(texts)
+
+    for quantized in (False, True):
+        backend = OnnxBGEM3Backend(quantized=quantized)
+        vectors = backend.encode(texts)
+
+        # Both sides are unit vectors, so the row-wise dot product is the cosine
+        cosines = np.sum(reference * vectors, axis=1)
+        print(f"{backend.name}: min cosine {cosines.min():.4f}, mean {cosines.mean():.4f}")
+        assert cosines.min() >= MIN_COSINE, f"{backend.name} parity below {MIN_COSINE}"
+
+    print("Parity OK")
+
+
+if __name__ == "__main__":
+    test_onnx_parity()
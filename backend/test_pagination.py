@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+# /api/showcases cursor pagination and NDJSON export against the plain listing
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from database import Database
+from pagination import encode_cursor, decode_cursor
+import main
+
+PAGE_LIMIT = 4
+
+
+def walk_pages(client, query=""):
+    """Every item of /api/showcases?limit=PAGE_LIMIT, following next_cursor until it runs out"""
+    items, cursor, pages = [], None, 0
+    while True:
+        url = f"/api/showcases?limit={PAGE_LIMIT}{query}" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        pages += 1
+        assert len(page["items"]) <= PAGE_LIMIT
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items, pages, page["total"]
+        assert len(page["items"]) == PAGE_LIMIT
+
+
+def test_cursor_encoding():
+    assert decode_cursor(None) is None and decode_cursor("") is None
+    for last_id in (0, 1, 17, 10 ** 9):
+        assert decode_cursor(encode_cursor(last_id)) == last_id
+    for cursor in ("xx!", "eyJhIjoxfQ", encode_cursor(1)[:-2] + "@@", "bnVsbA"):
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            continue
+        raise AssertionError(f"cursor {cursor!r} accepted")
+
+
+def test_pagination(csv_path: str = "PAMS.csv"):
+    print("=== /api/showcases pagination ===")
+    work_dir = tempfile.mkdtemp()
+    previous_db = main.db
+    try:
+        main.db = Database(os.path.join(work_dir, "showcases.db"))
+        main.db.load_from_csv(csv_path)
+        # No lifespan: the listing only needs the catalog
+        client = TestClient(main.app)
+        listing = client.get("/api/showcases").json()
+        assert len(listing) > PAGE_LIMIT
+
+        items, pages, total = walk_pages(client)
+        assert items == listing and total == len(listing)
+        assert pages == -(-len(listing) // PAGE_LIMIT)
+        print(f"{len(items)} showcases in {pages} pages of {PAGE_LIMIT}")
+
+        summaries, _, _ = walk_pages(client, "&fields=summary")
+        assert summaries == client.get("/api/showcases?fields=summary").json()
+
+        # A page ending exactly at the last showcase has no next cursor
+        page = client.get(f"/api/showcases?limit={len(listing)}").json()
+        assert page["items"] == listing and page["next_cursor"] is None
+        page = client.get(f"/api/showcases?cursor={encode_cursor(listing[-1]['id'])}").json()
+        assert page["items"] == [] and page["next_cursor"] is None
+
+        # NDJSON export, read in small batches
+        main.EXPORT_BATCH_ROWS, batch_rows = 5, main.EXPORT_BATCH_ROWS
+        try:
+            batches = list(main.db.iter_showcase_pages(None, 5))
+            assert [len(batch) for batch in batches[:-1]] == [5] * (len(batches) - 1)
+            response = client.get("/api/showcases?format=ndjson")
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            assert response.headers["content-type"] == "application/x-ndjson"
+            assert int(response.headers["x-total-count"]) == len(listing)
+            assert lines == listing
+            resumed = client.get(f"/api/showcases?format=ndjson&fields=id,title"
+                                 f"&cursor={encode_cursor(listing[PAGE_LIMIT - 1]['id'])}")
+            assert [json.loads(line) for line in resumed.text.splitlines()] == [
+                {"id": s["id"], "title": s["title"]} for s in listing[PAGE_LIMIT:]
+            ]
+        finally:
+            main.EXPORT_BATCH_ROWS = batch_rows
+        print(f"ndjson: {len(lines)} lines in {len(batches)} batches")
+
+        for url in ("/api/showcases?cursor=xx!", "/api/showcases?cursor=eyJhIjoxfQ",
+                    "/api/showcases?limit=0", f"/api/showcases?limit={main.SHOWCASE_PAGE_MAX_LIMIT + 1}"):
+            assert client.get(url).status_code == 400, url
+    finally:
+        main.db = previous_db
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print("Pagination OK")
+
+
+if __name__ == "__main__":
+    test_cursor_encoding()
+    test_pagination()
@@ -0,0 +1,750 @@
+"""
+Vector store interface shared by the showcase index backends
+
+`VectorStore` owns everything that does not depend on where the vectors live:
+CSV record preparation, query embedding, the query cache, the sparse index and
+hybrid fusion. Backends implement the storage primitives (add, clear, query by
+vector, fetch by id) on top of it:
+
+- ChromaVectorStore (chroma_store.py): persistent Chroma collection with HNSW
+- NumpyVectorStore (numpy_store.py): exact in-memory search, one GEMV per query
+
+Searches accept an optional Chroma-style `where` clause (see metadata_filter.py)
+that every backend applies inside the search rather than after it, and can be
+diversified with MMR (see diversity.py) and re-ranked by a cross-encoder
+(see reranker.py). mode="fields" scores per-field vectors with query-time
+weights instead of the single document vector (see field_index.py), and
+mode="chunks" pools overlapping chunks of long documents back to showcases
+(see chunk_index.py).
+
+Use create_vector_store() to get the backend selected by VECTOR_BACKEND.
+"""
+import os
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    VECTOR_BACKEND, CHROMA_DIR, VECTOR_INDEX_DIR, CATALOG_YEAR, FIELD_VECTORS, FIELD_WEIGHTS,
+    CHUNK_INDEX, CHUNK_WORDS, CHUNK_OVERLAP, CHUNK_BATCH_SIZE, CHUNK_POOLING, INDEX_VERSION_GRACE_S
+)
+from embedding_backends import EmbeddingBackend, get_embedding_backend
+from sparse_index import SparseIndex, reciprocal_rank_fusion
+from query_cache import QueryCache
+from metadata_filter import ProfileFilter, catalog_genres, where_key
+from ingest import normalize_record, to_metadata, ingest_csv
+from diversity import mmr_select
+from reranker import get_rerank_stage
+from field_index import FieldIndex, parse_field_weights, validate_field_weights
+from chunk_index import ChunkIndex
+from index_versions import VersionPointer
+
+logger = logging.getLogger(__name__)
+
+
+def _present(value) -> bool:
+    """pandas.notna for a single cell, without importing pandas"""
+    return value is not None and not (isinstance(value, float) and value != value)
+
+
+def empty_results(with_scores: bool = False) -> Dict[str, Any]:
+    results = {"ids": [], "distances": [], "metadatas": [], "documents": []}
+    if with_scores:
+        results["scores"] = []
+    return results
+
+
+class VectorStore:
+    """Base class for showcase vector indexes (cosine distance, 0 = identical)"""
+
+    backend_name = "base"
+    # Year for schedule dates without one; editions of other years override it
+    catalog_year = CATALOG_YEAR
+
+    def __init__(self, embedding_backend: EmbeddingBackend = None):
+        # BGE-M3 embeddings from the configured backend (Ollama by default)
+        self.embedding_backend = embedding_backend or get_embedding_backend()
+        logger.info(f"Using {self.embedding_backend.name} for embeddings")
+
+        # Lexical index for hybrid search, built on load or on first use
+        self.sparse_index = None
+
+        # Per-field vectors for mode="fields", built on load when FIELD_VECTORS is set
+        self.field_index = None
+        self.field_weights = parse_field_weights(FIELD_WEIGHTS)
+
+        # Overlapping chunks of long documents for mode="chunks"
+        self.chunk_index = None
+
+        # Query cache, invalidated whenever the index generation changes
+        self.generation = 0
+        self.query_cache = QueryCache(dim=self.embedding_backend.dim)
+
+        # Alias pointer and the version of the index this store serves, set
+        # by backends that persist their index (see index_versions.py)
+        self.versions: Optional[VersionPointer] = None
+        self.version: Optional[str] = None
+        # Follower workers open the leader's published index read-only (see workers.py)
+        self.read_only = False
+
+        # venue_id -> venue name, rebuilt when the generation changes
+        self._filter_terms = None
+        self._filter_terms_generation = None
+
+    # ------------------------------------------------------------------
+    # Storage primitives implemented by each backend
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def _check_writable(self):
+        if self.read_only:
+            raise RuntimeError(f"Index {self.version} is open read-only (written by the leader worker)")
+
+    def add_records(self, ids: List[str], documents: List[str],
+                    metadatas: List[Dict[str, Any]], embeddings=None):
+        """Add records; `embeddings` (one row per record) is computed when omitted"""
+        raise NotImplementedError
+
+    def _clear(self):
+        raise NotImplementedError
+
+    def query_vector(self, query_embedding: np.ndarray, n_results: int,
+                     where: Optional[dict] = None,
+                     include_embeddings: bool = False) -> Dict[str, Any]:
+        """Top-n records matching `where` for a unit query vector, nearest first"""
+        raise NotImplementedError
+
+    def filter_ids(self, where: Optional[dict]) -> List[str]:
+        """Ids of every record matching `where`"""
+        raise NotImplementedError
+
+    def create_version(self) -> "VectorStore":
+        """Empty new version of this index, to build into while this one serves"""
+        raise NotImplementedError
+
+    def _drop_version(self, name: str):
+        """Delete the persisted index of version `name`"""
+        raise NotImplementedError
+
+    def get_all_metadatas(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_records(self, ids: List[str], include_embeddings: bool = False) -> Dict[str, Any]:
+        """Records for `ids` as {"ids", "metadatas", "documents"[, "embeddings"]}"""
+        raise NotImplementedError
+
+    def get_all_documents(self) -> Tuple[List[str], List[str]]:
+        raise NotImplementedError
+
+    def get_showcase_by_id(self, showcase_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific showcase by its ID"""
+        result = self.get_records([showcase_id])
+        if result["ids"]:
+            return {
+                "id": result["ids"][0],
+                "metadata": result["metadatas"][0] if result["metadatas"] else {},
+                "document": result["documents"][0] if result["documents"] else ""
+            }
+        return None
+
+    def count_matching(self, where: Optional[dict] = None) -> int:
+        return self.count() if not where else len(self.filter_ids(where))
+
+    def filter_terms(self) -> Tuple[Dict[str, str], List[str]]:
+        """venue_id -> PAMS venue name and the genre slugs, over every document in the index"""
+        if self._filter_terms is None or self._filter_terms_generation != self.generation:
+            metadatas = self.get_all_metadatas()
+            venue_names = {
+                metadata["venue_id"]: metadata.get("PAMS Venue", metadata["venue_id"])
+                for metadata in metadatas if metadata.get("venue_id")
+            }
+            self._filter_terms = (venue_names, catalog_genres(metadatas))
+            self._filter_terms_generation = self.generation
+        return self._filter_terms
+
+    def profile_filter(self, profile) -> ProfileFilter:
+        """Booker profile constraints as a where clause over this index"""
+        venue_names, genres = self.filter_terms()
+        return ProfileFilter.from_profile(profile, venue_names, genres)
+
+    # ------------------------------------------------------------------
+    # Versions (see index_versions.py)
+
+    def validate(self, expected_count: int, samples: int = 3) -> List[str]:
+        """Problems that should keep this freshly built version from being published
+
+        Checks the document count, that a few stored vectors find themselves
+        (index integrity) and that a text query goes through the embedding
+        backend and returns results.
+        """
+        problems = []
+        count = self.count()
+        if count != expected_count:
+            problems.append(f"{count} documents, expected {expected_count}")
+        if count == 0:
+            return problems
+
+        ids = self.filter_ids(None)
+        sample_ids = [ids[i] for i in np.linspace(0, len(ids) - 1, min(samples, len(ids))).astype(int)]
+        stored = self.get_records(sample_ids, include_embeddings=True)
+        for doc_id, metadata, embedding in zip(stored["ids"], stored["metadatas"], stored["embeddings"]):
+            if not np.any(embedding):
+                problems.append(f"{doc_id} has a zero vector")
+                continue
+            hit = self.query_vector(np.asarray(embedding, dtype=np.float32), 1)
+            if not hit["ids"] or hit["distances"][0] > 1e-3:
+                problems.append(f"{doc_id} is not its own nearest neighbour")
+
+        title = stored["metadatas"][0].get("Title") if stored["metadatas"] else None
+        if title and not self.search_similar(str(title), n_results=1)["ids"]:
+            problems.append(f"sample query {title!r} returned nothing")
+        return problems
+
+    def build_version(self, csv_path: str = "PAMS.csv", embeddings=None,
+                      doc_ids: Optional[List[str]] = None) -> "VectorStore":
+        """Load the CSV into a new, validated but unpublished version of this index
+
+        Raises RuntimeError (after dropping the new version) when it fails validation.
+        """
+        self._check_writable()
+        version = self.create_version()
+        try:
+            version.load_pams_data(csv_path, embeddings=embeddings, doc_ids=doc_ids)
+            ids, _, _ = version.prepare_pams_records(csv_path, doc_ids)
+            problems = version.validate(len(ids))
+            if problems:
+                raise RuntimeError(f"New index version failed validation: {'; '.join(problems)}")
+        except Exception:
+            version.abandon()
+            raise
+        return version
+
+    def publish(self, live: "VectorStore"):
+        """Make this validated version the one the alias names, replacing `live`
+
+        `live` keeps answering the requests already running on it; its version
+        is retired and dropped by gc_versions() after the grace period. This
+        store inherits live's cached query embeddings, so queries seen before
+        the flip still skip the embedding call.
+        """
+        if self.versions is not None:
+            self.versions.publish(self.version, previous=live.version)
+        self.query_cache.sync_generation(self.generation)
+        for query_text, vector in live.query_cache.vectors():
+            self.query_cache.put_vector(query_text, vector)
+
+    def abandon(self):
+        """Drop this version after a failed build or validation"""
+        if self.versions is not None:
+            self.versions.abandon(self.version)
+            self._drop_version(self.version)
+
+    def gc_versions(self, grace_s: float = INDEX_VERSION_GRACE_S) -> List[str]:
+        """Drop versions retired more than `grace_s` seconds ago; returns their names"""
+        # Read-only stores (followers, index artifacts) never touch the pointer
+        if self.versions is None or self.read_only:
+            return []
+        expired = [name for name in self.versions.expired(grace_s) if name != self.version]
+        for name in expired:
+            self._drop_version(name)
+            logger.info(f"Dropped index version {name}")
+        self.versions.forget(expired)
+        return expired
+
+    def reset_collection(self):
+        """Reset the entire index"""
+        self._clear()
+        self.sparse_index = None
+        self.field_index = None
+        self.chunk_index = None
+        self.generation += 1
+        logger.info("Collection reset successfully")
+
+    # ------------------------------------------------------------------
+    # Ingest
+
+    def prepare_records(self, rows: List[Dict[str, Any]], first_row: int = 0,
+                        doc_ids: Optional[List[str]] = None):
+        """ids, document texts and metadata for a chunk of raw CSV rows (see ingest.read_csv_chunks)
+
+        `doc_ids` are the ids of every CSV row ("pams_<catalog id>", from the
+        catalog import's ChangeSet).
+        """
+        ids, documents, metadatas = [], [], []
+        for offset, row in enumerate(rows):
+            # Create text representation for embedding
+            documents.append(self._create_document_text(row))
+
+            # All columns as metadata; Chroma does not accept None values
+            metadata = {col: value for col, value in row.items() if value is not None}
+            # Normalised typed fields used by filters and scoring
+            metadata.update(to_metadata(normalize_record(row, self.catalog_year)))
+            metadatas.append(metadata)
+            # Without catalog ids, CSV row + 1: the ids a fresh catalog import assigns
+            ids.append(doc_ids[first_row + offset] if doc_ids is not None
+                       else f"pams_{first_row + offset + 1}")
+        return ids, documents, metadatas
+
+    def prepare_pams_records(self, csv_path: str = "PAMS.csv", doc_ids: Optional[List[str]] = None):
+        """Build ids, document texts and metadata for every row of the CSV"""
+        records = RecordCollector(self, doc_ids)
+        count = ingest_csv(csv_path, records)
+        logger.info(f"Loaded {count} rows from {csv_path}")
+        return records.ids, records.documents, records.metadatas
+
+    def indexer(self, embeddings=None, doc_ids: Optional[List[str]] = None) -> "RecordIndexer":
+        """Ingest sink that (re)loads this index from CSV chunks; see load_pams_data"""
+        return RecordIndexer(self, embeddings, doc_ids)
+
+    def begin_bulk(self):
+        """Many add_records() calls follow; backends may defer per-call work until end_bulk()"""
+
+    def end_bulk(self):
+        pass
+
+    def load_pams_data(self, csv_path: str = "PAMS.csv", embeddings=None,
+                       doc_ids: Optional[List[str]] = None):
+        """Load PAMS data from CSV and create embeddings
+
+        `embeddings` may hold precomputed vectors (one row per CSV row, e.g. an
+        EmbeddingSnapshot from embedding_pool.encode_catalog); otherwise the
+        embedding backend encodes the documents. `doc_ids` gives the catalog id
+        of every row (ChangeSet.doc_ids); see prepare_records.
+        """
+        if not os.path.exists(csv_path):
+            logger.error(f"CSV file not found: {csv_path}")
+            return
+
+        # Parsed, embedded and added chunk by chunk
+        count = ingest_csv(csv_path, self.indexer(embeddings, doc_ids))
+        logger.info(f"Successfully embedded {count} documents")
+
+    def build_sparse_index(self, ids: List[str], documents: List[str]):
+        """Build the lexical side of hybrid search next to the dense vectors"""
+        if self.embedding_backend.supports_sparse:
+            weights = self.embedding_backend.encode_sparse(documents)
+            self.sparse_index = SparseIndex.from_lexical_weights(ids, weights)
+        else:
+            self.sparse_index = SparseIndex.from_texts(ids, documents)
+        logger.info(
+            f"Built {'BM25' if self.sparse_index.use_bm25 else 'BGE-M3 lexical'} index "
+            f"with {len(self.sparse_index.postings)} terms"
+        )
+
+    def build_field_index(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        """Embed the per-field texts of every showcase (metadata holds the CSV columns)"""
+        self.field_index = FieldIndex.build(
+            ids, metadatas, self.embedding_backend.encode, self.embedding_backend.dim
+        )
+        logger.info(
+            f"Built field index: {int(self.field_index.present.sum())} field vectors "
+            f"for {len(ids)} showcases"
+        )
+
+    def build_chunk_index(self, ids: List[str], documents: List[str],
+                          metadatas: List[Dict[str, Any]]):
+        """Split, batch-embed and index overlapping chunks of every document"""
+        self.chunk_index = ChunkIndex.build(
+            ids, documents, [metadata.get("Title") for metadata in metadatas],
+            self.embedding_backend.encode, CHUNK_WORDS, CHUNK_OVERLAP, CHUNK_BATCH_SIZE
+        )
+        logger.info(
+            f"Built chunk index: {len(self.chunk_index.chunks)} chunks for {len(ids)} showcases "
+            f"({self.chunk_index.nbytes / 1024:.0f} KiB)"
+        )
+
+    def _create_document_text(self, row) -> str:
+        """Create text representation of a showcase for embedding"""
+        text_parts = []
+
+        # Key fields for embedding - using actual column names from PAMS.csv
+        if _present(row.get('Title')):
+            text_parts.append(f"Title: {row['Title']}")
+
+        if _present(row.get('Artist')):
+            text_parts.append(f"Artist: {row['Artist']}")
+
+        if _present(row.get('Genre')):
+            text_parts.append(f"Genre: {row['Genre']}")
+
+        if _present(row.get('Artist description')):
+            text_parts.append(f"Artist Description: {row['Artist description']}")
+
+        if _present(row.get('Introduction to the work')):
+            text_parts.append(f"Introduction: {row['Introduction to the work']}")
+
+        if _present(row.get('PAMS Venue')):
+            text_parts.append(f"Venue: {row['PAMS Venue']}")
+
+        if _present(row.get('Director')):
+            text_parts.append(f"Director: {row['Director']}")
+
+        if _present(row.get('Cast')):
+            text_parts.append(f"Cast: {row['Cast']}")
+
+        if _present(row.get('Review')):
+            text_parts.append(f"Review: {row['Review']}")
+
+        return " | ".join(text_parts)
+
+    # ------------------------------------------------------------------
+    # Search
+
+    def embed_query(self, query_text: str) -> np.ndarray:
+        """Query embedding, served from the query cache when this text was seen before"""
+        self.query_cache.sync_generation(self.generation)
+        vector = self.query_cache.get_vector(query_text)
+        if vector is None:
+            vector = self.embedding_backend.encode_one(query_text)
+            # A zero vector means the backend failed (e.g. Ollama down); don't keep it
+            if np.any(vector):
+                self.query_cache.put_vector(query_text, vector)
+        return vector
+
+    def _cached_search(self, query_text: str, params: tuple, search_fn) -> Dict[str, Any]:
+        """Run search_fn(query_embedding) behind both query cache tiers"""
+        self.query_cache.sync_generation(self.generation)
+        cached = self.query_cache.get(query_text, params)
+        if cached is not None:
+            return cached
+
+        query_embedding = self.embed_query(query_text)
+        # Hybrid results also depend on the query's words (sparse side), so a
+        # nearby vector is no stand-in: only the exact tier applies
+        approximate = params[0] != "hybrid"
+        if approximate:
+            cached = self.query_cache.get_similar(query_embedding, params)
+            if cached is not None:
+                return cached
+        else:
+            self.query_cache.record_miss()
+
+        results = search_fn(query_embedding)
+        if np.any(query_embedding):
+            self.query_cache.put(query_text, params, query_embedding, results, approximate=approximate)
+        return results
+
+    def search_similar(self, query_text: str, n_results: int = 10,
+                       where: Optional[dict] = None) -> Dict[str, Any]:
+        """Search for similar showcases based on text query"""
+        return self._cached_search(
+            query_text, ("dense", n_results, where_key(where)),
+            lambda query_embedding: self.query_vector(query_embedding, n_results, where=where)
+        )
+
+    def search_hybrid(self, query_text: str, n_results: int = 10, rrf_k: int = 60,
+                      where: Optional[dict] = None) -> Dict[str, Any]:
+        """Dense ANN plus sparse lexical retrieval, fused with reciprocal rank fusion"""
+        return self._cached_search(
+            query_text, ("hybrid", n_results, rrf_k, where_key(where)),
+            lambda query_embedding: self._search_hybrid(query_text, query_embedding, n_results, rrf_k, where)
+        )
+
+    def _search_hybrid(self, query_text: str, query_embedding: np.ndarray,
+                       n_results: int, rrf_k: int, where: Optional[dict] = None) -> Dict[str, Any]:
+        allowed = self.filter_ids(where) if where else None
+        total = self.count() if allowed is None else len(allowed)
+        if total == 0:
+            return empty_results(with_scores=True)
+        n_candidates = min(max(n_results * 3, 30), total)
+
+        dense = self.query_vector(query_embedding, n_candidates, where=where)
+        hits = {
+            doc_id: (distance, metadata, document)
+            for doc_id, distance, metadata, document in zip(
+                dense["ids"], dense["distances"], dense["metadatas"], dense["documents"]
+            )
+        }
+        sparse_hits = self._sparse_search(query_text, n_candidates, allowed)
+
+        fused = reciprocal_rank_fusion(
+            [dense["ids"], [doc_id for doc_id, _ in sparse_hits]], k=rrf_k
+        )[:n_results]
+
+        # Lexical-only hits still get a real cosine distance from their stored vector
+        missing = [doc_id for doc_id, _ in fused if doc_id not in hits]
+        if missing:
+            extra = self.get_records(missing, include_embeddings=True)
+            for doc_id, metadata, document, embedding in zip(
+                extra["ids"], extra["metadatas"], extra["documents"], extra["embeddings"]
+            ):
+                embedding = np.asarray(embedding, dtype=np.float32)
+                norm = np.linalg.norm(embedding) or 1.0
+                hits[doc_id] = (1.0 - float(np.dot(query_embedding, embedding) / norm), metadata, document)
+
+        fused = [(doc_id, score) for doc_id, score in fused if doc_id in hits]
+        return {
+            "ids": [doc_id for doc_id, _ in fused],
+            "distances": [hits[doc_id][0] for doc_id, _ in fused],
+            "metadatas": [hits[doc_id][1] for doc_id, _ in fused],
+            "documents": [hits[doc_id][2] for doc_id, _ in fused],
+            "scores": [score for _, score in fused]
+        }
+
+    def search_diverse(self, query_text: str, n_results: int = 10, lambda_mult: float = 0.5,
+                       fetch_k: Optional[int] = None, where: Optional[dict] = None) -> Dict[str, Any]:
+        """Dense search re-ranked with MMR over `fetch_k` over-fetched candidates"""
+        fetch_k = fetch_k or max(n_results * 4, 20)
+        return self._cached_search(
+            query_text, ("mmr", n_results, lambda_mult, fetch_k, where_key(where)),
+            lambda query_embedding: self._search_diverse(
+                query_embedding, n_results, lambda_mult, fetch_k, where
+            )
+        )
+
+    def _search_diverse(self, query_embedding: np.ndarray, n_results: int,
+                        lambda_mult: float, fetch_k: int, where: Optional[dict]) -> Dict[str, Any]:
+        candidates = self.query_vector(query_embedding, max(fetch_k, n_results),
+                                       where=where, include_embeddings=True)
+        if not candidates["ids"]:
+            return empty_results()
+        order = mmr_select(query_embedding, np.asarray(candidates["embeddings"], dtype=np.float32),
+                           n_results, lambda_mult)
+        return {
+            key: [candidates[key][i] for i in order]
+            for key in ("ids", "distances", "metadatas", "documents")
+        }
+
+    def search_fields(self, query_text: str, n_results: int = 10,
+                      field_weights: Optional[Dict[str, float]] = None,
+                      where: Optional[dict] = None) -> Dict[str, Any]:
+        """Weighted per-field similarity (FIELD_WEIGHTS unless `field_weights` is given)
+
+        Raises ValueError for unknown field names or all-zero weights.
+        """
+        weights = validate_field_weights(field_weights) if field_weights else self.field_weights
+        return self._cached_search(
+            query_text, ("fields", n_results, tuple(sorted(weights.items())), where_key(where)),
+            lambda query_embedding: self._search_fields(query_embedding, n_results, weights, where)
+        )
+
+    def _search_fields(self, query_embedding: np.ndarray, n_results: int,
+                       weights: Dict[str, float], where: Optional[dict]) -> Dict[str, Any]:
+        if self.field_index is None and self.count() > 0:
+            records = self.get_records(self.get_all_documents()[0])
+            self.build_field_index(records["ids"], records["metadatas"])
+        if self.field_index is None:
+            return empty_results()
+        mask = None
+        if where:
+            mask = np.isin(np.asarray(self.field_index.ids), np.asarray(self.filter_ids(where)))
+        hits = self.field_index.search(query_embedding, n_results, weights, mask)
+
+        ids = [self.field_index.ids[row] for row, _, _ in hits]
+        records = self.get_records(ids)
+        by_id = {
+            doc_id: (metadata, document)
+            for doc_id, metadata, document in zip(records["ids"], records["metadatas"], records["documents"])
+        }
+        hits = [(doc_id, hit) for doc_id, hit in zip(ids, hits) if doc_id in by_id]
+        return {
+            "ids": [doc_id for doc_id, _ in hits],
+            "distances": [1.0 - score for _, (_, score, _) in hits],
+            "metadatas": [by_id[doc_id][0] for doc_id, _ in hits],
+            "documents": [by_id[doc_id][1] for doc_id, _ in hits],
+            "field_scores": [per_field for _, (_, _, per_field) in hits]
+        }
+
+    def search_chunks(self, query_text: str, n_results: int = 10, pooling: Optional[str] = None,
+                      where: Optional[dict] = None) -> Dict[str, Any]:
+        """Chunk-level search pooled to showcases ("max" or "sum", CHUNK_POOLING by default)"""
+        pooling = pooling or CHUNK_POOLING
+        return self._cached_search(
+            query_text, ("chunks", n_results, pooling, where_key(where)),
+            lambda query_embedding: self._search_chunks(query_embedding, n_results, pooling, where)
+        )
+
+    def _search_chunks(self, query_embedding: np.ndarray, n_results: int,
+                       pooling: str, where: Optional[dict]) -> Dict[str, Any]:
+        if self.chunk_index is None and self.count() > 0:
+            ids, documents = self.get_all_documents()
+            self.build_chunk_index(ids, documents, self.get_records(ids)["metadatas"])
+        if self.chunk_index is None:
+            return empty_results(with_scores=True)
+        mask = None
+        if where:
+            mask = np.isin(np.asarray(self.chunk_index.ids), np.asarray(self.filter_ids(where)))
+        hits = self.chunk_index.search(query_embedding, n_results, pooling, mask)
+
+        ids = [self.chunk_index.ids[row] for row, _, _, _ in hits]
+        records = self.get_records(ids)
+        by_id = {
+            doc_id: (metadata, document)
+            for doc_id, metadata, document in zip(records["ids"], records["metadatas"], records["documents"])
+        }
+        hits = [(doc_id, hit) for doc_id, hit in zip(ids, hits) if doc_id in by_id]
+        # Distance of the best passage; "scores" holds the pooled ranking score
+        return {
+            "ids": [doc_id for doc_id, _ in hits],
+            "distances": [1.0 - best for _, (_, _, best, _) in hits],
+            "metadatas": [by_id[doc_id][0] for doc_id, _ in hits],
+            "documents": [by_id[doc_id][1] for doc_id, _ in hits],
+            "scores": [pooled for _, (_, pooled, _, _) in hits],
+            "matched_chunks": [self.chunk_index.chunks[chunk] for _, (_, _, _, chunk) in hits]
+        }
+
+    def search(self, query_text: str, n_results: int = 10, mode: str = "dense",
+               where: Optional[dict] = None, mmr_lambda: Optional[float] = None,
+               rerank_top_n: int = 0,
+               field_weights: Optional[Dict[str, float]] = None,
+               pooling: Optional[str] = None) -> Dict[str, Any]:
+        """Search in the requested retrieval mode ("dense", "hybrid", "fields" or "chunks")
+
+        `field_weights` overrides FIELD_WEIGHTS in "fields" mode and `pooling`
+        overrides CHUNK_POOLING in "chunks" mode.
+        With `mmr_lambda` set, dense candidates are diversified with MMR instead.
+        With `rerank_top_n`, that many candidates are fetched and re-ranked by the
+        cross-encoder (when one is configured) before cutting to `n_results`.
+        """
+        n_fetch = max(n_results, rerank_top_n)
+        if mmr_lambda is not None:
+            results = self.search_diverse(query_text, n_results=n_fetch,
+                                          lambda_mult=mmr_lambda, where=where)
+        elif mode == "hybrid":
+            results = self.search_hybrid(query_text, n_results=n_fetch, where=where)
+        elif mode == "fields":
+            results = self.search_fields(query_text, n_results=n_fetch,
+                                         field_weights=field_weights, where=where)
+        elif mode == "chunks":
+            results = self.search_chunks(query_text, n_results=n_fetch, pooling=pooling, where=where)
+        else:
+            results = self.search_similar(query_text, n_results=n_fetch, where=where)
+
+        if rerank_top_n > 0:
+            stage = get_rerank_stage()
+            if stage is not None:
+                results = stage.rerank(query_text, results, rerank_top_n)
+        if n_fetch == n_results:
+            return results
+        return {
+            key: value[:n_results] if isinstance(value, list) else value
+            for key, value in results.items()
+        }
+
+    def _sparse_search(self, query_text: str, k: int, allowed_ids: Optional[List[str]] = None):
+        if self.sparse_index is None and self.count() > 0:
+            self.build_sparse_index(*self.get_all_documents())
+        if self.sparse_index is None:
+            return []
+        mask = None
+        if allowed_ids is not None:
+            mask = np.isin(np.asarray(self.sparse_index.ids), np.asarray(allowed_ids))
+        if not self.sparse_index.use_bm25:
+            query_weights = self.embedding_backend.encode_sparse([query_text])[0]
+            return self.sparse_index.search_weights(query_weights, k, mask)
+        return self.sparse_index.search(query_text, k, mask)
+
+
+class RecordCollector:
+    """Ingest sink collecting ids, documents and metadata for every CSV row"""
+
+    def __init__(self, store: VectorStore, doc_ids: Optional[List[str]] = None):
+        self.store = store
+        self.doc_ids = doc_ids
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+
+    def add(self, first_row: int, rows: List[Dict[str, Any]]):
+        ids, documents, metadatas = self.store.prepare_records(rows, first_row, self.doc_ids)
+        self.ids += ids
+        self.documents += documents
+        self.metadatas += metadatas
+
+    def finish(self):
+        pass
+
+    def abort(self):
+        pass
+
+
+class RecordIndexer:
+    """Ingest sink (re)loading a vector store: each CSV chunk is embedded and added as it arrives
+
+    `embeddings` may hold precomputed vectors, one row per CSV row (an
+    EmbeddingSnapshot's memmap is paged in one chunk at a time). Only ids and
+    documents are kept for the sparse index, plus metadata when the field or
+    chunk index is built at load time.
+    """
+
+    def __init__(self, store: VectorStore, embeddings=None, doc_ids: Optional[List[str]] = None):
+        self.store = store
+        self.embeddings = embeddings
+        self.doc_ids = doc_ids
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.keep_metadata = FIELD_VECTORS or CHUNK_INDEX
+
+        existing_count = store.count()
+        if existing_count > 0:
+            logger.info(f"Collection already contains {existing_count} documents. Resetting...")
+            store._clear()
+        store.begin_bulk()
+
+    def add(self, first_row: int, rows: List[Dict[str, Any]]):
+        ids, documents, metadatas = self.store.prepare_records(rows, first_row, self.doc_ids)
+        vectors = None
+        if self.embeddings is not None:
+            vectors = self.embeddings[first_row:first_row + len(rows)]
+        self.store.add_records(ids, documents, metadatas, vectors)
+        self.ids += ids
+        self.documents += documents
+        if self.keep_metadata:
+            self.metadatas += metadatas
+
+    def finish(self):
+        store = self.store
+        store.end_bulk()
+        store.build_sparse_index(self.ids, self.documents)
+        if FIELD_VECTORS:
+            store.build_field_index(self.ids, self.metadatas)
+        else:
+            store.field_index = None
+        if CHUNK_INDEX:
+            store.build_chunk_index(self.ids, self.documents, self.metadatas)
+        else:
+            store.chunk_index = None
+        store.generation += 1
+
+    def abort(self):
+        self.store.end_bulk()
+
+
+def create_vector_store(backend: str = None,
+                        embedding_backend: EmbeddingBackend = None,
+                        edition: Optional[str] = None,
+                        read_only: bool = False,
+                        path: Optional[str] = None) -> VectorStore:
+    """Vector store selected by `backend` (defaults to VECTOR_BACKEND)
+
+    `edition` selects the index of another festival year (see editions.py); the
+    default is the current catalog, kept under its original name and path.
+    `read_only` opens the published version without ever writing to it.
+    `path` replaces VECTOR_INDEX_DIR / CHROMA_DIR (index artifacts, see
+    index_artifact.py).
+    """
+    backend = (backend or VECTOR_BACKEND).lower()
+
+    if backend == "numpy":
+        from numpy_store import NumpyVectorStore
+        store = NumpyVectorStore(
+            path or (f"{VECTOR_INDEX_DIR}_{edition}" if edition else VECTOR_INDEX_DIR),
+            embedding_backend=embedding_backend,
+            read_only=read_only
+        )
+    elif backend == "chroma":
+        from chroma_store import ChromaVectorStore
+        store = ChromaVectorStore(
+            path or CHROMA_DIR, embedding_backend=embedding_backend,
+            collection_name=f"pams_showcases_{edition}" if edition else "pams_showcases",
+            read_only=read_only
+        )
+    else:
+        raise ValueError(f"Unknown vector backend '{backend}' (expected 'chroma' or 'numpy')")
+
+    if edition and edition.isdigit():
+        store.catalog_year = int(edition)
+    return store
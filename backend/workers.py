@@ -0,0 +1,132 @@
+"""
+Multi-worker serving: one leader builds, every worker serves
+
+With `uvicorn main:app --workers N` every worker process runs the lifespan. The
+workers share WORKER_STATE_DIR (EDITIONS_DIR by default):
+
+- leader.lock      flock held for life by exactly one worker, the leader. The
+                   leader loads the SQLite catalog, builds and publishes the
+                   vector indexes (see index_versions.py) and runs reloads.
+                   When it dies the OS releases the lock and the next follower
+                   to poll takes over.
+- generation.json  written by the leader: its pid, the PAMS.csv sha256 in
+                   SQLite, and the catalog / index generations. Followers poll
+                   it and (re)open the published index versions read-only
+                   whenever the index generation moves.
+- reload.request   dropped by a follower that received POST /api/chroma/reload;
+                   the leader picks it up on its next poll.
+
+Followers never write the catalog or an index. NumPy indexes are memory-mapped,
+so the vectors of every worker share the OS page cache; Chroma collections are
+opened per process (queries only), which costs one HNSW index per worker.
+
+Without fcntl (Windows) there is no lock and every process leads: run a single
+worker there.
+"""
+import os
+import json
+import time
+import logging
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from config import WORKER_STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+LEADER_LOCK = "leader.lock"
+GENERATION_FILE = "generation.json"
+RELOAD_REQUEST_FILE = "reload.request"
+
+
+def pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class WorkerRole:
+    """Leader election and the generation file shared by the worker processes"""
+
+    def __init__(self, state_dir: str = WORKER_STATE_DIR):
+        self.state_dir = state_dir
+        self.is_leader = False
+        self._lock_file = None
+        os.makedirs(state_dir, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.state_dir, name)
+
+    def try_lead(self) -> bool:
+        """Take the leader lock if no other live worker holds it"""
+        if self.is_leader:
+            return True
+        if fcntl is None:
+            self.is_leader = True
+            return True
+        lock_file = open(self._path(LEADER_LOCK), "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        # Kept open (and locked) for the life of the process
+        self._lock_file = lock_file
+        self.is_leader = True
+        logger.info(f"Worker {os.getpid()} is the leader")
+        return True
+
+    def read_generation(self) -> Dict[str, Any]:
+        try:
+            with open(self._path(GENERATION_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def update_generation(self, **fields) -> Dict[str, Any]:
+        """Leader only: merge `fields` into the generation file (atomic replace)"""
+        state = self.read_generation()
+        state.update(fields, leader_pid=os.getpid(), updated_at=time.time())
+        tmp_path = self._path(GENERATION_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self._path(GENERATION_FILE))
+        return state
+
+    def bump(self, key: str, **fields) -> Dict[str, Any]:
+        """Leader only: increment generation counter `key` (and merge `fields`)"""
+        return self.update_generation(**{key: self.read_generation().get(key, 0) + 1}, **fields)
+
+    def leader_generation(self) -> Dict[str, Any]:
+        """The generation file if the worker that wrote it is still alive, else {}
+
+        A file left by a previous run says nothing about the catalog the
+        current leader is (re)writing.
+        """
+        state = self.read_generation()
+        return state if pid_alive(state.get("leader_pid")) else {}
+
+    def request_reload(self):
+        with open(self._path(RELOAD_REQUEST_FILE), "w", encoding="utf-8") as f:
+            f.write(str(time.time()))
+
+    def has_reload_request(self) -> bool:
+        return os.path.exists(self._path(RELOAD_REQUEST_FILE))
+
+    def take_reload_request(self) -> bool:
+        """Leader only: consume a pending reload request"""
+        try:
+            os.remove(self._path(RELOAD_REQUEST_FILE))
+            return True
+        except FileNotFoundError:
+            return False
@@ -131,7 +131,8 @@ function ShowcasesPage() {
   const fetchShowcases = async () => {
     try {
       setLoading(true);
-      const data = await api.get('/api/showcases');
+      // Card fields only: the long texts are loaded on the detail page
+      const data = await api.get('/api/showcases?fields=id,title,genre,venue');
       setShowcases(data || []);
     } catch (err) {
       setError(err.message);